@@ -1,12 +1,66 @@
-"""Top-level package for radiko playlist."""
+"""Top-level package for radiko playlist.
 
-from radikoplaylist.master_playlist_client import *  # noqa: F403
-from radikoplaylist.master_playlist_request import *  # noqa: F403
+Public names are imported on first access, so importing this package doesn't import requests, m3u8 nor defusedxml.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+from typing import Any
+
+if TYPE_CHECKING:
+    from radikoplaylist.async_master_playlist_client import AsyncMasterPlaylistClient
+    from radikoplaylist.live_segment_follower import LiveSegmentFollower
+    from radikoplaylist.master_playlist_client import MasterPlaylistClient
+    from radikoplaylist.master_playlist_request import LiveMasterPlaylistRequest
+    from radikoplaylist.master_playlist_request import MasterPlaylistRequest
+    from radikoplaylist.master_playlist_request import TimeFree30DayMasterPlaylistRequest
+    from radikoplaylist.master_playlist_request import TimeFreeMasterPlaylistRequest
+    from radikoplaylist.media_playlist_client import MediaPlaylistClient
+    from radikoplaylist.program_guide import ProgramGuideClient
+    from radikoplaylist.segment_downloader import SegmentDownloader
 
 __author__ = """Master"""
 __email__ = "roadmasternavi@gmail.com"
 __version__ = "1.3.1"
 
-__all__ = []
-__all__ += master_playlist_request.__all__  # type:ignore[name-defined] # noqa: F405 pylint: disable=undefined-variable
-__all__ += master_playlist_client.__all__  # type:ignore[name-defined] # noqa: F405 pylint: disable=undefined-variable
+# Public name to module which defines it
+_MODULES = {
+    "AsyncMasterPlaylistClient": "radikoplaylist.async_master_playlist_client",
+    "LiveMasterPlaylistRequest": "radikoplaylist.master_playlist_request",
+    "LiveSegmentFollower": "radikoplaylist.live_segment_follower",
+    "MasterPlaylistClient": "radikoplaylist.master_playlist_client",
+    "MasterPlaylistRequest": "radikoplaylist.master_playlist_request",
+    "MediaPlaylistClient": "radikoplaylist.media_playlist_client",
+    "ProgramGuideClient": "radikoplaylist.program_guide",
+    "SegmentDownloader": "radikoplaylist.segment_downloader",
+    "TimeFree30DayMasterPlaylistRequest": "radikoplaylist.master_playlist_request",
+    "TimeFreeMasterPlaylistRequest": "radikoplaylist.master_playlist_request",
+}
+
+__all__ = [
+    "AsyncMasterPlaylistClient",
+    "LiveMasterPlaylistRequest",
+    "LiveSegmentFollower",
+    "MasterPlaylistClient",
+    "MasterPlaylistRequest",
+    "MediaPlaylistClient",
+    "ProgramGuideClient",
+    "SegmentDownloader",
+    "TimeFree30DayMasterPlaylistRequest",
+    "TimeFreeMasterPlaylistRequest",
+]
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    if name not in _MODULES:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(import_module(_MODULES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
@@ -0,0 +1,89 @@
+"""Implements get process for master playlist on asyncio."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from requests import ConnectionError as RequestsConnectionError
+
+from radikoplaylist.authorization import Authorization
+from radikoplaylist.exceptions import BadHttpStatusCodeError
+from radikoplaylist.exceptions import HttpRequestTimeoutError
+from radikoplaylist.master_playlist import MasterPlaylist
+from radikoplaylist.master_playlist_client import MasterPlaylistClient
+from radikoplaylist.requester import AsyncRequester
+from radikoplaylist.requester import Phase
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from radikoplaylist.master_playlist_request import MasterPlaylistRequest
+
+__all__ = ["AsyncMasterPlaylistClient"]
+
+
+class AsyncMasterPlaylistClient:
+    """Asyncio version of MasterPlaylistClient.
+
+    Authorized headers are shared with MasterPlaylistClient through MasterPlaylistClient.authorization_cache.
+    """
+
+    @classmethod
+    async def get(
+        cls,
+        master_playlist_request: MasterPlaylistRequest,
+        *,
+        area_id: str = Authorization.ARIA_ID_DEFAULT,
+        radiko_session: str | None = None,
+    ) -> MasterPlaylist:
+        """Get master playlist.
+
+        Args:
+            master_playlist_request: Request object (Live, TimeFree, or TimeFree30Day)
+            area_id: Area ID for radiko (default: JP13 for Tokyo)
+            radiko_session: Optional radiko premium session cookie for 30-day timefree access.
+                Required for TimeFree30DayMasterPlaylistRequest to access premium content.
+        """
+        station_id = master_playlist_request.station_id
+        if MasterPlaylistClient.station_catalog is None:
+            authorization = MasterPlaylistClient.create_authorization(station_id, area_id, radiko_session)
+        else:
+            # Station catalog may fetch station lists
+            authorization = await AsyncRequester.run(
+                MasterPlaylistClient.create_authorization,
+                station_id,
+                area_id,
+                radiko_session,
+            )
+        headers = await authorization.auth_async()
+        try:
+            url_master_playlist = await cls._get_url(master_playlist_request, headers)
+        except BadHttpStatusCodeError as error:
+            if not authorization.is_rejected(error):
+                raise
+            authorization.invalidate()
+            headers = await authorization.auth_async()
+            url_master_playlist = await cls._get_url(master_playlist_request, headers)
+        return MasterPlaylist(url_master_playlist, headers)
+
+    @classmethod
+    async def _get_url(
+        cls,
+        master_playlist_request: MasterPlaylistRequest,
+        headers: Mapping[str, str | bytes],
+    ) -> str:
+        # Candidates are resolved on the thread pool, since fetching and parsing them block
+        urls = master_playlist_request.iter_urls(headers)
+        url: str = await AsyncRequester.run(next, urls)
+        while True:
+            try:
+                response = await AsyncRequester.get(url, headers, phase=Phase.MASTER_PLAYLIST)
+            # Reason: To fall back to the next candidate on failure of each host
+            except (HttpRequestTimeoutError, BadHttpStatusCodeError, RequestsConnectionError) as error:  # noqa: PERF203
+                MasterPlaylistClient.check_fallback(url, error)
+                url_next: str | None = await AsyncRequester.run(next, urls, None)
+                if url_next is None:
+                    raise
+                url = url_next
+            else:
+                return MasterPlaylistClient.extract_media_playlist_url(response.content)
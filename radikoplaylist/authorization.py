@@ -2,17 +2,188 @@
 
 from __future__ import annotations
 
+import asyncio
 import base64
+import threading
+import time
+from dataclasses import dataclass
 from logging import getLogger
 from typing import TYPE_CHECKING
 
+from radikoplaylist.requester import AsyncRequester
+from radikoplaylist.requester import Phase
 from radikoplaylist.requester import Requester
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable
+    from collections.abc import Callable
+    from collections.abc import Mapping
     from collections.abc import MutableMapping
 
     from requests import Response
 
+    from radikoplaylist.exceptions import BadHttpStatusCodeError
+    from radikoplaylist.station_catalog import StationCatalog
+
+
+@dataclass(frozen=True)
+class CachedHeaders:
+    """Authorized headers and the monotonic time they were issued at."""
+
+    headers: Mapping[str, str | bytes]
+    issued_at: float
+
+
+@dataclass(frozen=True)
+class LearnedTtl:
+    """TTL learned from observed expiry of token and the monotonic time it was learned at."""
+
+    ttl: float
+    learned_at: float
+
+
+class AuthorizationCache:
+    """In-process cache of authorized headers keyed by area ID and radiko session.
+
+    Cached headers are reused until the TTL passes or the token is invalidated. When radiko rejects a token earlier
+    than the TTL of its key, the TTL of the key is shortened to the observed lifetime so that following tokens are
+    renewed in time. Rejection sooner than ttl_minimum isn't taken as expiry, and the learned TTL returns to the
+    initial one after ttl_recovery.
+
+    Coroutines on the same event loop which miss the cache for the same key at once share one authentication.
+    """
+
+    TTL_DEFAULT = 1800.0
+    TTL_MINIMUM_DEFAULT = 60.0
+    TTL_RECOVERY_DEFAULT = 6 * 60 * 60.0
+    # To renew token a little before observed expiry
+    SAFETY_RATIO = 0.9
+
+    def __init__(
+        self,
+        *,
+        ttl: float = TTL_DEFAULT,
+        ttl_minimum: float = TTL_MINIMUM_DEFAULT,
+        ttl_recovery: float = TTL_RECOVERY_DEFAULT,
+    ) -> None:
+        """TTL is in seconds.
+
+        Args:
+            ttl: Initial time to live of cached headers.
+            ttl_minimum: Lower bound of the TTL learned from observed expiries.
+            ttl_recovery: Seconds to keep learned TTL before trying the initial one again.
+        """
+        self.ttl = ttl
+        self.ttl_minimum = ttl_minimum
+        self.ttl_recovery = ttl_recovery
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, str | None], CachedHeaders] = {}
+        self._learned_ttls: dict[tuple[str, str | None], LearnedTtl] = {}
+        # Authentication in flight for each event loop, area ID and radiko session
+        self._flights: dict[
+            tuple[asyncio.AbstractEventLoop, str, str | None],
+            asyncio.Future[dict[str, str | bytes]],
+        ] = {}
+
+    def get(self, area_id: str, radiko_session: str | None) -> dict[str, str | bytes] | None:
+        """Return a copy of cached headers, or None when missing or stale."""
+        with self._lock:
+            entry = self._entries.get((area_id, radiko_session))
+            if entry is None:
+                return None
+            now = time.monotonic()
+            if now - entry.issued_at >= self._get_ttl((area_id, radiko_session), now):
+                del self._entries[(area_id, radiko_session)]
+                return None
+            return dict(entry.headers)
+
+    def age(self, area_id: str, radiko_session: str | None) -> float | None:
+        """Return seconds since cached headers were issued, or None when missing."""
+        with self._lock:
+            entry = self._entries.get((area_id, radiko_session))
+            return None if entry is None else time.monotonic() - entry.issued_at
+
+    def get_ttl(self, area_id: str, radiko_session: str | None) -> float:
+        """Return TTL of area and session, learned one if any."""
+        with self._lock:
+            return self._get_ttl((area_id, radiko_session), time.monotonic())
+
+    def put(self, area_id: str, radiko_session: str | None, headers: Mapping[str, str | bytes]) -> None:
+        with self._lock:
+            self._entries[(area_id, radiko_session)] = CachedHeaders(dict(headers), time.monotonic())
+
+    def invalidate(self, area_id: str, radiko_session: str | None, *, expired: bool = False) -> None:
+        """Drop cached headers.
+
+        Args:
+            area_id: Area ID of cached headers.
+            radiko_session: radiko premium session of cached headers.
+            expired: Whether radiko rejected the token. The observed lifetime is learned as TTL of area and session
+                when `True`, unless it's too short to be expiry.
+        """
+        key = (area_id, radiko_session)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None or not expired:
+                return
+            now = time.monotonic()
+            lifetime = now - entry.issued_at
+            if lifetime < self.ttl_minimum:
+                # Such as revoked token or mismatch of area rather than expiry
+                getLogger(__name__).debug("token rejected after %s seconds is not learned", lifetime)
+                return
+            if lifetime < self._get_ttl(key, now):
+                ttl = max(self.ttl_minimum, lifetime * self.SAFETY_RATIO)
+                self._learned_ttls[key] = LearnedTtl(ttl, now)
+                getLogger(__name__).info("learned TTL of token of area %s: %s seconds", area_id, ttl)
+
+    async def share_async(
+        self,
+        area_id: str,
+        radiko_session: str | None,
+        authenticate: Callable[[], Awaitable[dict[str, str | bytes]]],
+    ) -> dict[str, str | bytes]:
+        """Await authentication of area and session in flight on the running loop, or start authenticate() as one.
+
+        The flight runs as a task, so cancellation of a caller doesn't cancel it for the others. Its error is raised to
+        all callers which awaited it, and the next call starts a new flight.
+        """
+        key = (asyncio.get_running_loop(), area_id, radiko_session)
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = asyncio.ensure_future(authenticate())
+                self._flights[key] = flight
+                flight.add_done_callback(lambda done: self._land(key, done))
+        return dict(await asyncio.shield(flight))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._learned_ttls.clear()
+
+    def _get_ttl(self, key: tuple[str, str | None], now: float) -> float:
+        learned_ttl = self._learned_ttls.get(key)
+        if learned_ttl is None:
+            return self.ttl
+        if now - learned_ttl.learned_at >= self.ttl_recovery:
+            # Expiry observed long ago may have been transient, so try the initial TTL again
+            del self._learned_ttls[key]
+            return self.ttl
+        return learned_ttl.ttl
+
+    def _land(
+        self,
+        key: tuple[asyncio.AbstractEventLoop, str, str | None],
+        flight: asyncio.Future[dict[str, str | bytes]],
+    ) -> None:
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        if not flight.cancelled():
+            # Mark error as retrieved even when all callers were cancelled
+            flight.exception()
+
 
 class Authorization:
     """Authorization for radiko API."""
@@ -23,14 +194,23 @@ class Authorization:
     # Value is defined in specification of radiko API
     # @see http://radiko.jp/apps/js/playerCommon.js
     _RADIKO_AUTH_KEY = b"bcd151073c03b352e1ef2fd66c32209da9ca0afa"
+    # radiko responds these status codes for expired or revoked token
+    STATUS_CODES_TOKEN_REJECTED = frozenset({401, 403})
 
-    def __init__(self, *, area_id: str = ARIA_ID_DEFAULT, radiko_session: str | None = None) -> None:
+    def __init__(
+        self,
+        *,
+        area_id: str = ARIA_ID_DEFAULT,
+        radiko_session: str | None = None,
+        cache: AuthorizationCache | None = None,
+    ) -> None:
         """Key X-Radiko-*** in headers is required in specification of radiko API.
 
         Args:
             area_id: Area ID for radiko (default: JP13 for Tokyo)
             radiko_session: Optional radiko premium session cookie for 30-day timefree access.
                 If provided, uses cookie-based authentication instead of auth1/auth2 flow.
+            cache: Optional cache to reuse authorized headers across instances.
         """
         self._headers: MutableMapping[str, str | bytes] = {
             "User-Agent": "python3.7",
@@ -43,31 +223,99 @@ class Authorization:
             "X-Radiko-Partialkey": b"",
             "X-Radiko-AreaId": area_id,
         }
+        self._area_id = area_id
         self._radiko_session = radiko_session
+        self._cache = cache
+        self.is_cached = False
         self.logger = getLogger(__name__)
 
+    @classmethod
+    def for_station(
+        cls,
+        station_id: str,
+        station_catalog: StationCatalog | None,
+        *,
+        area_id: str = ARIA_ID_DEFAULT,
+        radiko_session: str | None = None,
+        cache: AuthorizationCache | None = None,
+    ) -> Authorization:
+        """Create authorization for area where station is available.
+
+        Area is selected by station catalog unless radiko_session is provided, since premium account reaches stations
+        outside its area. area_id is kept when station is available in it or catalog is None.
+        """
+        if station_catalog is not None and radiko_session is None:
+            area_id = station_catalog.select_area_id(station_id, area_id)
+        return cls(area_id=area_id, radiko_session=radiko_session, cache=cache)
+
     def auth(self) -> dict[str, str | bytes]:
         """Authorize radiko API and return authorized HTTP headers.
 
         If radiko_session is provided, adds premium account cookie to the headers in addition to performing the
-        standard auth1/auth2 flow.
+        standard auth1/auth2 flow. When cache is provided, cached headers are returned without the flow.
         """
+        headers = self._get_cached_headers()
+        if headers is not None:
+            return headers
+        self._prepare_headers()
+        # Perform standard auth1/auth2 flow (required for both free and premium)
+        self._apply_auth1(Requester.get(Authorization._AUTH1_URL, self._headers, phase=Phase.AUTH1))
+        return self._apply_auth2(Requester.get(Authorization._AUTH2_URL, self._headers, phase=Phase.AUTH2))
+
+    async def auth_async(self) -> dict[str, str | bytes]:
+        """Asyncio version of auth().
+
+        Concurrent calls for the same area and session on one event loop share one flow when cache is provided.
+        """
+        headers = self._get_cached_headers()
+        if headers is not None:
+            return headers
+        if self._cache is None:
+            return await self._auth_flow_async()
+        return await self._cache.share_async(self._area_id, self._radiko_session, self._auth_flow_async)
+
+    async def _auth_flow_async(self) -> dict[str, str | bytes]:
+        self._prepare_headers()
+        self._apply_auth1(await AsyncRequester.get(Authorization._AUTH1_URL, self._headers, phase=Phase.AUTH1))
+        return self._apply_auth2(await AsyncRequester.get(Authorization._AUTH2_URL, self._headers, phase=Phase.AUTH2))
+
+    def invalidate(self) -> None:
+        """Drop cached headers since radiko rejected them."""
+        if self._cache is not None:
+            self._cache.invalidate(self._area_id, self._radiko_session, expired=True)
+
+    def is_rejected(self, error: BadHttpStatusCodeError) -> bool:
+        """Whether the error means cached headers were rejected and the request is worth retrying with new token."""
+        return self.is_cached and error.status_code in self.STATUS_CODES_TOKEN_REJECTED
+
+    def _get_cached_headers(self) -> dict[str, str | bytes] | None:
+        if self._cache is None:
+            return None
+        headers = self._cache.get(self._area_id, self._radiko_session)
+        self.is_cached = headers is not None
+        if headers is not None:
+            self.logger.debug("reuse cached headers for area %s", self._area_id)
+        return headers
+
+    def _prepare_headers(self) -> None:
         # Add premium session cookie if provided (for 30-day timefree access)
         if self._radiko_session:
             self._headers["Cookie"] = f"radiko_session={self._radiko_session}"
             self.logger.debug("Added radiko_session cookie for premium account")
 
-        # Perform standard auth1/auth2 flow (required for both free and premium)
-        res = Requester.get(Authorization._AUTH1_URL, self._headers)
+    def _apply_auth1(self, res: Response) -> None:
         self._headers["X-Radiko-AuthToken"] = self._get_auth_token(res)
         # noinspection PyTypeChecker
         self._headers["X-Radiko-Partialkey"] = self._get_partial_key(res)
-        res = Requester.get(Authorization._AUTH2_URL, self._headers)
+
+    def _apply_auth2(self, res: Response) -> dict[str, str | bytes]:
         self.logger.debug("authenticated headers:%s", self._headers)
         self.logger.debug("res.headers:%s", res.headers)
         self.logger.debug("res.content:%s", res.content)
         self._headers["Connection"] = "keep-alive"
         self.logger.debug("headers: %s", self._headers)
+        if self._cache is not None:
+            self._cache.put(self._area_id, self._radiko_session, self._headers)
         # Mypy's issue:
         #   Incompatible return value type (got "dict[str, str]", expected "dict[str, str | bytes]")
         return self._headers  # type: ignore[return-value]
@@ -0,0 +1,119 @@
+"""Implements background refresh of authorized headers."""
+
+from __future__ import annotations
+
+import threading
+import time
+from logging import getLogger
+from random import SystemRandom
+from typing import TYPE_CHECKING
+
+from radikoplaylist.authorization import Authorization
+
+if TYPE_CHECKING:
+    from radikoplaylist.authorization import AuthorizationCache
+
+
+class AuthorizationRefresher:
+    """Renews tokens of registered areas and sessions in background before they expire.
+
+    Renewed headers are put into the cache, so MasterPlaylistClient sharing the cache always gets pre-authenticated
+    headers. Each renewal is scheduled at a random point between (REFRESH_RATIO - JITTER_RATIO) and REFRESH_RATIO of
+    the cache TTL of each area and session, so that many areas do not renew at once.
+    """
+
+    REFRESH_RATIO = 0.8
+    JITTER_RATIO = 0.1
+    RETRY_INTERVAL_DEFAULT = 30.0
+
+    def __init__(self, cache: AuthorizationCache, *, retry_interval: float = RETRY_INTERVAL_DEFAULT) -> None:
+        """Share the cache with clients, e.g. MasterPlaylistClient.authorization_cache.
+
+        Args:
+            cache: Cache to put renewed headers into.
+            retry_interval: Seconds to wait before retrying failed renewal.
+        """
+        self.cache = cache
+        self.retry_interval = retry_interval
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = True
+        self._thread: threading.Thread | None = None
+        self._next_refresh: dict[tuple[str, str | None], float] = {}
+        self._random = SystemRandom()
+        self.logger = getLogger(__name__)
+
+    def register(self, area_id: str = Authorization.ARIA_ID_DEFAULT, radiko_session: str | None = None) -> None:
+        """Keep token of area and session fresh. Authenticates soon when not cached."""
+        with self._lock:
+            age = self.cache.age(area_id, radiko_session)
+            delay = 0.0 if age is None else max(0.0, self.compute_delay(area_id, radiko_session) - age)
+            self._next_refresh[(area_id, radiko_session)] = time.monotonic() + delay
+        self._wake.set()
+
+    def unregister(self, area_id: str = Authorization.ARIA_ID_DEFAULT, radiko_session: str | None = None) -> None:
+        with self._lock:
+            self._next_refresh.pop((area_id, radiko_session), None)
+
+    def headers(
+        self,
+        area_id: str = Authorization.ARIA_ID_DEFAULT,
+        radiko_session: str | None = None,
+    ) -> dict[str, str | bytes]:
+        """Return authorized headers, authenticating in caller's thread only when background renewal failed."""
+        return Authorization(area_id=area_id, radiko_session=radiko_session, cache=self.cache).auth()
+
+    def compute_delay(
+        self,
+        area_id: str = Authorization.ARIA_ID_DEFAULT,
+        radiko_session: str | None = None,
+    ) -> float:
+        """Return seconds from issue to renewal of token of area and session with jitter."""
+        ttl = self.cache.get_ttl(area_id, radiko_session)
+        return ttl * (self.REFRESH_RATIO - self.JITTER_RATIO * self._random.random())
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name="radikoplaylist-authorization", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        with self._lock:
+            thread = self._thread
+            self._stopped = True
+            self._thread = None
+        self._wake.set()
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if self._stopped:
+                    return
+                now = time.monotonic()
+                due = [key for key, refresh_at in self._next_refresh.items() if refresh_at <= now]
+            for area_id, radiko_session in due:
+                self._refresh(area_id, radiko_session)
+            with self._lock:
+                timeout = min(self._next_refresh.values(), default=now + self.retry_interval) - time.monotonic()
+            self._wake.wait(max(0.0, timeout))
+            self._wake.clear()
+
+    def _refresh(self, area_id: str, radiko_session: str | None) -> None:
+        try:
+            headers = Authorization(area_id=area_id, radiko_session=radiko_session).auth()
+        # Reason: To keep background thread alive and retry later
+        except Exception:  # pylint: disable=broad-exception-caught
+            self.logger.exception("failed to refresh token of area %s", area_id)
+            delay = self.retry_interval
+        else:
+            self.cache.put(area_id, radiko_session, headers)
+            self.logger.debug("refreshed token of area %s", area_id)
+            delay = self.compute_delay(area_id, radiko_session)
+        with self._lock:
+            if (area_id, radiko_session) in self._next_refresh:
+                self._next_refresh[(area_id, radiko_session)] = time.monotonic() + delay
@@ -0,0 +1,161 @@
+"""Implements per-host circuit breaker."""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from logging import getLogger
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+from requests import ConnectionError as RequestsConnectionError
+
+from radikoplaylist.exceptions import BadHttpStatusCodeError
+from radikoplaylist.exceptions import HttpRequestTimeoutError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+class CircuitState(Enum):
+    """State of circuit of host."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class HostCircuit:
+    """Consecutive failures of host and when its circuit opened."""
+
+    failures: int = 0
+    # Monotonic time, None while closed
+    opened_at: float | None = None
+    # Monotonic time when the trial request in half-open state was allowed, None until then
+    trial_at: float | None = None
+
+
+class HostCircuitBreaker:
+    """Tracks health of each host from outcomes of requests.
+
+    The circuit of host opens after failure_threshold consecutive failures (timeout, connection error or 5xx). While
+    open, candidates on the host are tried last. After recovery_timeout, the circuit is half-open: only one trial
+    request is allowed at a time, then success closes the circuit and failure opens it again. While the trial is in
+    flight, the circuit looks open to other callers. A trial without outcome within recovery_timeout is abandoned, so
+    the next caller may try.
+
+    Circuits are kept by host, so requests of different paths on the same host share the circuit. Requester feeds only
+    phases listed in Requester.circuit_breaker_phases.
+    """
+
+    FAILURE_THRESHOLD_DEFAULT = 3
+    RECOVERY_TIMEOUT_DEFAULT = 30.0
+    HTTP_STATUS_CODE_SERVER_ERROR = 500
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = FAILURE_THRESHOLD_DEFAULT,
+        recovery_timeout: float = RECOVERY_TIMEOUT_DEFAULT,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._lock = threading.Lock()
+        self._circuits: dict[str, HostCircuit] = {}
+        self.logger = getLogger(__name__)
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        """Return scheme and netloc of URL.
+
+        Segment URLs are unique, so they are parsed without the cache of HostPolicyTable.host_of, which would
+        otherwise evict hosts of playlist create URLs.
+        """
+        split_result = urlsplit(url)
+        return split_result.scheme + "://" + split_result.netloc
+
+    def state(self, url: str) -> CircuitState:
+        with self._lock:
+            return self._get_state(self.host_of(url), time.monotonic())
+
+    def is_open(self, url: str) -> bool:
+        return self.state(url) is CircuitState.OPEN
+
+    def allow(self, url: str) -> bool:
+        """Check whether request to host of URL is allowed now, claiming the trial when the circuit is half-open."""
+        host = self.host_of(url)
+        with self._lock:
+            now = time.monotonic()
+            state = self._get_state(host, now)
+            if state is CircuitState.HALF_OPEN:
+                self._claim_trial(host, now)
+        return state is not CircuitState.OPEN
+
+    def order(self, urls: Iterable[str]) -> list[str]:
+        """Return URLs on hosts not open first, keeping order, so open hosts are tried only as last resort.
+
+        Trials of half-open hosts are claimed for URLs ranked before the first URL on closed host, since they are tried
+        first.
+        """
+        with self._lock:
+            now = time.monotonic()
+            states = [(url, self._get_state(self.host_of(url), now)) for url in urls]
+            ordered = sorted(states, key=lambda item: item[1] is CircuitState.OPEN)
+            for url, state in ordered:
+                if state is not CircuitState.HALF_OPEN:
+                    break
+                self._claim_trial(self.host_of(url), now)
+        return [url for url, _ in ordered]
+
+    @classmethod
+    def is_host_failure(cls, error: Exception) -> bool:
+        """Check whether error is caused by host rather than by request, so other host may succeed."""
+        if isinstance(error, BadHttpStatusCodeError):
+            return error.status_code is not None and error.status_code >= cls.HTTP_STATUS_CODE_SERVER_ERROR
+        return isinstance(error, (HttpRequestTimeoutError, RequestsConnectionError))
+
+    def record(self, url: str, status_code: int) -> None:
+        if status_code >= self.HTTP_STATUS_CODE_SERVER_ERROR:
+            self.record_failure(url)
+        else:
+            self.record_success(url)
+
+    def record_success(self, url: str) -> None:
+        with self._lock:
+            self._circuits.pop(self.host_of(url), None)
+
+    def record_failure(self, url: str) -> None:
+        host = self.host_of(url)
+        with self._lock:
+            circuit = self._circuits.get(host, HostCircuit())
+            failures = circuit.failures + 1
+            # Failure in half-open state re-opens the circuit immediately
+            if failures >= self.failure_threshold or circuit.opened_at is not None:
+                if circuit.opened_at is None:
+                    self.logger.warning("circuit of %s is open", host)
+                self._circuits[host] = HostCircuit(failures, time.monotonic())
+            else:
+                self._circuits[host] = HostCircuit(failures)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._circuits.clear()
+
+    def _get_state(self, host: str, now: float) -> CircuitState:
+        circuit = self._circuits.get(host)
+        if circuit is None or circuit.opened_at is None:
+            return CircuitState.CLOSED
+        if now - circuit.opened_at < self.recovery_timeout:
+            return CircuitState.OPEN
+        if circuit.trial_at is not None and now - circuit.trial_at < self.recovery_timeout:
+            # Trial is in flight
+            return CircuitState.OPEN
+        return CircuitState.HALF_OPEN
+
+    def _claim_trial(self, host: str, now: float) -> None:
+        circuit = self._circuits[host]
+        self._circuits[host] = HostCircuit(circuit.failures, circuit.opened_at, now)
+        self.logger.info("try %s in half-open state", host)
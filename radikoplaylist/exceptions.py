@@ -1,5 +1,7 @@
 """This module implements exceptions for this package."""
 
+from __future__ import annotations
+
 # This command prevents docformatter from removing blank lines in docstring against PEP8 (conflicts with Ruff (Black))
 # - The docformatter removes blank line against PEP8 (conflicts with Ruff (Black)) · Issue #350 · PyCQA/docformatter
 #   https://github.com/PyCQA/docformatter/issues/350
@@ -23,6 +25,10 @@ class HttpRequestTimeoutError(HttpRequestError):
 class BadHttpStatusCodeError(HttpRequestError):
     """HTTP status code is not 200."""
 
+    def __init__(self, message: str, status_code: int | None = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
 
 class NoAvailableUrlError(Error):
     """No available URL."""
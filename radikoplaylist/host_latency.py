@@ -0,0 +1,119 @@
+"""Implements latency tracking of hosts serving playlist."""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from logging import getLogger
+from typing import TYPE_CHECKING
+
+from requests import RequestException
+
+from radikoplaylist.host_policy import HostPolicyTable
+from radikoplaylist.requester import Requester
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Sequence
+
+
+@dataclass(frozen=True)
+class HostLatency:
+    """Moving average of latency of host and its health."""
+
+    # Seconds, None until the first successful probe
+    latency: float | None
+    healthy: bool
+    # Monotonic time of the last probe
+    probed_at: float
+
+
+class HostLatencyTracker:
+    """Probes candidate hosts concurrently and ranks candidates by moving average of latency.
+
+    Stats are kept per host (scheme and netloc), so candidates of different stations on the same CDN host share them and
+    each host is probed at most once per probe_interval.
+    """
+
+    PROBE_INTERVAL_DEFAULT = 300.0
+    PROBE_TIMEOUT_DEFAULT = 2.0
+    MAX_WORKERS_DEFAULT = 8
+    # Weight of new sample in exponentially weighted moving average
+    SMOOTHING = 0.3
+    HTTP_STATUS_CODE_SERVER_ERROR = 500
+
+    def __init__(
+        self,
+        *,
+        probe_interval: float = PROBE_INTERVAL_DEFAULT,
+        probe_timeout: float = PROBE_TIMEOUT_DEFAULT,
+        max_workers: int = MAX_WORKERS_DEFAULT,
+    ) -> None:
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._stats: dict[str, HostLatency] = {}
+        self.logger = getLogger(__name__)
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return HostPolicyTable.host_of(url)
+
+    def stats(self) -> dict[str, HostLatency]:
+        with self._lock:
+            return dict(self._stats)
+
+    def record(self, host: str, latency: float | None) -> None:
+        """Record latency of host in seconds, or None for failure."""
+        with self._lock:
+            previous = self._stats.get(host)
+            previous_latency = None if previous is None else previous.latency
+            if latency is None:
+                self._stats[host] = HostLatency(previous_latency, healthy=False, probed_at=time.monotonic())
+                return
+            if previous_latency is not None:
+                latency = previous_latency + self.SMOOTHING * (latency - previous_latency)
+            self._stats[host] = HostLatency(latency, healthy=True, probed_at=time.monotonic())
+
+    def rank(self, urls: Sequence[str]) -> list[str]:
+        """Return URLs ordered by healthy first, then lower latency, keeping original order on tie."""
+        self.probe(urls)
+        stats = self.stats()
+
+        def key(url: str) -> tuple[bool, float]:
+            host_latency = stats.get(self.host_of(url))
+            if host_latency is None:
+                return (False, float("inf"))
+            latency = float("inf") if host_latency.latency is None else host_latency.latency
+            return (not host_latency.healthy, latency)
+
+        return sorted(urls, key=key)
+
+    def probe(self, urls: Iterable[str]) -> None:
+        """Probe hosts of URLs whose stats are missing or older than probe_interval."""
+        stats = self.stats()
+        now = time.monotonic()
+        stale = {
+            self.host_of(url): url
+            for url in urls
+            if self.host_of(url) not in stats or now - stats[self.host_of(url)].probed_at >= self.probe_interval
+        }
+        if not stale:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(stale))) as executor:
+            for host, latency in zip(stale, executor.map(self._probe, stale.values())):
+                self.record(host, latency)
+
+    def _probe(self, url: str) -> float | None:
+        started_at = time.monotonic()
+        try:
+            response = Requester.session_pool.session.head(url, timeout=self.probe_timeout, allow_redirects=False)
+        except RequestException as error:
+            self.logger.debug("failed to probe %s: %s", url, error)
+            return None
+        if response.status_code >= self.HTTP_STATUS_CODE_SERVER_ERROR:
+            return None
+        return time.monotonic() - started_at
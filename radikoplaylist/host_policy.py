@@ -0,0 +1,91 @@
+"""Implements table of policies of hosts serving playlist."""
+
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import dataclass
+from dataclasses import fields
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+from typing import Any
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+
+@dataclass(frozen=True)
+class HostPolicy:
+    """How to treat URLs on host."""
+
+    ffmpeg_supported: bool = True
+    # False when FFmpeg can play only live from the host
+    ffmpeg_supported_time_free: bool = True
+    # Time free on the host is the fastest to download
+    fastest: bool = False
+    # The host forcibly connects not time free but live
+    live_only: bool = False
+
+    def is_ffmpeg_supported(self, *, time_free: bool) -> bool:
+        if not time_free:
+            return self.ffmpeg_supported
+        return self.ffmpeg_supported and self.ffmpeg_supported_time_free and not self.live_only
+
+
+class HostPolicyTable:
+    """Frozen table from host (scheme and netloc) to policy.
+
+    Hosts missing in the table get default HostPolicy. The default table is loaded from host_policy.json in this package
+    on first use, and can be replaced by a table loaded from other file to classify new hosts.
+    """
+
+    PATH_DEFAULT = Path(__file__).with_name("host_policy.json")
+    POLICY_DEFAULT = HostPolicy()
+    _lock = threading.Lock()
+    _default: HostPolicyTable | None = None
+
+    def __init__(self, policies: Mapping[str, HostPolicy]) -> None:
+        self.policies = MappingProxyType(dict(policies))
+
+    @classmethod
+    def default(cls) -> HostPolicyTable:
+        with cls._lock:
+            if cls._default is None:
+                cls._default = cls.load(cls.PATH_DEFAULT)
+            return cls._default
+
+    @classmethod
+    def load(cls, path: str | Path) -> HostPolicyTable:
+        """Load table from JSON object which maps host to object of HostPolicy fields.
+
+        Raises:
+            ValueError: When the file contains unknown field or non-boolean value.
+        """
+        with Path(path).open(encoding="utf-8") as file:
+            data = json.load(file)
+        return cls({host: cls.parse_policy(host, policy) for host, policy in data.items()})
+
+    @staticmethod
+    def parse_policy(host: str, policy: Mapping[str, Any]) -> HostPolicy:
+        names = {field.name for field in fields(HostPolicy)}
+        for name, value in policy.items():
+            if name not in names or not isinstance(value, bool):
+                msg = f"Invalid host policy of {host}: {name}={value!r}"
+                raise ValueError(msg)
+        return HostPolicy(**policy)
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def host_of(url: str) -> str:
+        """Return scheme and netloc of URL, parsing each URL only once.
+
+        For the few playlist create URLs listed in station stream XML, not for unique URLs such as of segments.
+        """
+        split_result = urlsplit(url)
+        return split_result.scheme + "://" + split_result.netloc
+
+    def classify(self, url: str) -> HostPolicy:
+        return self.policies.get(self.host_of(url), self.POLICY_DEFAULT)
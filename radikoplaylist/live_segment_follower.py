@@ -0,0 +1,222 @@
+"""Implements following live segments of many stations in one process."""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+from dataclasses import dataclass
+from logging import getLogger
+from typing import TYPE_CHECKING
+
+from radikoplaylist.authorization import Authorization
+from radikoplaylist.exceptions import BadHttpStatusCodeError
+from radikoplaylist.master_playlist_client import MasterPlaylistClient
+from radikoplaylist.master_playlist_request import LiveMasterPlaylistRequest
+from radikoplaylist.media_playlist_client import MediaPlaylistClient
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from collections.abc import Mapping
+
+    from radikoplaylist.media_playlist import Segment
+
+__all__ = ["FollowedSegment", "LiveSegmentFollower"]
+
+
+@dataclass(frozen=True)
+class FollowedSegment:
+    """New live segment of station."""
+
+    station_id: str
+    segment: Segment
+
+
+@dataclass
+class _Capture:
+    """Media playlist of station and what has been captured."""
+
+    media_playlist_client: MediaPlaylistClient
+    segment_count: int = 0
+    duration: float = 0.0
+    # Consecutive failures of poll and the last error
+    failures: int = 0
+    error: Exception | None = None
+
+
+class LiveSegmentFollower:
+    """Polls media playlists of many live stations on one thread pool and yields only new segments.
+
+    Master playlists are resolved by MasterPlaylistClient.get_many(), so each area authenticates once. Capture of each
+    station stops after segment_count segments or when captured segments reach duration seconds, instead of wall-clock.
+    When radiko rejects the token, the station is resolved again with new token. A station which fails max_failures
+    polls in a row is dropped and its error is reported in errors.
+    """
+
+    MAX_WORKERS_DEFAULT = 8
+    MAX_FAILURES_DEFAULT = 3
+    # Used until target duration of media playlists is known
+    POLL_INTERVAL_DEFAULT = 5.0
+
+    def __init__(
+        self,
+        station_ids: Iterable[str],
+        *,
+        area_id: str = Authorization.ARIA_ID_DEFAULT,
+        radiko_session: str | None = None,
+        area_ids: Mapping[str, str] | None = None,
+        max_workers: int = MAX_WORKERS_DEFAULT,
+    ) -> None:
+        """Stations are resolved on follow().
+
+        Args:
+            station_ids: Station IDs to follow.
+            area_id: Area ID for radiko (default: JP13 for Tokyo)
+            radiko_session: Optional radiko premium session cookie.
+            area_ids: Area ID for each station ID to override area_id.
+            max_workers: Maximum number of concurrent requests.
+        """
+        self.station_ids = list(station_ids)
+        self.area_id = area_id
+        self.radiko_session = radiko_session
+        self.area_ids = area_ids
+        self.max_workers = max_workers
+        # Error of each station which failed to resolve or was dropped by consecutive failures of poll
+        self.errors: dict[str, Exception] = {}
+        self._stopped = threading.Event()
+        self.logger = getLogger(__name__)
+
+    def follow(
+        self,
+        *,
+        segment_count: int | None = None,
+        duration: float | None = None,
+        poll_interval: float | None = None,
+        max_failures: int = MAX_FAILURES_DEFAULT,
+    ) -> Iterator[FollowedSegment]:
+        """Yield new segments of all stations as soon as they are listed, until every capture completes.
+
+        Args:
+            segment_count: Number of segments to capture for each station. Unlimited when None.
+            duration: Seconds of segments to capture for each station. Unlimited when None.
+            poll_interval: Seconds between polls. Minimum target duration of media playlists when None.
+            max_failures: Number of consecutive failures of poll to drop station.
+        """
+        self._stopped.clear()
+        captures = self._resolve()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="radikoplaylist") as executor:
+            while captures and not self._stopped.is_set():
+                started_at = time.monotonic()
+                futures = {
+                    executor.submit(self._poll, station_id, capture): station_id
+                    for station_id, capture in captures.items()
+                }
+                for future in as_completed(futures):
+                    station_id = futures[future]
+                    capture = captures[station_id]
+                    if capture.failures >= max_failures and capture.error is not None:
+                        self.logger.warning(
+                            "drop %s after %d failures: %s",
+                            station_id,
+                            capture.failures,
+                            capture.error,
+                        )
+                        self.errors[station_id] = capture.error
+                        del captures[station_id]
+                        continue
+                    for segment in future.result():
+                        yield FollowedSegment(station_id, segment)
+                        capture.segment_count += 1
+                        capture.duration += segment.duration
+                        if self.is_completed(capture, segment_count, duration):
+                            break
+                    if capture.media_playlist_client.end_list or self.is_completed(capture, segment_count, duration):
+                        del captures[station_id]
+                if captures:
+                    interval = self.compute_poll_interval(captures.values(), poll_interval)
+                    self._stopped.wait(max(0.0, interval - (time.monotonic() - started_at)))
+
+    def stop(self) -> None:
+        """Stop follow() after the current poll, from other thread."""
+        self._stopped.set()
+
+    @staticmethod
+    def is_completed(capture: _Capture, segment_count: int | None, duration: float | None) -> bool:
+        if segment_count is not None and capture.segment_count >= segment_count:
+            return True
+        return duration is not None and capture.duration >= duration
+
+    @classmethod
+    def compute_poll_interval(cls, captures: Iterable[_Capture], poll_interval: float | None) -> float:
+        if poll_interval is not None:
+            return poll_interval
+        target_durations = [
+            capture.media_playlist_client.target_duration
+            for capture in captures
+            if capture.media_playlist_client.target_duration is not None
+        ]
+        return float(min(target_durations)) if target_durations else cls.POLL_INTERVAL_DEFAULT
+
+    def _resolve(self) -> dict[str, _Capture]:
+        self.errors.clear()
+        captures: dict[str, _Capture] = {}
+        results = MasterPlaylistClient.get_many(
+            [LiveMasterPlaylistRequest(station_id) for station_id in self.station_ids],
+            area_id=self.area_id,
+            radiko_session=self.radiko_session,
+            area_ids=self.area_ids,
+            max_workers=self.max_workers,
+        )
+        for result in results:
+            station_id = result.master_playlist_request.station_id
+            if result.master_playlist is None:
+                self.logger.warning("failed to resolve %s: %s", station_id, result.error)
+                if result.error is not None:
+                    self.errors[station_id] = result.error
+                continue
+            captures[station_id] = _Capture(MediaPlaylistClient(result.master_playlist))
+        return captures
+
+    def _poll(self, station_id: str, capture: _Capture) -> list[Segment]:
+        try:
+            segments = self._fetch(station_id, capture)
+        # Reason: To keep following other stations and retry on the next poll
+        except Exception as error:  # noqa: BLE001 pylint: disable=broad-exception-caught
+            self.logger.warning("failed to poll %s: %s", station_id, error)
+            capture.failures += 1
+            capture.error = error
+            return []
+        capture.failures = 0
+        capture.error = None
+        return segments
+
+    def _fetch(self, station_id: str, capture: _Capture) -> list[Segment]:
+        try:
+            return capture.media_playlist_client.fetch()
+        except BadHttpStatusCodeError as error:
+            if error.status_code not in Authorization.STATUS_CODES_TOKEN_REJECTED:
+                raise
+            self.logger.info("token for %s is rejected, resolve again: %s", station_id, error)
+        capture.media_playlist_client = self._renew(station_id, capture.media_playlist_client)
+        return capture.media_playlist_client.fetch()
+
+    def _renew(self, station_id: str, media_playlist_client: MediaPlaylistClient) -> MediaPlaylistClient:
+        """Resolve station again with new token, continuing from the segments already returned."""
+        headers = media_playlist_client.master_playlist.headers
+        area_id = str(headers.get("X-Radiko-AreaId", self.area_id))
+        cache = MasterPlaylistClient.authorization_cache
+        if cache is not None:
+            cached = cache.get(area_id, self.radiko_session)
+            # Other station may have renewed token of the area already
+            if cached is not None and cached.get("X-Radiko-AuthToken") == headers.get("X-Radiko-AuthToken"):
+                cache.invalidate(area_id, self.radiko_session, expired=True)
+        master_playlist = MasterPlaylistClient.get(
+            LiveMasterPlaylistRequest(station_id),
+            area_id=area_id,
+            radiko_session=self.radiko_session,
+        )
+        renewed = MediaPlaylistClient(master_playlist)
+        renewed.parser.next_media_sequence = media_playlist_client.parser.next_media_sequence
+        return renewed
@@ -2,14 +2,26 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from collections.abc import Mapping
 
+    from radikoplaylist.master_playlist_request import MasterPlaylistRequest
+
 
 # pylint: disable=too-few-public-methods
 class MasterPlaylist:
     def __init__(self, media_playlist_url: str, headers: Mapping[str, str | bytes]) -> None:
         self.media_playlist_url = media_playlist_url
         self.headers = headers
+
+
+@dataclass(frozen=True)
+class MasterPlaylistResult:
+    """Result of each request in batch: either master playlist or error."""
+
+    master_playlist_request: MasterPlaylistRequest
+    master_playlist: MasterPlaylist | None = None
+    error: Exception | None = None
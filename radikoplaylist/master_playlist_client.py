@@ -2,27 +2,86 @@
 
 from __future__ import annotations
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
 from logging import getLogger
 from typing import TYPE_CHECKING
-from typing import cast
+from typing import ClassVar
 
-import m3u8
+from requests import ConnectionError as RequestsConnectionError
 
 from radikoplaylist.authorization import Authorization
+from radikoplaylist.authorization import AuthorizationCache
+from radikoplaylist.circuit_breaker import HostCircuitBreaker
+from radikoplaylist.exceptions import BadHttpStatusCodeError
+from radikoplaylist.exceptions import HttpRequestTimeoutError
 from radikoplaylist.master_playlist import MasterPlaylist
+from radikoplaylist.master_playlist import MasterPlaylistResult
+from radikoplaylist.master_playlist_parser import MasterPlaylistParser
+from radikoplaylist.requester import Phase
 from radikoplaylist.requester import Requester
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
     from collections.abc import Mapping
 
     from radikoplaylist.master_playlist_request import MasterPlaylistRequest
+    from radikoplaylist.station_catalog import StationCatalog
 
 __all__ = ["MasterPlaylistClient"]
 
 
+class SharedAuthorization:
+    """Authorized headers shared by requests for the same area and session in a batch.
+
+    The first request authenticates and the others wait for it, so each area and session authenticates only once.
+    """
+
+    def __init__(self, authorization: Authorization) -> None:
+        self._authorization = authorization
+        self._lock = threading.Lock()
+        self._headers: dict[str, str | bytes] | None = None
+        self._error: Exception | None = None
+
+    def auth(self) -> dict[str, str | bytes]:
+        with self._lock:
+            return self._get_headers()
+
+    def renew(self, headers: Mapping[str, str | bytes], error: BadHttpStatusCodeError) -> dict[str, str | bytes]:
+        """Return new headers when radiko rejected cached headers, otherwise raise the error."""
+        with self._lock:
+            if self._headers is not headers:
+                # Other request has already renewed
+                return self._get_headers()
+            if not self._authorization.is_rejected(error):
+                raise error
+            self._authorization.invalidate()
+            self._headers = None
+            return self._get_headers()
+
+    def _get_headers(self) -> dict[str, str | bytes]:
+        if self._error is not None:
+            raise self._error
+        if self._headers is None:
+            try:
+                self._headers = self._authorization.auth()
+            except Exception as error:
+                self._error = error
+                raise
+        return self._headers
+
+
 class MasterPlaylistClient:
     """Implements get process fot master playlist."""
 
+    MAX_WORKERS_DEFAULT = 8
+    # Set None to authenticate on every call
+    authorization_cache: ClassVar[AuthorizationCache | None] = AuthorizationCache()
+    # Set to select area where each station is available instead of area_id, unless radiko_session is given
+    station_catalog: ClassVar[StationCatalog | None] = None
+
     @classmethod
     def get(
         cls,
@@ -39,14 +98,152 @@ class MasterPlaylistClient:
             radiko_session: Optional radiko premium session cookie for 30-day timefree access.
                 Required for TimeFree30DayMasterPlaylistRequest to access premium content.
         """
-        headers = Authorization(area_id=area_id, radiko_session=radiko_session).auth()
-        url_master_playlist = cls._get_url(master_playlist_request, headers)
+        authorization = cls.create_authorization(master_playlist_request.station_id, area_id, radiko_session)
+        headers = authorization.auth()
+        try:
+            url_master_playlist = cls._get_url(master_playlist_request, headers)
+        except BadHttpStatusCodeError as error:
+            if not authorization.is_rejected(error):
+                raise
+            authorization.invalidate()
+            headers = authorization.auth()
+            url_master_playlist = cls._get_url(master_playlist_request, headers)
         return MasterPlaylist(url_master_playlist, headers)
 
+    @classmethod
+    def get_many(
+        cls,
+        master_playlist_requests: Iterable[MasterPlaylistRequest],
+        *,
+        area_id: str = Authorization.ARIA_ID_DEFAULT,
+        radiko_session: str | None = None,
+        area_ids: Mapping[str, str] | None = None,
+        max_workers: int = MAX_WORKERS_DEFAULT,
+    ) -> Iterator[MasterPlaylistResult]:
+        """Get master playlists concurrently, yielding each result as soon as it completes.
+
+        Authentication runs only once for each distinct area and session. An error of each request is yielded as
+        MasterPlaylistResult.error instead of being raised.
+
+        Args:
+            master_playlist_requests: Request objects (Live, TimeFree, or TimeFree30Day)
+            area_id: Area ID for radiko (default: JP13 for Tokyo)
+            radiko_session: Optional radiko premium session cookie for 30-day timefree access.
+            area_ids: Area ID for each station ID to override area_id.
+            max_workers: Maximum number of concurrent requests.
+        """
+        master_playlist_requests = list(master_playlist_requests)
+        try:
+            area_ids = cls.select_area_ids(master_playlist_requests, area_id, radiko_session, area_ids)
+        # Reason: To yield error of each request instead of raising
+        except Exception as error:  # noqa: BLE001 pylint: disable=broad-exception-caught
+            for master_playlist_request in master_playlist_requests:
+                yield MasterPlaylistResult(master_playlist_request, error=error)
+            return
+        shared_authorizations: dict[str, SharedAuthorization] = {}
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="radikoplaylist")
+        futures = []
+        try:
+            for master_playlist_request in master_playlist_requests:
+                area_id_request = (area_ids or {}).get(master_playlist_request.station_id, area_id)
+                if area_id_request not in shared_authorizations:
+                    authorization = Authorization(
+                        area_id=area_id_request,
+                        radiko_session=radiko_session,
+                        cache=cls.authorization_cache,
+                    )
+                    shared_authorizations[area_id_request] = SharedAuthorization(authorization)
+                shared_authorization = shared_authorizations[area_id_request]
+                futures.append(executor.submit(cls._get_result, master_playlist_request, shared_authorization))
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    @classmethod
+    def create_authorization(cls, station_id: str, area_id: str, radiko_session: str | None) -> Authorization:
+        return Authorization.for_station(
+            station_id,
+            cls.station_catalog,
+            area_id=area_id,
+            radiko_session=radiko_session,
+            cache=cls.authorization_cache,
+        )
+
+    @classmethod
+    def select_area_ids(
+        cls,
+        master_playlist_requests: Iterable[MasterPlaylistRequest],
+        area_id: str,
+        radiko_session: str | None,
+        area_ids: Mapping[str, str] | None,
+    ) -> Mapping[str, str] | None:
+        """Group stations without area in area_ids by station catalog, so that fewest areas authenticate."""
+        if cls.station_catalog is None or radiko_session is not None:
+            return area_ids
+        area_ids = area_ids or {}
+        station_ids = [
+            request.station_id for request in master_playlist_requests if request.station_id not in area_ids
+        ]
+        selected = {
+            station_id: area_id_group
+            for area_id_group, station_ids_group in cls.station_catalog.group_by_area(station_ids, area_id).items()
+            for station_id in station_ids_group
+        }
+        return {**selected, **area_ids}
+
+    @classmethod
+    def _get_result(
+        cls,
+        master_playlist_request: MasterPlaylistRequest,
+        shared_authorization: SharedAuthorization,
+    ) -> MasterPlaylistResult:
+        try:
+            headers = shared_authorization.auth()
+            try:
+                url_master_playlist = cls._get_url(master_playlist_request, headers)
+            except BadHttpStatusCodeError as error:
+                headers = shared_authorization.renew(headers, error)
+                url_master_playlist = cls._get_url(master_playlist_request, headers)
+        # Reason: To yield error of each request instead of raising
+        except Exception as error:  # noqa: BLE001 pylint: disable=broad-exception-caught
+            return MasterPlaylistResult(master_playlist_request, error=error)
+        return MasterPlaylistResult(master_playlist_request, MasterPlaylist(url_master_playlist, headers))
+
     @classmethod
     def _get_url(cls, master_playlist_request: MasterPlaylistRequest, headers: Mapping[str, str | bytes]) -> str:
+        """Request candidates in order, falling back to the next one when the host fails.
+
+        Candidates after the first one are resolved only when falling back.
+        """
+        urls = master_playlist_request.iter_urls(headers)
+        url = next(urls)
+        while True:
+            try:
+                response = Requester.get(url, headers, phase=Phase.MASTER_PLAYLIST)
+            # Reason: To fall back to the next candidate on failure of each host
+            except (HttpRequestTimeoutError, BadHttpStatusCodeError, RequestsConnectionError) as error:  # noqa: PERF203
+                cls.check_fallback(url, error)
+                url_next = next(urls, None)
+                if url_next is None:
+                    raise
+                url = url_next
+            else:
+                return cls.extract_media_playlist_url(response.content)
+
+    @staticmethod
+    def check_fallback(url: str, error: Exception) -> None:
+        """Raise the error unless it is caused by the host, so the next candidate can be tried."""
+        if not HostCircuitBreaker.is_host_failure(error):
+            raise error
+        getLogger(__name__).warning("candidate %s failed by host: %s", url, error)
+
+    @staticmethod
+    def extract_media_playlist_url(content: bytes) -> str:
+        """Extract URL of media playlist from master playlist."""
         logger = getLogger(__name__)
-        response = Requester.get(master_playlist_request.build_url(headers), headers)
-        master_playlist_url = m3u8.loads(response.content.decode("utf-8")).playlists[0].uri
+        master_playlist_url = MasterPlaylistParser.extract_media_playlist_url(content)
         logger.debug("master_playlist_url: %s", master_playlist_url)
-        return cast("str", master_playlist_url)
+        return master_playlist_url
@@ -0,0 +1,74 @@
+"""Implements fast path parser of master playlist from radiko."""
+
+from __future__ import annotations
+
+from logging import getLogger
+from typing import TYPE_CHECKING
+from typing import cast
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+class UnexpectedMasterPlaylistError(ValueError):
+    """Master playlist is not in the format which the fast path parser expects."""
+
+
+class MasterPlaylistParser:
+    """Parses variant streams from bytes of master playlist without building whole model.
+
+    radiko's master playlist is a few lines of #EXT-X-STREAM-INF and URI. Only when the content is not in this format,
+    it is parsed by m3u8, which is imported on first use.
+    """
+
+    TAG_HEADER = b"#EXTM3U"
+    TAG_STREAM_INF = b"#EXT-X-STREAM-INF"
+
+    @classmethod
+    def extract_media_playlist_url(cls, content: bytes) -> str:
+        """Return URI of the first variant stream.
+
+        Raises:
+            IndexError: When no variant stream is found by m3u8.
+        """
+        try:
+            return next(cls.iter_uris(content))
+        except (StopIteration, UnexpectedMasterPlaylistError, UnicodeDecodeError) as error:
+            getLogger(__name__).debug("fall back to m3u8: %r", error)
+        return cls.extract_media_playlist_url_by_m3u8(content)
+
+    @classmethod
+    def iter_uris(cls, content: bytes) -> Iterator[str]:
+        """Yield URI of each #EXT-X-STREAM-INF in order.
+
+        Raises:
+            UnexpectedMasterPlaylistError: When content lacks header or tag lacks URI.
+        """
+        if not content.lstrip().startswith(cls.TAG_HEADER):
+            msg = "missing #EXTM3U"
+            raise UnexpectedMasterPlaylistError(msg)
+        position = content.find(cls.TAG_STREAM_INF)
+        while position >= 0:
+            uri, position = cls.find_uri(content, position)
+            yield uri
+            position = content.find(cls.TAG_STREAM_INF, position)
+
+    @staticmethod
+    def find_uri(content: bytes, position: int) -> tuple[str, int]:
+        """Return the first URI line after the tag line at position, and the end of the URI line."""
+        end = content.find(b"\n", position)
+        while end >= 0:
+            start = end + 1
+            end = content.find(b"\n", start)
+            line = content[start : len(content) if end < 0 else end].strip()
+            if line and not line.startswith(b"#"):
+                return line.decode("utf-8"), len(content) if end < 0 else end
+        msg = "missing URI after #EXT-X-STREAM-INF"
+        raise UnexpectedMasterPlaylistError(msg)
+
+    @staticmethod
+    def extract_media_playlist_url_by_m3u8(content: bytes) -> str:
+        # Reason: To keep m3u8 off the startup path since it's needed only for unexpected input.
+        import m3u8  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+        return cast("str", m3u8.loads(content.decode("utf-8")).playlists[0].uri)
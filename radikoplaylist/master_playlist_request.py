@@ -13,8 +13,10 @@ from typing import TYPE_CHECKING
 from radikoplaylist.playlist_create_url_getter import LivePlaylistCreateUrlGetter
 from radikoplaylist.playlist_create_url_getter import TimeFree30DayPlaylistCreateUrlGetter
 from radikoplaylist.playlist_create_url_getter import TimeFreePlaylistCreateUrlGetter
+from radikoplaylist.requester import AsyncRequester
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
     from collections.abc import Mapping
 
 __all__ = [
@@ -39,10 +41,58 @@ class MasterPlaylistRequest(ABC):
         self.logger.debug("playlist url:%s", url)
         return url
 
+    def build_urls(self, headers: Mapping[str, str | bytes]) -> list[str]:
+        """Build URLs on each available host in order to try."""
+        query = self.build_query()
+        return [playlist_create_url + "?" + query for playlist_create_url in self.get_playlist_create_urls(headers)]
+
+    def iter_urls(self, headers: Mapping[str, str | bytes]) -> Iterator[str]:
+        """Yield URLs of build_urls() lazily, so candidates to fall back to are resolved only when needed."""
+        query = self.build_query()
+        for playlist_create_url in self.iter_playlist_create_urls(headers):
+            yield playlist_create_url + "?" + query
+
+    async def build_urls_async(self, headers: Mapping[str, str | bytes]) -> list[str]:
+        """Asyncio version of build_urls()."""
+        query = self.build_query()
+        playlist_create_urls = await self.get_playlist_create_urls_async(headers)
+        return [playlist_create_url + "?" + query for playlist_create_url in playlist_create_urls]
+
+    async def build_url_async(self, headers: Mapping[str, str | bytes]) -> str:
+        """Asyncio version of build_url()."""
+        url = await self.get_playlist_create_url_async(headers) + "?" + self.build_query()
+        self.logger.debug("playlist url:%s", url)
+        return url
+
     @abstractmethod
     def get_playlist_create_url(self, headers: Mapping[str, str | bytes]) -> str:
         raise NotImplementedError
 
+    async def get_playlist_create_url_async(self, headers: Mapping[str, str | bytes]) -> str:
+        """Asyncio version of get_playlist_create_url().
+
+        Subclasses should override this, otherwise get_playlist_create_url() runs on the thread pool of AsyncRequester.
+        """
+        return await AsyncRequester.run(self.get_playlist_create_url, headers)
+
+    def get_playlist_create_urls(self, headers: Mapping[str, str | bytes]) -> list[str]:
+        """Get available URLs to create playlist in order to try.
+
+        Subclasses should override this, otherwise only get_playlist_create_url() is tried.
+        """
+        return [self.get_playlist_create_url(headers)]
+
+    def iter_playlist_create_urls(self, headers: Mapping[str, str | bytes]) -> Iterator[str]:
+        """Yield URLs of get_playlist_create_urls() lazily.
+
+        Subclasses should override this, otherwise get_playlist_create_urls() resolves all of them at once.
+        """
+        yield from self.get_playlist_create_urls(headers)
+
+    async def get_playlist_create_urls_async(self, headers: Mapping[str, str | bytes]) -> list[str]:
+        """Asyncio version of get_playlist_create_urls()."""
+        return await AsyncRequester.run(self.get_playlist_create_urls, headers)
+
     @abstractmethod
     def build_query(self) -> str:
         raise NotImplementedError
@@ -62,6 +112,18 @@ class LiveMasterPlaylistRequest(MasterPlaylistRequest):
     def get_playlist_create_url(self, headers: Mapping[str, str | bytes]) -> str:
         return LivePlaylistCreateUrlGetter.get(self.station_id, headers)
 
+    async def get_playlist_create_url_async(self, headers: Mapping[str, str | bytes]) -> str:
+        return await LivePlaylistCreateUrlGetter.get_async(self.station_id, headers)
+
+    def get_playlist_create_urls(self, headers: Mapping[str, str | bytes]) -> list[str]:
+        return LivePlaylistCreateUrlGetter.get_candidates(self.station_id, headers)
+
+    def iter_playlist_create_urls(self, headers: Mapping[str, str | bytes]) -> Iterator[str]:
+        return LivePlaylistCreateUrlGetter.iter_candidates(self.station_id, headers)
+
+    async def get_playlist_create_urls_async(self, headers: Mapping[str, str | bytes]) -> list[str]:
+        return await LivePlaylistCreateUrlGetter.get_candidates_async(self.station_id, headers)
+
     def build_query(self) -> str:
         return "station_id=" + self.station_id + "&l=15&lsid=" + self.generate_uid() + "&type=b"
 
@@ -83,6 +145,18 @@ class TimeFreeMasterPlaylistRequest(MasterPlaylistRequest):
     def get_playlist_create_url(self, headers: Mapping[str, str | bytes]) -> str:
         return TimeFreePlaylistCreateUrlGetter.get(self.station_id, headers)
 
+    async def get_playlist_create_url_async(self, headers: Mapping[str, str | bytes]) -> str:
+        return await TimeFreePlaylistCreateUrlGetter.get_async(self.station_id, headers)
+
+    def get_playlist_create_urls(self, headers: Mapping[str, str | bytes]) -> list[str]:
+        return TimeFreePlaylistCreateUrlGetter.get_candidates(self.station_id, headers)
+
+    def iter_playlist_create_urls(self, headers: Mapping[str, str | bytes]) -> Iterator[str]:
+        return TimeFreePlaylistCreateUrlGetter.iter_candidates(self.station_id, headers)
+
+    async def get_playlist_create_urls_async(self, headers: Mapping[str, str | bytes]) -> list[str]:
+        return await TimeFreePlaylistCreateUrlGetter.get_candidates_async(self.station_id, headers)
+
     def build_query(self) -> str:
         return (
             "station_id=" + self.station_id + "&"
@@ -126,6 +200,18 @@ class TimeFree30DayMasterPlaylistRequest(MasterPlaylistRequest):
     def get_playlist_create_url(self, headers: Mapping[str, str | bytes]) -> str:
         return TimeFree30DayPlaylistCreateUrlGetter.get(self.station_id, headers)
 
+    async def get_playlist_create_url_async(self, headers: Mapping[str, str | bytes]) -> str:
+        return await TimeFree30DayPlaylistCreateUrlGetter.get_async(self.station_id, headers)
+
+    def get_playlist_create_urls(self, headers: Mapping[str, str | bytes]) -> list[str]:
+        return TimeFree30DayPlaylistCreateUrlGetter.get_candidates(self.station_id, headers)
+
+    def iter_playlist_create_urls(self, headers: Mapping[str, str | bytes]) -> Iterator[str]:
+        return TimeFree30DayPlaylistCreateUrlGetter.iter_candidates(self.station_id, headers)
+
+    async def get_playlist_create_urls_async(self, headers: Mapping[str, str | bytes]) -> list[str]:
+        return await TimeFree30DayPlaylistCreateUrlGetter.get_candidates_async(self.station_id, headers)
+
     def build_query(self) -> str:
         return (
             "station_id=" + self.station_id + "&"
@@ -0,0 +1,125 @@
+"""Model and incremental parser of media playlist (chunklist)."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from urllib.parse import urljoin
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+@dataclass(frozen=True)
+class Segment:
+    """Media segment listed in media playlist."""
+
+    # Absolute URI
+    uri: str
+    # Seconds
+    duration: float
+    media_sequence: int
+    # Value of #EXT-X-PROGRAM-DATE-TIME as is, only on segments which carry the tag
+    program_date_time: str | None = None
+
+
+class MediaPlaylistParser:
+    """Streaming line parser of media playlist which keeps state between fetches.
+
+    On re-fetch, when the content starts with the content parsed before (EVENT or growing playlist), only the appended
+    lines are processed. Otherwise (sliding window of live), segments already returned are skipped by media sequence
+    without being built. The last line without line break is parsed only when the content is complete, and the state
+    before it is kept, so that the next content resumes from its start.
+    """
+
+    TAG_INF = b"#EXTINF:"
+    TAG_MEDIA_SEQUENCE = b"#EXT-X-MEDIA-SEQUENCE:"
+    TAG_TARGET_DURATION = b"#EXT-X-TARGETDURATION:"
+    TAG_PROGRAM_DATE_TIME = b"#EXT-X-PROGRAM-DATE-TIME:"
+    TAG_END_LIST = b"#EXT-X-ENDLIST"
+
+    def __init__(self, base_uri: str = "") -> None:
+        self.base_uri = base_uri
+        self.target_duration: int | None = None
+        self.end_list = False
+        # Media sequence of the next segment to return
+        self.next_media_sequence: int | None = None
+        self._content = b""
+        # State while parsing lines of one content
+        self._media_sequence = 0
+        self._duration: float | None = None
+        self._program_date_time: str | None = None
+        # State at the end of self._content
+        self._state: tuple[int, float | None, str | None] = (0, None, None)
+
+    def feed(self, content: bytes, *, complete: bool = True) -> list[Segment]:
+        """Parse fetched content and return segments not returned before.
+
+        Args:
+            content: Body of media playlist.
+            complete: False when content is a part of body being received, so its last line may be cut.
+        """
+        if self._content and content.startswith(self._content):
+            # Parsing state at the end of the previous content continues
+            start = len(self._content)
+            self._media_sequence, self._duration, self._program_date_time = self._state
+        else:
+            start = 0
+            self._media_sequence = 0
+            self._duration = None
+            self._program_date_time = None
+        # Keep only complete lines to resume from
+        end = content.rfind(b"\n") + 1
+        segments = self._parse_lines(content[start:end].split(b"\n"))
+        self._content = content[:end]
+        self._state = (self._media_sequence, self._duration, self._program_date_time)
+        if complete:
+            # The rest is the last line without line break
+            segments.extend(self._parse_lines([content[end:]]))
+        return segments
+
+    def _parse_lines(self, lines: Iterable[bytes]) -> list[Segment]:
+        segments = []
+        for line in lines:
+            segment = self._parse_line(line)
+            if segment is not None:
+                segments.append(segment)
+        return segments
+
+    def _parse_line(self, line: bytes) -> Segment | None:
+        line = line.strip()
+        if not line:
+            return None
+        if line.startswith(b"#"):
+            self._parse_tag(line)
+            return None
+        return self._build_segment(line)
+
+    def _parse_tag(self, line: bytes) -> None:
+        if line.startswith(self.TAG_INF):
+            self._duration = float(line[len(self.TAG_INF) :].split(b",", 1)[0])
+        elif line.startswith(self.TAG_PROGRAM_DATE_TIME):
+            self._program_date_time = line[len(self.TAG_PROGRAM_DATE_TIME) :].decode("utf-8")
+        elif line.startswith(self.TAG_MEDIA_SEQUENCE):
+            self._media_sequence = int(line[len(self.TAG_MEDIA_SEQUENCE) :])
+        elif line.startswith(self.TAG_TARGET_DURATION):
+            self.target_duration = int(line[len(self.TAG_TARGET_DURATION) :])
+        elif line.startswith(self.TAG_END_LIST):
+            self.end_list = True
+
+    def _build_segment(self, line: bytes) -> Segment | None:
+        media_sequence = self._media_sequence
+        duration = self._duration
+        program_date_time = self._program_date_time
+        self._media_sequence += 1
+        self._duration = None
+        self._program_date_time = None
+        if self.next_media_sequence is not None and media_sequence < self.next_media_sequence:
+            return None
+        self.next_media_sequence = media_sequence + 1
+        return Segment(
+            urljoin(self.base_uri, line.decode("utf-8")),
+            0.0 if duration is None else duration,
+            media_sequence,
+            program_date_time,
+        )
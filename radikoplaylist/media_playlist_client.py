@@ -0,0 +1,47 @@
+"""Implements get process for media playlist."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from radikoplaylist.media_playlist import MediaPlaylistParser
+from radikoplaylist.requester import Phase
+from radikoplaylist.requester import Requester
+
+if TYPE_CHECKING:
+    from radikoplaylist.master_playlist import MasterPlaylist
+    from radikoplaylist.media_playlist import Segment
+
+__all__ = ["MediaPlaylistClient"]
+
+
+class MediaPlaylistClient:
+    """Fetches media playlist behind master playlist with its authorized headers.
+
+    Each fetch() returns only segments which are new since the previous fetch, while segments keeps all of them.
+    """
+
+    def __init__(self, master_playlist: MasterPlaylist) -> None:
+        self.master_playlist = master_playlist
+        self.parser = MediaPlaylistParser(master_playlist.media_playlist_url)
+        self.segments: list[Segment] = []
+
+    def fetch(self) -> list[Segment]:
+        """Fetch media playlist and return new segments."""
+        response = Requester.get(
+            self.master_playlist.media_playlist_url,
+            self.master_playlist.headers,
+            phase=Phase.MEDIA_PLAYLIST,
+        )
+        segments = self.parser.feed(response.content)
+        self.segments.extend(segments)
+        return segments
+
+    @property
+    def target_duration(self) -> int | None:
+        return self.parser.target_duration
+
+    @property
+    def end_list(self) -> bool:
+        """Whether #EXT-X-ENDLIST has been seen, after which no segment is added."""
+        return self.parser.end_list
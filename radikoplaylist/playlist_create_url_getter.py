@@ -4,42 +4,61 @@ from __future__ import annotations
 
 from abc import ABC
 from abc import abstractmethod
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
+from typing import ClassVar
 from typing import Generic
 from typing import TypeVar
 
-from defusedxml import ElementTree
-
-from radikoplaylist.exceptions import FoundFastestHostToDownload
 from radikoplaylist.exceptions import NoAvailableUrlError
+from radikoplaylist.host_policy import HostPolicyTable
+from radikoplaylist.requester import AsyncRequester
 from radikoplaylist.requester import Requester
+from radikoplaylist.station_stream import StationStreamCache
+from radikoplaylist.station_stream import StationStreamClient
+from radikoplaylist.station_stream import StationStreamIndex
+from radikoplaylist.station_stream import StationStreamParser
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
     from collections.abc import Mapping
 
     # - defusedxml lacks an Element class · Issue #48 · tiran/defusedxml
     #   https://github.com/tiran/defusedxml/issues/48#issuecomment-1511284750
     from xml.etree.ElementTree import Element  # nosec B405
 
+    from radikoplaylist.host_latency import HostLatencyTracker
+    from radikoplaylist.station_stream import StationStreamUrl
+
 
 # Reason: This class is intentionally designed as a base class for other classes.
 class UrlChecker(ABC):  # noqa: B024
-    """To check URL whether FFmpeg supported or not."""
+    """To check URL whether FFmpeg supported or not.
+
+    Hosts are classified by process-wide host_policy_table, so checking URL is a lookup of its host.
+    """
 
     C_RPAA = "https://c-rpaa.smartstream.ne.jp"
     SI_C_RADIKO = "https://si-c-radiko.smartstream.ne.jp"
     SI_F_RADIKO = "https://si-f-radiko.smartstream.ne.jp"
     RD_WOWZA_RADIKO = "https://rd-wowza-radiko.radiko-cf.com"
     F_RADIKO = "https://f-radiko.smartstream.ne.jp"
+    TIME_FREE = False
+    # Set HostPolicyTable.load(path) to classify hosts by other file. None means HostPolicyTable.default().
+    host_policy_table: ClassVar[HostPolicyTable | None] = None
 
-    def __init__(self) -> None:
-        self.tuple_ffmpeg_unsupported = self.get_tuple_ffmpeg_unsupported()
-
-    def get_tuple_ffmpeg_unsupported(self) -> tuple[str, ...]:
-        return (self.C_RPAA, self.SI_C_RADIKO, self.SI_F_RADIKO)
+    @staticmethod
+    def get_host_policy_table() -> HostPolicyTable:
+        table = UrlChecker.host_policy_table
+        return HostPolicyTable.default() if table is None else table
 
     def is_ffmpeg_supported(self, url: str) -> bool:
-        return not url.startswith(self.tuple_ffmpeg_unsupported)
+        return self.get_host_policy_table().classify(url).is_ffmpeg_supported(time_free=self.TIME_FREE)
+
+    # Reason: Overridden by TimeFreeUrlChecker.
+    def is_fastest_host_to_download(self, url: str) -> bool:  # noqa: ARG002
+        return False
 
 
 class LiveUrlChecker(UrlChecker):
@@ -54,26 +73,117 @@ class TimeFreeUrlChecker(UrlChecker):
     RPAA = "https://rpaa.smartstream.ne.jp"
     TF_C_RPAA_RADIKO = "https://tf-c-rpaa-radiko.smartstream.ne.jp"
     TF_F_RPAA_RADIKO = "https://tf-f-rpaa-radiko.smartstream.ne.jp"
-
-    def get_tuple_ffmpeg_unsupported(self) -> tuple[str, ...]:
-        return (*super().get_tuple_ffmpeg_unsupported(), self.TF_C_RPAA_RADIKO, self.TF_F_RPAA_RADIKO, self.RPAA)
+    TIME_FREE = True
 
     @staticmethod
     def is_fastest_host_to_download(url: str) -> bool:
-        return url.startswith(TimeFreeUrlChecker.RADIKO_JP)
+        return UrlChecker.get_host_policy_table().classify(url).fastest
 
 
 TypeVarHost = TypeVar("TypeVarHost", bound=UrlChecker)
 
 
+@dataclass(frozen=True)
+class PlaylistCreateUrlCandidate:
+    """Candidate of URL to create playlist with its classification."""
+
+    playlist_create_url: str
+    areafree: bool
+    timefree: bool
+    ffmpeg_supported: bool
+    # On the fastest host to download, which wins regardless of preference
+    fastest: bool
+    # In the group of area to try first, others are fallback
+    preferred: bool
+
+
 class PlaylistCreateUrlGetter(Generic[TypeVarHost]):
     """Implements getting process URL to create playlist."""
 
+    # Shared by all getters. Set None to fetch station stream XML on every call.
+    station_stream_cache: ClassVar[StationStreamCache | None] = StationStreamCache()
+    # Set HostLatencyTracker to prefer the fastest healthy host within candidates of the same preference
+    host_latency_tracker: ClassVar[HostLatencyTracker | None] = None
+
     @classmethod
     def get(cls, station_id: str, headers: Mapping[str, str | bytes]) -> str:
-        url = "https://radiko.jp/v3/station/stream/pc_html5/" + station_id + ".xml"
-        response = Requester.get(url, headers)
-        return cls.get_playlist_create_url(response.text)
+        """Get URL to create playlist which wins the selection.
+
+        Without station stream cache, fetched XML is parsed only until the winner is found.
+        """
+        if PlaylistCreateUrlGetter.station_stream_cache is None:
+            return cls.fetch_playlist_create_url(station_id, headers)
+        return cls.get_candidates(station_id, headers)[0]
+
+    @classmethod
+    async def get_async(cls, station_id: str, headers: Mapping[str, str | bytes]) -> str:
+        """Asyncio version of get()."""
+        if PlaylistCreateUrlGetter.station_stream_cache is None:
+            return await AsyncRequester.run(cls.fetch_playlist_create_url, station_id, headers)
+        return (await cls.get_candidates_async(station_id, headers))[0]
+
+    @classmethod
+    def fetch_playlist_create_url(cls, station_id: str, headers: Mapping[str, str | bytes]) -> str:
+        """Fetch XML of station and parse it until the winner is found, bypassing the cache."""
+        return cls.parse_playlist_create_url(
+            StationStreamClient.fetch(station_id, headers),
+            has_premium=cls.has_premium_session(headers),
+        )
+
+    @classmethod
+    def iter_candidates(cls, station_id: str, headers: Mapping[str, str | bytes]) -> Iterator[str]:
+        """Yield URLs of get_candidates() lazily.
+
+        Without station stream cache, fetched XML is parsed only until the winner, which is yielded first, and the rest
+        is parsed only when the next URL is requested to fall back.
+        """
+        if PlaylistCreateUrlGetter.station_stream_cache is not None:
+            yield from cls.get_candidates(station_id, headers)
+            return
+        yield from cls.iter_playlist_create_urls(
+            StationStreamClient.fetch(station_id, headers),
+            has_premium=cls.has_premium_session(headers),
+        )
+
+    @classmethod
+    def get_candidates(cls, station_id: str, headers: Mapping[str, str | bytes]) -> list[str]:
+        """Get available URLs to create playlist in order to try, to fall back to the next one on failure of host."""
+        urls = cls.filter_index(cls.get_station_stream_index(station_id, headers))
+        return cls.select_playlist_create_urls(urls, has_premium=cls.has_premium_session(headers))
+
+    @classmethod
+    async def get_candidates_async(cls, station_id: str, headers: Mapping[str, str | bytes]) -> list[str]:
+        """Asyncio version of get_candidates()."""
+        index = await AsyncRequester.run(cls.get_station_stream_index, station_id, headers)
+        return cls.select_playlist_create_urls(cls.filter_index(index), has_premium=cls.has_premium_session(headers))
+
+    @classmethod
+    def get_ranked_candidates(
+        cls,
+        station_id: str,
+        headers: Mapping[str, str | bytes],
+    ) -> list[PlaylistCreateUrlCandidate]:
+        """Get all candidates of station ranked by rank_candidates()."""
+        urls = cls.filter_index(cls.get_station_stream_index(station_id, headers))
+        return cls.rank_candidates(urls, has_premium=cls.has_premium_session(headers))
+
+    @staticmethod
+    def get_station_stream_urls(station_id: str, headers: Mapping[str, str | bytes]) -> tuple[StationStreamUrl, ...]:
+        """Get parsed candidates of station, from cache when enabled."""
+        return PlaylistCreateUrlGetter.get_station_stream_index(station_id, headers).urls
+
+    @staticmethod
+    def get_station_stream_index(station_id: str, headers: Mapping[str, str | bytes]) -> StationStreamIndex:
+        """Get index of candidates of station shared by all getters, from cache when enabled."""
+        cache = PlaylistCreateUrlGetter.station_stream_cache
+        if cache is None:
+            return StationStreamIndex(StationStreamClient.get(station_id, headers))
+        return cache.get_index(station_id, headers)
+
+    @classmethod
+    def filter_index(cls, index: StationStreamIndex) -> tuple[StationStreamUrl, ...]:
+        """Look up candidates which this getter may use."""
+        return index.get(cls.time_free())
 
     @staticmethod
     def has_premium_session(headers: Mapping[str, str | bytes]) -> bool:
@@ -84,51 +194,192 @@ class PlaylistCreateUrlGetter(Generic[TypeVarHost]):
 
     @classmethod
     def get_playlist_create_url(cls, string_xml: str) -> str:
-        """Parse XML and extract target URL to create playlist."""
-        root = ElementTree.fromstring(string_xml, forbid_dtd=True)
-        list_url = [
-            url
-            for url in root.findall(".//url")
-            if url.get("areafree") == "1" and url.get("timefree") == cls.time_free()
-        ]
-        list_playlist_create_url = [cls.strip_playlist_create_url(url) for url in list_url]
-        return cls.filter_playlist_create_url(list_playlist_create_url)
+        """Parse XML and extract target URL to create playlist.
+
+        Parsing stops at the first URL which certainly wins the selection, unless latency ranking is enabled.
+        """
+        return cls.parse_playlist_create_url(string_xml)
 
     @classmethod
-    def strip_playlist_create_url(cls, url: Element) -> str:
-        """Strip playlist create URL."""
-        element = url.find("./playlist_create_url")
-        if element is None:
-            msg = "playlist_create_url element not found"
-            raise ValueError(msg)
-        if element.text is None:
-            msg = "playlist_create_url text is None"
-            raise ValueError(msg)
-        return element.text
+    def parse_playlist_create_url(cls, string_xml: str | bytes, *, has_premium: bool = False) -> str:
+        """Parse XML incrementally, stopping early when find_playlist_create_url() finds the winner."""
+        return next(cls.iter_playlist_create_urls(string_xml, has_premium=has_premium))
+
+    @classmethod
+    def iter_playlist_create_urls(cls, string_xml: str | bytes, *, has_premium: bool = False) -> Iterator[str]:
+        """Yield URLs of select_playlist_create_urls() from XML, parsing the rest after the winner only when needed.
+
+        Raises:
+            NoAvailableUrlError: When no URL is available.
+        """
+        urls = StationStreamParser.iterparse(string_xml)
+        parsed: list[StationStreamUrl] = []
+        winner = None
+        if PlaylistCreateUrlGetter.host_latency_tracker is None:
+            winner = cls.find_playlist_create_url(cls.record(urls, parsed), has_premium=has_premium)
+            if winner is not None:
+                yield winner
+        # Rest of document, if any
+        parsed.extend(urls)
+        for url in cls.select_playlist_create_urls(parsed, has_premium=has_premium):
+            if url != winner:
+                yield url
+
+    @staticmethod
+    def record(urls: Iterable[StationStreamUrl], parsed: list[StationStreamUrl]) -> Iterator[StationStreamUrl]:
+        for url in urls:
+            parsed.append(url)
+            yield url
+
+    @classmethod
+    def find_playlist_create_url(cls, urls: Iterable[StationStreamUrl], *, has_premium: bool = False) -> str | None:
+        """Return the first URL in document order which certainly wins the selection, or None if not found."""
+        for url in urls:
+            candidate = cls.classify(url, has_premium=has_premium)
+            if candidate is not None and cls.is_winner(candidate) and cls.is_allowed(candidate.playlist_create_url):
+                return candidate.playlist_create_url
+        return None
+
+    @classmethod
+    def is_winner(cls, candidate: PlaylistCreateUrlCandidate) -> bool:
+        """Check whether no candidate later in document can be ranked higher."""
+        return candidate.ffmpeg_supported and candidate.preferred
+
+    @staticmethod
+    def is_allowed(playlist_create_url: str) -> bool:
+        """Check whether circuit breaker allows request to the host of URL, claiming the trial of half-open host."""
+        circuit_breaker = Requester.circuit_breaker
+        return circuit_breaker is None or circuit_breaker.allow(playlist_create_url)
+
+    @classmethod
+    def select_playlist_create_url(cls, urls: Iterable[StationStreamUrl], *, has_premium: bool = False) -> str:
+        """Select target URL to create playlist from parsed candidates."""
+        return cls.select_playlist_create_urls(urls, has_premium=has_premium)[0]
+
+    @classmethod
+    def select_playlist_create_urls(cls, urls: Iterable[StationStreamUrl], *, has_premium: bool = False) -> list[str]:
+        """Select available URLs to create playlist from parsed candidates in order to try, open circuits last.
+
+        Raises:
+            NoAvailableUrlError: When no URL is available.
+        """
+        return cls.select_candidates(cls.rank_candidates(urls, has_premium=has_premium))
 
     @classmethod
     def filter_playlist_create_url(cls, list_playlist_create_url: list[str]) -> str:
-        """Filter playlist create URL.
+        """Filter playlist create URL, see filter_playlist_create_urls()."""
+        return cls.filter_playlist_create_urls(list_playlist_create_url)[0]
 
-        This method is the part divided from get_playlist_create_url() since radon grades unified method as B.
+    @classmethod
+    def filter_playlist_create_urls(cls, list_playlist_create_url: list[str]) -> list[str]:
+        """Filter playlist create URLs without attributes of station stream XML in order to try.
+
+        URLs are ranked as preferred in-area candidates by sort_candidates(), since their areas are unknown.
+
+        Raises:
+            NoAvailableUrlError: When no URL is available.
         """
-        host = cls.create_host()
-        try:
-            candidacy = [
-                playlist_create_url
-                for playlist_create_url in list_playlist_create_url
-                if cls.filter_url(playlist_create_url, host)
-            ]
-        except FoundFastestHostToDownload as error:
-            return str(error)
+        candidates = [
+            cls.create_candidate(playlist_create_url, areafree=False, preferred=True)
+            for playlist_create_url in list_playlist_create_url
+        ]
+        return cls.select_candidates(cls.sort_candidates(candidates))
+
+    @classmethod
+    def select_candidates(cls, candidates: list[PlaylistCreateUrlCandidate]) -> list[str]:
+        """Select available URLs from ranked candidates in order to try, open circuits last.
+
+        Raises:
+            NoAvailableUrlError: When no URL is available.
+        """
+        # Same URL may be listed both as area-free and in-area
+        candidacy = list(
+            dict.fromkeys(candidate.playlist_create_url for candidate in candidates if candidate.ffmpeg_supported),
+        )
         if candidacy:
-            return candidacy[0]
-        if list_playlist_create_url:
+            circuit_breaker = Requester.circuit_breaker
+            return candidacy if circuit_breaker is None else circuit_breaker.order(candidacy)
+        if candidates:
+            list_playlist_create_url = [candidate.playlist_create_url for candidate in candidates]
             msg = f"All candidate URLs are FFmpeg-unsupported: {list_playlist_create_url}"
             raise NoAvailableUrlError(msg)
         msg = f"No playlist create URL found in XML for timefree={cls.time_free()}"
         raise NoAvailableUrlError(msg)
 
+    @classmethod
+    def rank_candidates(
+        cls,
+        urls: Iterable[StationStreamUrl],
+        *,
+        has_premium: bool = False,
+    ) -> list[PlaylistCreateUrlCandidate]:
+        """Classify and rank candidates for this getter in one pass without raising.
+
+        FFmpeg-supported candidates come first, then the fastest host to download, then preferred ones, keeping document
+        order on tie, or order by latency of FFmpeg-supported ones when host_latency_tracker is set. Candidates which
+        this getter never uses (for example, time free ones for live) are excluded.
+        """
+        return cls.sort_candidates(
+            [
+                candidate
+                for candidate in (cls.classify(url, has_premium=has_premium) for url in urls)
+                if candidate is not None
+            ],
+        )
+
+    @classmethod
+    def sort_candidates(cls, candidates: list[PlaylistCreateUrlCandidate]) -> list[PlaylistCreateUrlCandidate]:
+        """Rank classified candidates in order of rank_candidates()."""
+        tracker = PlaylistCreateUrlGetter.host_latency_tracker
+        if tracker is not None:
+            # Unsupported candidates are never selected, so their hosts are not probed
+            supported = [candidate.playlist_create_url for candidate in candidates if candidate.ffmpeg_supported]
+            order = {url: index for index, url in enumerate(tracker.rank(list(dict.fromkeys(supported))))}
+            candidates.sort(key=lambda candidate: order.get(candidate.playlist_create_url, len(order)))
+        return sorted(
+            candidates,
+            key=lambda candidate: (not candidate.ffmpeg_supported, not candidate.fastest, not candidate.preferred),
+        )
+
+    @classmethod
+    def classify(cls, url: StationStreamUrl, *, has_premium: bool = False) -> PlaylistCreateUrlCandidate | None:
+        """Classify candidate, or return None when this getter never uses it."""
+        if url.timefree != cls.time_free() or not cls.is_acceptable_area(url):
+            return None
+        return cls.create_candidate(
+            url.playlist_create_url,
+            areafree=url.areafree == "1",
+            preferred=cls.is_preferred(url, has_premium=has_premium),
+        )
+
+    @classmethod
+    def create_candidate(
+        cls,
+        playlist_create_url: str,
+        *,
+        areafree: bool,
+        preferred: bool,
+    ) -> PlaylistCreateUrlCandidate:
+        host = cls.create_host()
+        return PlaylistCreateUrlCandidate(
+            playlist_create_url,
+            areafree=areafree,
+            timefree=cls.time_free() == "1",
+            ffmpeg_supported=cls.filter_url(playlist_create_url, host),
+            fastest=host.is_fastest_host_to_download(playlist_create_url),
+            preferred=preferred,
+        )
+
+    @classmethod
+    def filter_url(cls, playlist_create_url: str, host: TypeVarHost) -> bool:
+        """Check whether URL is available. Override to exclude more URLs."""
+        return host.is_ffmpeg_supported(playlist_create_url)
+
+    @classmethod
+    def strip_playlist_create_url(cls, url: Element) -> str:
+        """Strip playlist create URL."""
+        return StationStreamParser.strip_playlist_create_url(url)
+
     @classmethod
     @abstractmethod
     def time_free(cls) -> str:
@@ -141,24 +392,40 @@ class PlaylistCreateUrlGetter(Generic[TypeVarHost]):
 
     @classmethod
     @abstractmethod
-    def filter_url(cls, playlist_create_url: str, host: TypeVarHost) -> bool:
+    def is_acceptable_area(cls, url: StationStreamUrl) -> bool:
+        raise NotImplementedError
+
+    @classmethod
+    @abstractmethod
+    def is_preferred(cls, url: StationStreamUrl, *, has_premium: bool) -> bool:
         raise NotImplementedError
 
 
 class LivePlaylistCreateUrlGetter(PlaylistCreateUrlGetter[LiveUrlChecker]):
     """Implements getting process Live URL to create playlist."""
 
+    # Stateless, so shared by all calls
+    URL_CHECKER = LiveUrlChecker()
+
     @classmethod
     def time_free(cls) -> str:
         return "0"
 
     @classmethod
     def create_host(cls) -> LiveUrlChecker:
-        return LiveUrlChecker()
+        return cls.URL_CHECKER
 
     @classmethod
-    def filter_url(cls, playlist_create_url: str, host: UrlChecker) -> bool:
-        return host.is_ffmpeg_supported(playlist_create_url)
+    def filter_index(cls, index: StationStreamIndex) -> tuple[StationStreamUrl, ...]:
+        return index.get(cls.time_free(), "1")
+
+    @classmethod
+    def is_acceptable_area(cls, url: StationStreamUrl) -> bool:
+        return url.areafree == "1"
+
+    @classmethod
+    def is_preferred(cls, url: StationStreamUrl, *, has_premium: bool) -> bool:  # noqa: ARG003
+        return True
 
 
 class TimeFreePlaylistCreateUrlGetterBase(PlaylistCreateUrlGetter[TimeFreeUrlChecker]):
@@ -169,11 +436,8 @@ class TimeFreePlaylistCreateUrlGetterBase(PlaylistCreateUrlGetter[TimeFreeUrlChe
     considers both, preferring in-area hosts unless the request headers carry a premium session cookie.
     """
 
-    @classmethod
-    def get(cls, station_id: str, headers: Mapping[str, str | bytes]) -> str:
-        url = "https://radiko.jp/v3/station/stream/pc_html5/" + station_id + ".xml"
-        response = Requester.get(url, headers)
-        return cls.get_playlist_create_url(response.text, has_premium=cls.has_premium_session(headers))
+    # Stateless, so shared by all calls
+    URL_CHECKER = TimeFreeUrlChecker()
 
     @classmethod
     def get_playlist_create_url(cls, string_xml: str, *, has_premium: bool = False) -> str:
@@ -184,12 +448,12 @@ class TimeFreePlaylistCreateUrlGetterBase(PlaylistCreateUrlGetter[TimeFreeUrlChe
             has_premium: Whether the caller has a premium radiko session. Area-free URLs are preferred when `True`;
                 in-area URLs are preferred otherwise, since free accounts are only entitled to those.
         """
-        root = ElementTree.fromstring(string_xml, forbid_dtd=True)
-        list_url = [url for url in root.findall(".//url") if url.get("timefree") == cls.time_free()]
-        area_free = [cls.strip_playlist_create_url(url) for url in list_url if url.get("areafree") == "1"]
-        in_area = [cls.strip_playlist_create_url(url) for url in list_url if url.get("areafree") == "0"]
-        list_playlist_create_url = area_free + in_area if has_premium else in_area + area_free
-        return cls.filter_playlist_create_url(list_playlist_create_url)
+        return cls.parse_playlist_create_url(string_xml, has_premium=has_premium)
+
+    @classmethod
+    def is_winner(cls, candidate: PlaylistCreateUrlCandidate) -> bool:
+        """Only the fastest host to download wins regardless of preference of area."""
+        return candidate.ffmpeg_supported and candidate.fastest
 
     @classmethod
     def time_free(cls) -> str:
@@ -197,13 +461,15 @@ class TimeFreePlaylistCreateUrlGetterBase(PlaylistCreateUrlGetter[TimeFreeUrlChe
 
     @classmethod
     def create_host(cls) -> TimeFreeUrlChecker:
-        return TimeFreeUrlChecker()
+        return cls.URL_CHECKER
 
     @classmethod
-    def filter_url(cls, playlist_create_url: str, host: TimeFreeUrlChecker) -> bool:
-        if host.is_fastest_host_to_download(playlist_create_url):
-            raise FoundFastestHostToDownload(playlist_create_url)
-        return host.is_ffmpeg_supported(playlist_create_url)
+    def is_acceptable_area(cls, url: StationStreamUrl) -> bool:
+        return url.areafree in ("0", "1")
+
+    @classmethod
+    def is_preferred(cls, url: StationStreamUrl, *, has_premium: bool) -> bool:
+        return url.areafree == ("1" if has_premium else "0")
 
 
 class TimeFreePlaylistCreateUrlGetter(TimeFreePlaylistCreateUrlGetterBase):
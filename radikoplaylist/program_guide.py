@@ -0,0 +1,165 @@
+"""Implements program guide client and interval index of programs."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from radikoplaylist.master_playlist_request import TimeFree30DayMasterPlaylistRequest
+from radikoplaylist.master_playlist_request import TimeFreeMasterPlaylistRequest
+from radikoplaylist.requester import Phase
+from radikoplaylist.requester import Requester
+from radikoplaylist.xml_iterparser import XmlIterParser
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+
+    from radikoplaylist.time_free_window import TimeFreeRequest
+
+__all__ = ["Program", "ProgramGuideClient", "ProgramGuideParser", "ProgramIndex"]
+
+
+@dataclass(frozen=True)
+class Program:
+    """Program in program guide.
+
+    Times are integers in format of YYYYMMDDhhmmss in JST as start_at and end_at of time-free request, so that they
+    compare in chronological order.
+    """
+
+    station_id: str
+    # Start time, inclusive
+    ft: int
+    # End time, exclusive
+    to: int
+    title: str
+    performer: str = ""
+    program_id: str = ""
+    description: str = ""
+
+    def is_airing(self, time: int) -> bool:
+        return self.ft <= time < self.to
+
+    def to_time_free_request(self, *, is_30_day: bool = False) -> TimeFreeRequest:
+        """Build request of whole program for time-free."""
+        if is_30_day:
+            return TimeFree30DayMasterPlaylistRequest(self.station_id, self.ft, self.to)
+        return TimeFreeMasterPlaylistRequest(self.station_id, self.ft, self.to)
+
+
+class ProgramGuideParser:
+    """Parses program XML of radiko v3 incrementally into programs."""
+
+    @staticmethod
+    def iterparse(string_xml: str | bytes) -> Iterator[Program]:
+        """Yield each program as soon as its element ends, dropping processed elements."""
+        station_id = ""
+        for event, element in XmlIterParser.iterparse_elements(string_xml, "prog", start_tags=("station",)):
+            if event == "start":
+                station_id = element.get("id", "")
+                continue
+            yield Program(
+                station_id,
+                int(element.get("ft", "0")),
+                int(element.get("to", "0")),
+                element.findtext("title", ""),
+                element.findtext("pfm", ""),
+                element.get("id", ""),
+                element.findtext("desc", ""),
+            )
+
+
+class ProgramIndex:
+    """Interval index of programs for each station.
+
+    Programs of each station are sorted by start time with running maximum of end times, so both lookups bisect in
+    O(log n) and then walk only over matching programs, even when programs overlap.
+    """
+
+    def __init__(self, programs: Iterable[Program] = ()) -> None:
+        self._programs: dict[str, list[Program]] = {}
+        self._starts: dict[str, list[int]] = {}
+        self._max_ends: dict[str, list[int]] = {}
+        self.update(programs)
+
+    def update(self, programs: Iterable[Program]) -> None:
+        """Add programs, replacing program of the same station and start time."""
+        updated: dict[str, dict[int, Program]] = {}
+        for program in programs:
+            if program.station_id not in updated:
+                existing = self._programs.get(program.station_id, [])
+                updated[program.station_id] = {existing_program.ft: existing_program for existing_program in existing}
+            updated[program.station_id][program.ft] = program
+        for station_id, programs_by_start in updated.items():
+            sorted_programs = [programs_by_start[ft] for ft in sorted(programs_by_start)]
+            max_ends: list[int] = []
+            for program in sorted_programs:
+                max_ends.append(max(max_ends[-1], program.to) if max_ends else program.to)
+            self._programs[station_id] = sorted_programs
+            self._starts[station_id] = [program.ft for program in sorted_programs]
+            self._max_ends[station_id] = max_ends
+
+    @property
+    def station_ids(self) -> list[str]:
+        return sorted(self._programs)
+
+    def __len__(self) -> int:
+        return sum(len(programs) for programs in self._programs.values())
+
+    def at(self, station_id: str, time: int) -> Program | None:
+        """Return program airing on station at time."""
+        programs = self.overlapping(station_id, time, time + 1)
+        return programs[-1] if programs else None
+
+    def overlapping(self, station_id: str, start_at: int, end_at: int) -> list[Program]:
+        """Return programs of station which overlap [start_at, end_at) in order of start time."""
+        programs = self._programs.get(station_id, [])
+        # The first program which can end after start_at
+        begin = bisect_right(self._max_ends.get(station_id, []), start_at)
+        end = bisect_left(self._starts.get(station_id, []), end_at)
+        return [program for program in programs[begin:end] if program.to > start_at]
+
+    def build_time_free_requests(
+        self,
+        station_id: str,
+        start_at: int,
+        end_at: int,
+        *,
+        is_30_day: bool = False,
+    ) -> list[TimeFreeRequest]:
+        """Build time-free request of each program which overlaps [start_at, end_at)."""
+        return [
+            program.to_time_free_request(is_30_day=is_30_day)
+            for program in self.overlapping(station_id, start_at, end_at)
+        ]
+
+
+class ProgramGuideClient:
+    """Fetches program XML of radiko v3, which doesn't require authentication."""
+
+    URL_PROGRAM = "https://radiko.jp/v3/program/"
+
+    @classmethod
+    def build_url_station_date(cls, station_id: str, date: int) -> str:
+        return cls.URL_PROGRAM + "station/date/" + str(date) + "/" + station_id + ".xml"
+
+    @classmethod
+    def build_url_area_date(cls, area_id: str, date: int) -> str:
+        return cls.URL_PROGRAM + "date/" + str(date) + "/" + area_id + ".xml"
+
+    @classmethod
+    def get_station_date(cls, station_id: str, date: int) -> list[Program]:
+        """Get programs of station on broadcast date in format of YYYYMMDD."""
+        return cls.get(cls.build_url_station_date(station_id, date))
+
+    @classmethod
+    def get_area_date(cls, area_id: str, date: int) -> list[Program]:
+        """Get programs of all stations in area on broadcast date in format of YYYYMMDD."""
+        return cls.get(cls.build_url_area_date(area_id, date))
+
+    @staticmethod
+    def get(url: str) -> list[Program]:
+        return list(ProgramGuideParser.iterparse(Requester.get(url, {}, phase=Phase.PROGRAM_GUIDE).content))
@@ -0,0 +1,195 @@
+"""Implements full-text search over program guide by n-gram inverted index."""
+
+from __future__ import annotations
+
+import unicodedata
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+
+    from radikoplaylist.program_guide import Program
+    from radikoplaylist.time_free_window import TimeFreeRequest
+
+__all__ = ["NgramTokenizer", "ProgramFilter", "ProgramSearchIndex"]
+
+
+class NgramTokenizer:
+    """Splits text into overlapping character n-grams, which works for Japanese without dictionary.
+
+    Text is normalized by NFKC and case folding, so full-width and half-width forms or cases match each other.
+    """
+
+    def __init__(self, n: int = 2) -> None:
+        self.n = n
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return unicodedata.normalize("NFKC", text).casefold()
+
+    def tokenize(self, normalized: str) -> Iterator[str]:
+        """Yield n-grams of normalized text, or nothing when it's shorter than n."""
+        for start in range(len(normalized) - self.n + 1):
+            yield normalized[start : start + self.n]
+
+
+class ProgramSearchIndex:
+    """In-memory inverted index from n-grams of title, performer and description to programs.
+
+    Each whitespace-separated keyword must match as a substring of any searched field. Candidates are intersected from
+    posting lists of the keyword's n-grams, starting from the shortest, and then verified against normalized fields to
+    drop false positives of n-gram matching.
+    """
+
+    FIELDS = ("title", "performer", "description")
+
+    def __init__(self, programs: Iterable[Program] = (), *, tokenizer: NgramTokenizer | None = None) -> None:
+        self.tokenizer = NgramTokenizer() if tokenizer is None else tokenizer
+        self._programs: dict[int, Program] = {}
+        # Normalized text of each field, in order of FIELDS
+        self._texts: dict[int, tuple[str, ...]] = {}
+        self._postings: dict[str, set[int]] = {}
+        # Station ID and start time to document ID
+        self._ids: dict[tuple[str, int], int] = {}
+        self._next_id = 0
+        self.update(programs)
+
+    def __len__(self) -> int:
+        return len(self._programs)
+
+    def update(self, programs: Iterable[Program]) -> None:
+        """Index programs of refreshed guide.
+
+        For each station, programs already indexed which start within the span of the given programs are removed
+        first, so programs dropped from the refreshed guide disappear as well.
+        """
+        spans: dict[str, tuple[int, int]] = {}
+        list_programs = list(programs)
+        for program in list_programs:
+            start, end = spans.get(program.station_id, (program.ft, program.to))
+            spans[program.station_id] = (min(start, program.ft), max(end, program.to))
+        for (station_id, ft), document_id in list(self._ids.items()):
+            span = spans.get(station_id)
+            if span is not None and span[0] <= ft < span[1]:
+                self._remove(document_id)
+        for program in list_programs:
+            self._add(program)
+
+    def search(
+        self,
+        query: str,
+        *,
+        fields: Iterable[str] = FIELDS,
+        station_ids: Iterable[str] | None = None,
+        start_at: int | None = None,
+        end_at: int | None = None,
+    ) -> list[Program]:
+        """Return programs which match all keywords in query, in order of start time.
+
+        Args:
+            query: Keywords separated by whitespace.
+            fields: Fields to search in.
+            station_ids: Stations to search in. All stations when None.
+            start_at: Exclude programs which end at or before this time.
+            end_at: Exclude programs which start at or after this time.
+        """
+        return self.find(
+            query,
+            ProgramFilter(
+                tuple(fields),
+                None if station_ids is None else frozenset(station_ids),
+                start_at,
+                end_at,
+            ),
+        )
+
+    def find(self, query: str, program_filter: ProgramFilter) -> list[Program]:
+        """Return programs which match all keywords in query and program_filter, in order of start time."""
+        keywords = [self.tokenizer.normalize(keyword) for keyword in query.split()]
+        if not keywords:
+            return []
+        positions = [self.FIELDS.index(field) for field in program_filter.fields]
+        candidates: set[int] | None = None
+        for keyword in keywords:
+            matched = self._lookup(keyword)
+            candidates = matched if candidates is None else candidates & matched
+            if not candidates:
+                return []
+        results = []
+        for document_id in candidates or ():
+            program = self._programs[document_id]
+            if not program_filter.accepts(program):
+                continue
+            texts = self._texts[document_id]
+            if all(any(keyword in texts[position] for position in positions) for keyword in keywords):
+                results.append(program)
+        return sorted(results, key=lambda program: (program.ft, program.station_id))
+
+    def build_time_free_requests(
+        self,
+        query: str,
+        program_filter: ProgramFilter | None = None,
+        *,
+        is_30_day: bool = False,
+    ) -> list[TimeFreeRequest]:
+        """Build time-free request of each program which matches query and program_filter, as find() returns."""
+        programs = self.find(query, ProgramFilter() if program_filter is None else program_filter)
+        return [program.to_time_free_request(is_30_day=is_30_day) for program in programs]
+
+    def _lookup(self, keyword: str) -> set[int]:
+        if len(keyword) < self.tokenizer.n:
+            # No n-gram to look up, so every program is verified
+            return set(self._programs)
+        postings = [self._postings.get(gram) for gram in set(self.tokenizer.tokenize(keyword))]
+        if not postings or any(posting is None for posting in postings):
+            return set()
+        sorted_postings = sorted((posting for posting in postings if posting is not None), key=len)
+        return sorted_postings[0].intersection(*sorted_postings[1:])
+
+    def _add(self, program: Program) -> None:
+        document_id_replaced = self._ids.get((program.station_id, program.ft))
+        if document_id_replaced is not None:
+            self._remove(document_id_replaced)
+        document_id = self._next_id
+        self._next_id += 1
+        texts = tuple(self.tokenizer.normalize(getattr(program, field)) for field in self.FIELDS)
+        self._programs[document_id] = program
+        self._texts[document_id] = texts
+        self._ids[(program.station_id, program.ft)] = document_id
+        for gram in self._collect_grams(texts):
+            self._postings.setdefault(gram, set()).add(document_id)
+
+    def _remove(self, document_id: int) -> None:
+        program = self._programs.pop(document_id)
+        del self._ids[(program.station_id, program.ft)]
+        for gram in self._collect_grams(self._texts.pop(document_id)):
+            posting = self._postings[gram]
+            posting.discard(document_id)
+            if not posting:
+                del self._postings[gram]
+
+    def _collect_grams(self, texts: tuple[str, ...]) -> set[str]:
+        return {gram for text in texts for gram in self.tokenizer.tokenize(text)}
+
+
+@dataclass(frozen=True)
+class ProgramFilter:
+    """Conditions of search other than keywords, same as keyword arguments of ProgramSearchIndex.search()."""
+
+    fields: tuple[str, ...] = ProgramSearchIndex.FIELDS
+    # All stations when None
+    station_ids: frozenset[str] | None = None
+    # Exclude programs which end at or before this time
+    start_at: int | None = None
+    # Exclude programs which start at or after this time
+    end_at: int | None = None
+
+    def accepts(self, program: Program) -> bool:
+        if self.station_ids is not None and program.station_id not in self.station_ids:
+            return False
+        return not (
+            (self.start_at is not None and program.to <= self.start_at)
+            or (self.end_at is not None and program.ft >= self.end_at)
+        )
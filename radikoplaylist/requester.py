@@ -2,40 +2,392 @@
 
 from __future__ import annotations
 
+import asyncio
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from functools import partial
+from http.client import HTTPException
+from http.cookiejar import DefaultCookiePolicy
 from logging import getLogger
+from random import SystemRandom
 from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+from typing import ClassVar
+from typing import TypeVar
 
 import requests
+from requests import ConnectionError as RequestsConnectionError
 from requests import Response
 from requests import Timeout
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ProtocolError
+from urllib3.exceptions import ReadTimeoutError
 
+from radikoplaylist.circuit_breaker import HostCircuitBreaker
 from radikoplaylist.exceptions import BadHttpStatusCodeError
 from radikoplaylist.exceptions import HttpRequestTimeoutError
 
 if TYPE_CHECKING:
     from collections.abc import Mapping
 
+TypeVarResult = TypeVar("TypeVarResult")
+
+
+class Phase(Enum):
+    """Phase of resolving and following playlist to apply each retry policy."""
+
+    AUTH1 = "auth1"
+    AUTH2 = "auth2"
+    STATION_STREAM = "station_stream"
+    MASTER_PLAYLIST = "master_playlist"
+    MEDIA_PLAYLIST = "media_playlist"
+    SEGMENT = "segment"
+    PROGRAM_GUIDE = "program_guide"
+    STATION_LIST = "station_list"
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Timeouts and retry with exponential backoff and full jitter for each request.
+
+    Timeouts, connection errors and retryable status codes are retried until max_attempts or total_timeout is reached.
+    Wait before n-th retry is random in [0, min(backoff_max, backoff_base * 2 ** (n - 1))] seconds.
+    """
+
+    connect_timeout: float = 5.0
+    read_timeout: float = 5.0
+    max_attempts: int = 1
+    # Seconds from the first attempt, after which no retry starts
+    total_timeout: float | None = None
+    backoff_base: float = 0.5
+    backoff_max: float = 8.0
+    status_codes_retryable: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+
+    @property
+    def timeout(self) -> tuple[float, float]:
+        return (self.connect_timeout, self.read_timeout)
+
+    def is_retryable(self, error: Exception) -> bool:
+        if isinstance(error, BadHttpStatusCodeError):
+            return error.status_code in self.status_codes_retryable
+        return isinstance(error, (HttpRequestTimeoutError, RequestsConnectionError))
+
+    def compute_backoff(self, attempt: int) -> float:
+        """Return seconds to wait before retry after the attempt (starts from 1)."""
+        return SystemRandom().uniform(0.0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def can_retry(self, attempt: int, elapsed: float, backoff: float) -> bool:
+        if attempt >= self.max_attempts:
+            return False
+        return self.total_timeout is None or elapsed + backoff < self.total_timeout
+
+
+class SessionPool:
+    """Process-wide keep-alive HTTP session shared by every request to radiko.
+
+    The session is created lazily on first use. A forked child process never reuses the connections inherited from
+    its parent: the session is dropped and created again when the process ID changes.
+    """
+
+    # Number of per-host connection pools to keep (radiko.jp, each CDN host, ...)
+    POOL_CONNECTIONS_DEFAULT = 10
+    # Number of keep-alive connections to keep per host
+    POOL_MAXSIZE_DEFAULT = 10
+
+    def __init__(
+        self,
+        *,
+        pool_connections: int = POOL_CONNECTIONS_DEFAULT,
+        pool_maxsize: int = POOL_MAXSIZE_DEFAULT,
+        pool_block: bool = False,
+    ) -> None:
+        """Pass connection pool settings to requests.adapters.HTTPAdapter.
+
+        Args:
+            pool_connections: Number of per-host connection pools to cache.
+            pool_maxsize: Maximum number of keep-alive connections per host.
+            pool_block: Whether to block when no free connection is available instead of opening a throwaway one.
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self._lock = threading.Lock()
+        self._session: requests.Session | None = None
+        self._pid: int | None = None
+
+    def configure(
+        self,
+        *,
+        pool_connections: int | None = None,
+        pool_maxsize: int | None = None,
+        pool_block: bool | None = None,
+    ) -> None:
+        """Update connection pool settings and close current connections to apply them."""
+        with self._lock:
+            if pool_connections is not None:
+                self.pool_connections = pool_connections
+            if pool_maxsize is not None:
+                self.pool_maxsize = pool_maxsize
+            if pool_block is not None:
+                self.pool_block = pool_block
+            self._close()
+
+    @property
+    def session(self) -> requests.Session:
+        """Return the shared session, creating it on first use or after fork."""
+        with self._lock:
+            pid = os.getpid()
+            if self._session is None or self._pid != pid:
+                self._session = self._create_session()
+                self._pid = pid
+            return self._session
+
+    def close(self) -> None:
+        """Close all pooled connections. Next request opens new connections."""
+        with self._lock:
+            self._close()
+
+    def reset(self) -> None:
+        """Forget the current session without closing its sockets.
+
+        Use this in a child process after fork, where closing sockets shared with the parent must be avoided.
+        """
+        with self._lock:
+            self._session = None
+            self._pid = None
+
+    def _close(self) -> None:
+        if self._session is not None and self._pid == os.getpid():
+            self._session.close()
+        self._session = None
+        self._pid = None
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        # Each request carries its own authenticated headers (including premium Cookie),
+        # so the shared session must not leak cookies across areas and accounts.
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
 
 class Requester:
     """To unify error check and logging process."""
 
     HTTP_STATUS_CODE_OK = 200
+    HTTP_STATUS_CODE_NOT_MODIFIED = 304
+    session_pool = SessionPool()
+    retry_policy_default = RetryPolicy()
+    # Retry policy for each phase, retry_policy_default is applied to missing phase
+    retry_policies: ClassVar[dict[Phase, RetryPolicy]] = {}
+    # Fed by outcome of requests. Set None to disable.
+    circuit_breaker: ClassVar[HostCircuitBreaker | None] = HostCircuitBreaker()
+    # Phases of requests to hosts which circuit breaker ranks, requests without phase are fed as well. Authentication
+    # and metadata on radiko.jp don't open the circuit of playlists on the same host.
+    circuit_breaker_phases: ClassVar[frozenset[Phase]] = frozenset(
+        {Phase.MASTER_PLAYLIST, Phase.MEDIA_PLAYLIST, Phase.SEGMENT},
+    )
 
     @staticmethod
-    def get(url: str, headers: Mapping[str, str | bytes]) -> Response:
-        """Get request with error check and logging process."""
+    def get(
+        url: str,
+        headers: Mapping[str, str | bytes],
+        *,
+        allow_not_modified: bool = False,
+        phase: Phase | None = None,
+    ) -> Response:
+        """Get request with error check and logging process.
+
+        Args:
+            url: URL to request.
+            headers: HTTP headers to request.
+            allow_not_modified: Whether to accept 304 Not Modified for conditional request.
+            phase: Phase of request to select retry policy.
+        """
+        return Requester._retry(
+            url,
+            Requester.get_retry_policy(phase),
+            partial(Requester._get, url, headers, phase, allow_not_modified=allow_not_modified),
+        )
+
+    @staticmethod
+    def get_body(
+        url: str,
+        headers: Mapping[str, str | bytes],
+        read: Callable[[Response], TypeVarResult],
+        *,
+        phase: Phase | None = None,
+    ) -> TypeVarResult:
+        """Streamed get request whose body is read by read() within retry.
+
+        Timeouts and broken connections while reading body are retried by the policy of phase and fed to circuit breaker
+        as well as errors of request. The response is closed after read() returns.
+
+        Args:
+            url: URL to request.
+            headers: HTTP headers to request.
+            read: Function to read body from response. Called again from the beginning on retry.
+            phase: Phase of request to select retry policy.
+        """
+        policy = Requester.get_retry_policy(phase)
+        return Requester._retry(url, policy, partial(Requester._get_body, url, headers, phase, read))
+
+    @staticmethod
+    def get_retry_policy(phase: Phase | None) -> RetryPolicy:
+        if phase is None:
+            return Requester.retry_policy_default
+        return Requester.retry_policies.get(phase, Requester.retry_policy_default)
+
+    @staticmethod
+    def get_circuit_breaker(phase: Phase | None) -> HostCircuitBreaker | None:
+        """Return circuit breaker to feed by request of phase, or None when it isn't fed."""
+        if phase is None or phase in Requester.circuit_breaker_phases:
+            return Requester.circuit_breaker
+        return None
+
+    @staticmethod
+    def _retry(url: str, policy: RetryPolicy, function: Callable[[], TypeVarResult]) -> TypeVarResult:
         logger = getLogger(__name__)
+        started_at = time.monotonic()
+        attempt = 1
+        while True:
+            try:
+                return function()
+            except (HttpRequestTimeoutError, BadHttpStatusCodeError, RequestsConnectionError) as error:
+                backoff = policy.compute_backoff(attempt)
+                elapsed = time.monotonic() - started_at
+                if not (policy.is_retryable(error) and policy.can_retry(attempt, elapsed, backoff)):
+                    raise
+                logger.info("retry %s after %.3f seconds (attempt %d): %s", url, backoff, attempt, error)
+            time.sleep(backoff)
+            attempt += 1
+
+    @staticmethod
+    def _get_body(
+        url: str,
+        headers: Mapping[str, str | bytes],
+        phase: Phase | None,
+        read: Callable[[Response], TypeVarResult],
+    ) -> TypeVarResult:
+        circuit_breaker = Requester.get_circuit_breaker(phase)
+        # Success is recorded after reading body, so that host which breaks while sending body is tracked as well
+        with Requester._get(url, headers, phase, allow_not_modified=False, stream=True) as response:
+            try:
+                result = read(response)
+            # socket.timeout is distinct from TimeoutError before Python 3.10
+            except (ReadTimeoutError, socket.timeout) as error:
+                if circuit_breaker is not None:
+                    circuit_breaker.record_failure(url)
+                getLogger(__name__).warning("Read Timeout in %s: %s", url, error)
+                raise HttpRequestTimeoutError("failed in " + url + ".") from error
+            # Including exceptions of requests, which derive from OSError
+            except (ProtocolError, HTTPException, OSError) as error:
+                if circuit_breaker is not None:
+                    circuit_breaker.record_failure(url)
+                getLogger(__name__).warning("failed to read body in %s: %s", url, error)
+                raise RequestsConnectionError("failed in " + url + ".") from error
+        if circuit_breaker is not None:
+            circuit_breaker.record_success(url)
+        return result
+
+    @staticmethod
+    def _get(
+        url: str,
+        headers: Mapping[str, str | bytes],
+        phase: Phase | None,
+        *,
+        allow_not_modified: bool,
+        stream: bool = False,
+    ) -> Response:
+        logger = getLogger(__name__)
+        circuit_breaker = Requester.get_circuit_breaker(phase)
         try:
-            res = requests.get(url=url, headers=headers, timeout=5.0)
+            res = Requester.session_pool.session.get(
+                url=url,
+                headers=headers,
+                timeout=Requester.get_retry_policy(phase).timeout,
+                stream=stream,
+            )
         except Timeout as error:
+            if circuit_breaker is not None:
+                circuit_breaker.record_failure(url)
             logger.warning("failed in %s.", url)
             logger.warning("Request Timeout")
             logger.warning(error)
             raise HttpRequestTimeoutError("failed in " + url + ".") from error
-        if res.status_code != Requester.HTTP_STATUS_CODE_OK:
+        except RequestsConnectionError:
+            if circuit_breaker is not None:
+                circuit_breaker.record_failure(url)
+            raise
+        if circuit_breaker is not None and (not stream or res.status_code != Requester.HTTP_STATUS_CODE_OK):
+            circuit_breaker.record(url, res.status_code)
+        if res.status_code != Requester.HTTP_STATUS_CODE_OK and not (
+            allow_not_modified and res.status_code == Requester.HTTP_STATUS_CODE_NOT_MODIFIED
+        ):
             logger.warning("failed in %s.", url)
             logger.warning("status_code:%s", res.status_code)
             logger.warning("content:%s", res.content)
-            raise BadHttpStatusCodeError("failed in " + url + ".")
+            raise BadHttpStatusCodeError("failed in " + url + ".", res.status_code)
         logger.debug("auth in %s is success.", url)
         return res
+
+
+class AsyncRequester:
+    """Asyncio front of Requester.
+
+    Blocking requests run on a bounded thread pool, so the event loop is never blocked and connections stay shared with
+    Requester.session_pool. Awaiting callers can be cancelled or wrapped by asyncio.wait_for() as usual.
+    """
+
+    MAX_WORKERS_DEFAULT = 32
+    _lock = threading.Lock()
+    _executor: ThreadPoolExecutor | None = None
+    _max_workers = MAX_WORKERS_DEFAULT
+
+    @classmethod
+    async def get(cls, url: str, headers: Mapping[str, str | bytes], *, phase: Phase | None = None) -> Response:
+        """Asyncio version of Requester.get()."""
+        return await cls.run(partial(Requester.get, phase=phase), url, headers)
+
+    @classmethod
+    async def run(cls, function: Callable[..., TypeVarResult], *args: Any) -> TypeVarResult:  # noqa: ANN401
+        """Run blocking function on the thread pool of this class."""
+        return await asyncio.get_running_loop().run_in_executor(cls._get_executor(), function, *args)
+
+    @classmethod
+    def configure(cls, *, max_workers: int) -> None:
+        """Set maximum number of concurrent blocking requests. Current thread pool finishes running requests."""
+        with cls._lock:
+            cls._max_workers = max_workers
+            cls._shutdown()
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Shut down the thread pool after running requests complete."""
+        with cls._lock:
+            cls._shutdown()
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        with cls._lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(max_workers=cls._max_workers, thread_name_prefix="radikoplaylist")
+            return cls._executor
+
+    @classmethod
+    def _shutdown(cls) -> None:
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False)
+        cls._executor = None
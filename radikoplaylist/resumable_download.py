@@ -0,0 +1,258 @@
+"""Implements download of segments which resumes from on-disk journal."""
+
+from __future__ import annotations
+
+import os
+import struct
+import zlib
+from contextlib import suppress
+from dataclasses import dataclass
+from logging import getLogger
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from radikoplaylist.authorization import Authorization
+from radikoplaylist.master_playlist_client import MasterPlaylistClient
+from radikoplaylist.segment_downloader import SegmentDownloader
+from radikoplaylist.segment_sink import FileSegmentSink
+from radikoplaylist.segment_sink import SegmentSink
+
+if TYPE_CHECKING:
+    from radikoplaylist.master_playlist_request import MasterPlaylistRequest
+
+__all__ = ["JournalingSegmentSink", "ResumableDownloader", "SegmentCheckpoint", "SegmentJournal"]
+
+
+@dataclass(frozen=True)
+class SegmentCheckpoint:
+    """Segment which has been written to output."""
+
+    # Position in segments of media playlist
+    index: int
+    # Position in output
+    offset: int
+    length: int
+    # CRC-32 of written bytes
+    checksum: int
+
+    @property
+    def end(self) -> int:
+        return self.offset + self.length
+
+
+class SegmentJournal:
+    """Append-only journal of checkpoints in fixed size binary records.
+
+    The header holds a key which identifies the program, so a journal of other program is discarded. A record which
+    was being written when the process died is ignored on load.
+    """
+
+    MAGIC = b"RPJ1"
+    HEADER = struct.Struct("<4sH")
+    # index, offset, length, checksum
+    RECORD = struct.Struct("<IQII")
+
+    def __init__(self, path: str | os.PathLike[str], key: str) -> None:
+        self.path = Path(path)
+        self.key = key
+        self._fd: int | None = None
+
+    def load(self) -> list[SegmentCheckpoint]:
+        """Return checkpoints in journal, or empty list when the journal is missing, broken or of other key."""
+        try:
+            content = self.path.read_bytes()
+        except FileNotFoundError:
+            return []
+        key = self.key.encode("utf-8")
+        if content[: self.HEADER.size] != self.HEADER.pack(self.MAGIC, len(key)):
+            return []
+        start = self.HEADER.size + len(key)
+        if content[self.HEADER.size : start] != key:
+            return []
+        end = start + (len(content) - start) // self.RECORD.size * self.RECORD.size
+        return [SegmentCheckpoint(*record) for record in self.RECORD.iter_unpack(content[start:end])]
+
+    def load_verified(self, path_output: str | os.PathLike[str]) -> list[SegmentCheckpoint]:
+        """Return the longest prefix of checkpoints which is contiguous and matches bytes in output."""
+        verified: list[SegmentCheckpoint] = []
+        checkpoints = self.load()
+        path_output = Path(path_output)
+        if not checkpoints or not path_output.is_file():
+            return verified
+        with path_output.open("rb") as file:
+            for checkpoint in checkpoints:
+                if checkpoint.index != len(verified) or checkpoint.offset != (verified[-1].end if verified else 0):
+                    break
+                file.seek(checkpoint.offset)
+                content = file.read(checkpoint.length)
+                if len(content) != checkpoint.length or zlib.crc32(content) != checkpoint.checksum:
+                    break
+                verified.append(checkpoint)
+        return verified
+
+    def open(self, checkpoints: list[SegmentCheckpoint]) -> None:
+        """Rewrite journal with given checkpoints and keep it open to append."""
+        key = self.key.encode("utf-8")
+        content = b"".join(
+            [
+                self.HEADER.pack(self.MAGIC, len(key)),
+                key,
+                *(
+                    self.RECORD.pack(checkpoint.index, checkpoint.offset, checkpoint.length, checkpoint.checksum)
+                    for checkpoint in checkpoints
+                ),
+            ],
+        )
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o666)
+        self._write(content)
+
+    def append(self, checkpoint: SegmentCheckpoint) -> None:
+        self._write(self.RECORD.pack(checkpoint.index, checkpoint.offset, checkpoint.length, checkpoint.checksum))
+
+    def sync(self) -> None:
+        if self._fd is not None:
+            os.fsync(self._fd)
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def remove(self) -> None:
+        self.close()
+        with suppress(FileNotFoundError):
+            self.path.unlink()
+
+    def _write(self, content: bytes) -> None:
+        if self._fd is None:
+            msg = "journal is not open."
+            raise ValueError(msg)
+        with memoryview(content) as view:
+            position = 0
+            while position < len(view):
+                with view[position:] as rest:
+                    position += os.write(self._fd, rest)
+
+
+class JournalingSegmentSink(SegmentSink):
+    """Writes segments to file sink and then appends their checkpoints to journal.
+
+    The journal never claims bytes which haven't been written. fsync() of output always precedes fsync() of journal.
+    """
+
+    def __init__(
+        self,
+        file_segment_sink: FileSegmentSink,
+        journal: SegmentJournal,
+        *,
+        index: int = 0,
+        fsync_bytes: int | None = None,
+    ) -> None:
+        self.file_segment_sink = file_segment_sink
+        self.journal = journal
+        # Index of segment to write next
+        self.index = index
+        self.fsync_bytes = fsync_bytes
+        self._unsynced = 0
+
+    def write(self, data: memoryview) -> int:
+        offset = self.file_segment_sink.written
+        length = self.file_segment_sink.write(data)
+        self.journal.append(SegmentCheckpoint(self.index, offset, length, zlib.crc32(data)))
+        self.index += 1
+        self._unsynced += length
+        if self.fsync_bytes is not None and self._unsynced >= self.fsync_bytes:
+            self.sync()
+        return length
+
+    def sync(self) -> None:
+        self.file_segment_sink.sync()
+        self.journal.sync()
+        self._unsynced = 0
+
+    def close(self) -> None:
+        try:
+            self.file_segment_sink.close()
+        finally:
+            self.journal.close()
+
+
+class ResumableDownloader:
+    """Downloads segments of program to file, resuming from journal after the process died.
+
+    Each run resolves master playlist again, authenticating unless AuthorizationCache holds a valid token, since headers
+    and URLs of the previous run may have expired. Segments written before are verified by checksums in journal and
+    only the rest are downloaded. The journal is removed when the download completes.
+    """
+
+    JOURNAL_SUFFIX = ".journal"
+    # Bytes to write between fsync() of output and journal
+    FSYNC_BYTES_DEFAULT = 4 * 1024 * 1024
+
+    def __init__(
+        self,
+        master_playlist_request: MasterPlaylistRequest,
+        path: str | os.PathLike[str],
+        *,
+        area_id: str = Authorization.ARIA_ID_DEFAULT,
+        radiko_session: str | None = None,
+        max_workers: int = SegmentDownloader.MAX_WORKERS_DEFAULT,
+    ) -> None:
+        """Journal is placed next to path.
+
+        Args:
+            master_playlist_request: Request of program, typically time-free.
+            path: Path to output file.
+            area_id: Area ID for radiko (default: JP13 for Tokyo)
+            radiko_session: Optional radiko premium session cookie for 30-day timefree access.
+            max_workers: Maximum number of concurrent requests.
+        """
+        self.master_playlist_request = master_playlist_request
+        self.path = Path(path)
+        self.area_id = area_id
+        self.radiko_session = radiko_session
+        self.max_workers = max_workers
+        self.fsync_bytes: int | None = self.FSYNC_BYTES_DEFAULT
+        self.logger = getLogger(__name__)
+
+    @property
+    def path_journal(self) -> Path:
+        return self.path.with_name(self.path.name + self.JOURNAL_SUFFIX)
+
+    def build_key(self, number_of_segments: int) -> str:
+        """Identify program, so that journal of other program or other listing isn't resumed."""
+        request = self.master_playlist_request
+        return ":".join(
+            [
+                type(request).__name__,
+                request.station_id,
+                str(getattr(request, "start_at", "")),
+                str(getattr(request, "end_at", "")),
+                str(number_of_segments),
+            ],
+        )
+
+    def download(self) -> int:
+        """Download missing segments and return size of output."""
+        master_playlist = MasterPlaylistClient.get(
+            self.master_playlist_request,
+            area_id=self.area_id,
+            radiko_session=self.radiko_session,
+        )
+        segment_downloader = SegmentDownloader(master_playlist, max_workers=self.max_workers)
+        segments = segment_downloader.list_segments()
+        journal = SegmentJournal(self.path_journal, self.build_key(len(segments)))
+        checkpoints = journal.load_verified(self.path)
+        offset = checkpoints[-1].end if checkpoints else 0
+        self.logger.info("resume %s from segment %d of %d", self.path, len(checkpoints), len(segments))
+        journal.open(checkpoints)
+        with JournalingSegmentSink(
+            FileSegmentSink(self.path, offset=offset),
+            journal,
+            index=len(checkpoints),
+            fsync_bytes=self.fsync_bytes,
+        ) as sink:
+            written = segment_downloader.download_segments(segments[len(checkpoints) :], sink)
+            sink.sync()
+        journal.remove()
+        return offset + written
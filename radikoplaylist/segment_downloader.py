@@ -0,0 +1,113 @@
+"""Implements concurrent download of time-free segments."""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from radikoplaylist.media_playlist_client import MediaPlaylistClient
+from radikoplaylist.requester import Phase
+from radikoplaylist.requester import Requester
+from radikoplaylist.segment_sink import SegmentBuffer
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from concurrent.futures import Future
+    from typing import BinaryIO
+
+    from radikoplaylist.master_playlist import MasterPlaylist
+    from radikoplaylist.media_playlist import Segment
+    from radikoplaylist.segment_sink import SegmentSink
+
+__all__ = ["SegmentDownloader"]
+
+
+class SegmentDownloader:
+    """Downloads segments of media playlist in parallel and writes them to output in order.
+
+    Requests share pooled connections of Requester.session_pool, so set its pool_maxsize to max_workers or more. At
+    most max_in_flight segments are requested or held in memory at once. Each segment is written as soon as all
+    segments before it are written.
+
+    Bodies are read into a ring of max_in_flight reusable SegmentBuffer and written from their views, so no bytes
+    object is created per segment.
+    """
+
+    MAX_WORKERS_DEFAULT = 8
+
+    def __init__(
+        self,
+        master_playlist: MasterPlaylist,
+        *,
+        max_workers: int = MAX_WORKERS_DEFAULT,
+        max_in_flight: int | None = None,
+        buffer_capacity: int = SegmentBuffer.CAPACITY_DEFAULT,
+    ) -> None:
+        """Segments are listed on download().
+
+        Args:
+            master_playlist: Resolved master playlist of time-free program.
+            max_workers: Maximum number of concurrent requests.
+            max_in_flight: Maximum number of segments requested or held in memory. Twice max_workers when None.
+            buffer_capacity: Initial capacity of each buffer, which should fit a segment.
+        """
+        self.master_playlist = master_playlist
+        self.max_workers = max_workers
+        self.max_in_flight = max_workers * 2 if max_in_flight is None else max(max_in_flight, 1)
+        self.buffer_capacity = buffer_capacity
+
+    def list_segments(self) -> list[Segment]:
+        """Fetch media playlist until it ends or no more segment is added."""
+        media_playlist_client = MediaPlaylistClient(self.master_playlist)
+        media_playlist_client.fetch()
+        while not media_playlist_client.end_list and media_playlist_client.fetch():
+            pass
+        return media_playlist_client.segments
+
+    def download(self, output: BinaryIO | SegmentSink) -> int:
+        """Write all segments to output in order and return number of bytes written.
+
+        Raises:
+            BadHttpStatusCodeError: When any segment fails. Segments before it have been written.
+            HttpRequestTimeoutError: When any segment times out. Segments before it have been written.
+        """
+        return self.download_segments(self.list_segments(), output)
+
+    def download_segments(self, segments: Iterable[Segment], output: BinaryIO | SegmentSink) -> int:
+        """Write given segments to output in order with headers of master playlist.
+
+        Raises:
+            BadHttpStatusCodeError: When any segment fails. Segments before it have been written.
+            HttpRequestTimeoutError: When any segment times out. Segments before it have been written.
+        """
+        written = 0
+        pending: deque[Future[SegmentBuffer]] = deque()
+        free_buffers: list[SegmentBuffer] = []
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="radikoplaylist") as executor:
+            try:
+                for segment in segments:
+                    if len(pending) >= self.max_in_flight:
+                        buffer = pending.popleft().result()
+                        written += self.write(output, buffer)
+                        free_buffers.append(buffer)
+                    buffer = free_buffers.pop() if free_buffers else SegmentBuffer(self.buffer_capacity)
+                    pending.append(executor.submit(self.fetch_into, segment, buffer))
+                while pending:
+                    written += self.write(output, pending.popleft().result())
+            finally:
+                # Not to download the rest after failure
+                for future in pending:
+                    future.cancel()
+        return written
+
+    def fetch_into(self, segment: Segment, buffer: SegmentBuffer) -> SegmentBuffer:
+        """Read body of segment into buffer and return the buffer. Reading body is retried as well as request."""
+        Requester.get_body(segment.uri, self.master_playlist.headers, buffer.read_from, phase=Phase.SEGMENT)
+        return buffer
+
+    @staticmethod
+    def write(output: BinaryIO | SegmentSink, buffer: SegmentBuffer) -> int:
+        with buffer.view() as view:
+            output.write(view)
+        return buffer.length
@@ -0,0 +1,207 @@
+"""Implements reusable segment buffers and output sinks which avoid intermediate bytes objects."""
+
+from __future__ import annotations
+
+import os
+from abc import ABC
+from abc import abstractmethod
+from http.client import HTTPResponse
+from http.client import IncompleteRead
+from typing import TYPE_CHECKING
+from typing import TypeVar
+
+import urllib3
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from requests import Response
+
+__all__ = ["FileSegmentSink", "SegmentBuffer", "SegmentSink"]
+
+TypeVarSegmentSink = TypeVar("TypeVarSegmentSink", bound="SegmentSink")
+
+
+class SegmentBuffer:
+    """Reusable buffer which response body of segment is read into.
+
+    The body is read by readinto() of http.client.HTTPResponse under Response.raw, since readinto() of urllib3 2 reads
+    into a new bytes object and copies it. So no bytes object is created per chunk or per segment. The buffer grows
+    when the body doesn't fit and keeps its capacity for the next segment. Body shorter than Content-Length raises
+    http.client.IncompleteRead, since http.client doesn't check it as urllib3 does.
+    """
+
+    CAPACITY_DEFAULT = 64 * 1024
+    # Major versions of urllib3 whose private HTTPResponse._fp is http.client.HTTPResponse
+    URLLIB3_VERSIONS_FP = ("1", "2")
+
+    def __init__(self, capacity: int = CAPACITY_DEFAULT) -> None:
+        self._data = bytearray(max(capacity, 1))
+        self.length = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    def view(self) -> memoryview:
+        """Return view of the body read last. Release it before the next read_from()."""
+        return memoryview(self._data)[: self.length]
+
+    def read_from(self, response: Response) -> int:
+        """Read whole body of streamed response and return its length."""
+        self.length = 0
+        if response.headers.get("Content-Encoding", "identity") != "identity":
+            # Response.raw returns encoded body, so let requests decode it
+            for chunk in response.iter_content(self.CAPACITY_DEFAULT):
+                self._append(chunk)
+            return self.length
+        content_length = response.headers.get("Content-Length")
+        expected = int(content_length) if content_length is not None and content_length.isdigit() else None
+        if expected is not None:
+            self._reserve(expected + 1)
+        http_response = self.get_http_response(response)
+        readinto = response.raw.readinto if http_response is None else http_response.readinto
+        while True:
+            if self.length == len(self._data):
+                self._reserve(len(self._data) * 2)
+            with memoryview(self._data) as view, view[self.length :] as rest:
+                size = readinto(rest)
+            if not size:
+                break
+            self.length += size
+        if http_response is not None and http_response.isclosed():
+            # urllib3 returns connection to pool when it reads the end of body by itself
+            response.raw.release_conn()
+        if expected is not None and self.length != expected:
+            # Connection closed early, or server sent more than declared
+            raise IncompleteRead(bytes(self._data[: self.length]), expected - self.length)
+        return self.length
+
+    @classmethod
+    def get_http_response(cls, response: Response) -> HTTPResponse | None:
+        """Return http.client.HTTPResponse under Response.raw, or None to read by urllib3.
+
+        urllib3 exposes no API to read into buffer without copy, so its private attribute is used only on known major
+        versions.
+        """
+        if getattr(urllib3, "__version__", "").split(".", 1)[0] not in cls.URLLIB3_VERSIONS_FP:
+            return None
+        http_response = getattr(response.raw, "_fp", None)
+        return http_response if isinstance(http_response, HTTPResponse) else None
+
+    def _append(self, chunk: bytes) -> None:
+        end = self.length + len(chunk)
+        self._reserve(end)
+        self._data[self.length : end] = chunk
+        self.length = end
+
+    def _reserve(self, capacity: int) -> None:
+        if capacity > len(self._data):
+            self._data.extend(bytes(capacity - len(self._data)))
+
+
+class SegmentSink(ABC):
+    """Output of segments which accepts views of segment buffers."""
+
+    @abstractmethod
+    def write(self, data: memoryview) -> int:
+        """Write all of data and return its length."""
+
+    # Reason: Sinks without resources don't need to override
+    def close(self) -> None:  # noqa: B027
+        """Flush and release resources."""
+
+    # Reason: typing.Self requires Python 3.11
+    def __enter__(self: TypeVarSegmentSink) -> TypeVarSegmentSink:  # noqa: PYI019
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+class FileSegmentSink(SegmentSink):
+    """Writes segments to file descriptor directly, without buffer of io layer.
+
+    The file can be preallocated to the expected size to avoid fragmentation and repeated growth. It's truncated to the
+    written size on close(). fsync() is called each time fsync_bytes or more are written since the last one, and on
+    close().
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        preallocate: int = 0,
+        fsync_bytes: int | None = None,
+        offset: int = 0,
+    ) -> None:
+        """Open path for writing, truncating it to offset.
+
+        Args:
+            path: Path to output file.
+            preallocate: Bytes to allocate in advance, such as bitrate times duration of program.
+            fsync_bytes: Bytes to write between fsync(). No fsync() when None.
+            offset: Bytes to keep from the beginning of existing file to resume writing after them.
+        """
+        self.fsync_bytes = fsync_bytes
+        # Position in file to write next
+        self.written = offset
+        self._unsynced = 0
+        flags = os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0)
+        self._fd: int | None = os.open(path, flags if offset > 0 else flags | os.O_TRUNC, 0o666)
+        if offset > 0:
+            os.ftruncate(self._fd, offset)
+            os.lseek(self._fd, offset, os.SEEK_SET)
+        self.preallocate = preallocate
+        if preallocate > offset:
+            self._preallocate(self._fd, preallocate)
+
+    def write(self, data: memoryview) -> int:
+        if self._fd is None:
+            msg = "I/O operation on closed sink."
+            raise ValueError(msg)
+        with data.cast("B") as view:
+            length = len(view)
+            position = 0
+            while position < length:
+                with view[position:] as rest:
+                    position += os.write(self._fd, rest)
+        self.written += length
+        self._unsynced += length
+        if self.fsync_bytes is not None and self._unsynced >= self.fsync_bytes:
+            self.sync()
+        return length
+
+    def sync(self) -> None:
+        if self._fd is not None:
+            os.fsync(self._fd)
+            self._unsynced = 0
+
+    def close(self) -> None:
+        if self._fd is None:
+            return
+        try:
+            if self.preallocate > self.written:
+                os.ftruncate(self._fd, self.written)
+            if self.fsync_bytes is not None:
+                self.sync()
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    @staticmethod
+    def _preallocate(fd: int, size: int) -> None:
+        if hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(fd, 0, size)
+            except OSError:
+                # Some file systems don't support it
+                pass
+            else:
+                return
+        os.ftruncate(fd, size)
@@ -0,0 +1,199 @@
+"""Implements catalog of stations available in each area."""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+from typing import TYPE_CHECKING
+
+from radikoplaylist.authorization import Authorization
+from radikoplaylist.requester import Phase
+from radikoplaylist.requester import Requester
+from radikoplaylist.xml_iterparser import XmlIterParser
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+
+__all__ = ["StationCatalog", "StationListParser"]
+
+
+class StationListParser:
+    """Parses station list XML of area incrementally into station IDs."""
+
+    @staticmethod
+    def iterparse(string_xml: str | bytes) -> Iterator[str]:
+        """Yield ID of each station as soon as its element ends, dropping processed elements."""
+        for _, element in XmlIterParser.iterparse_elements(string_xml, "station"):
+            station_id = element.findtext("id")
+            if station_id:
+                yield station_id
+
+
+class StationCatalog:
+    """Station lists of all areas fetched concurrently and cached with TTL, with index from station to its areas.
+
+    Without premium, token of an area reaches only stations of the area, so the catalog selects the area to
+    authenticate for each station, and groups stations by area to share one token in batch.
+    """
+
+    URL_STATION_LIST = "https://radiko.jp/v3/station/list/"
+    AREA_IDS = tuple("JP" + str(number) for number in range(1, 48))
+    TTL_DEFAULT = 24 * 60 * 60
+    RETRY_INTERVAL_DEFAULT = 60
+    MAX_WORKERS_DEFAULT = 8
+
+    def __init__(
+        self,
+        *,
+        area_ids: Iterable[str] = AREA_IDS,
+        ttl: float = TTL_DEFAULT,
+        retry_interval: float = RETRY_INTERVAL_DEFAULT,
+        max_workers: int = MAX_WORKERS_DEFAULT,
+    ) -> None:
+        """Station lists are fetched on first lookup.
+
+        Args:
+            area_ids: Areas to fetch station lists, in order of priority to select.
+            ttl: Seconds to reuse station lists.
+            retry_interval: Seconds to wait before fetching again after all areas failed.
+            max_workers: Maximum number of concurrent requests.
+        """
+        self.area_ids = tuple(area_ids)
+        self.ttl = ttl
+        self.retry_interval = retry_interval
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._station_ids: dict[str, tuple[str, ...]] = {}
+        self._index: dict[str, tuple[str, ...]] = {}
+        self._fetched_at: float | None = None
+        # Error of the last refresh when all areas failed
+        self._error: BaseException | None = None
+        self.logger = getLogger(__name__)
+
+    @classmethod
+    def build_url(cls, area_id: str) -> str:
+        return cls.URL_STATION_LIST + area_id + ".xml"
+
+    def get_station_ids(self, area_id: str) -> tuple[str, ...]:
+        """Return IDs of stations available in area."""
+        self._ensure_fresh()
+        return self._station_ids.get(area_id, ())
+
+    def get_area_ids(self, station_id: str) -> tuple[str, ...]:
+        """Return IDs of areas where station is available, in order of area_ids."""
+        self._ensure_fresh()
+        return self._index.get(station_id, ())
+
+    def select_area_id(self, station_id: str, preferred: str = Authorization.ARIA_ID_DEFAULT) -> str:
+        """Return preferred area when station is available in it, otherwise the first area of station.
+
+        Preferred area is returned as is for station unknown to catalog.
+        """
+        area_ids = self.get_area_ids(station_id)
+        if not area_ids:
+            self.logger.warning("station %s is not found in any area, use %s", station_id, preferred)
+            return preferred
+        return preferred if preferred in area_ids else area_ids[0]
+
+    def group_by_area(
+        self,
+        station_ids: Iterable[str],
+        preferred: str = Authorization.ARIA_ID_DEFAULT,
+    ) -> dict[str, list[str]]:
+        """Group stations by area to authenticate, using as few areas as possible.
+
+        Stations available in preferred area are grouped into it first. Then the area which covers the most remaining
+        stations is taken repeatedly. Stations unknown to catalog are grouped into preferred area.
+        """
+        groups: dict[str, list[str]] = {}
+        remaining: list[str] = []
+        for station_id in dict.fromkeys(station_ids):
+            area_ids = self.get_area_ids(station_id)
+            if not area_ids or preferred in area_ids:
+                groups.setdefault(preferred, []).append(station_id)
+            else:
+                remaining.append(station_id)
+        while remaining:
+            counts: dict[str, int] = {}
+            for station_id in remaining:
+                for area_id in self.get_area_ids(station_id):
+                    counts[area_id] = counts.get(area_id, 0) + 1
+            # max() returns the first area in order of area_ids among ties
+            area_id_best = max(
+                (area_id for area_id in self.area_ids if area_id in counts),
+                key=lambda area_id: counts[area_id],
+            )
+            groups[area_id_best] = [
+                station_id for station_id in remaining if area_id_best in self.get_area_ids(station_id)
+            ]
+            remaining = [station_id for station_id in remaining if area_id_best not in self.get_area_ids(station_id)]
+        return groups
+
+    def refresh(self) -> None:
+        """Fetch station lists of all areas and rebuild index.
+
+        Station list of area which failed keeps the previous one. When all areas failed, lookups serve the previous
+        station lists and don't fetch again for retry_interval.
+
+        Raises:
+            Exception: Error of the first area when all areas failed.
+        """
+        with self._lock:
+            self._refresh()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._station_ids.clear()
+            self._index.clear()
+            self._fetched_at = None
+            self._error = None
+
+    def _ensure_fresh(self) -> None:
+        """Refresh station lists when expired.
+
+        Raises:
+            Exception: Error of the last refresh when all areas failed and no station list has been fetched.
+        """
+        with self._lock:
+            if self._fetched_at is not None and time.monotonic() - self._fetched_at < self.ttl:
+                if self._error is not None and not self._station_ids:
+                    raise self._error
+                return
+            try:
+                self._refresh()
+            # Reason: To serve the previous station lists
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                if not self._station_ids:
+                    raise
+                self.logger.warning("serve station lists fetched before, since all areas failed: %s", error)
+
+    def _refresh(self) -> None:
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="radikoplaylist") as executor:
+            futures = {area_id: executor.submit(self._fetch, area_id) for area_id in self.area_ids}
+        errors = []
+        for area_id, future in futures.items():
+            error = future.exception()
+            if error is None:
+                self._station_ids[area_id] = future.result()
+                continue
+            self.logger.warning("failed to fetch station list of %s: %s", area_id, error)
+            errors.append(error)
+        if errors and len(errors) == len(futures):
+            # Not to fetch all areas again on every lookup
+            self._fetched_at = time.monotonic() - max(self.ttl - self.retry_interval, 0)
+            self._error = errors[0]
+            raise self._error
+        index: dict[str, list[str]] = {}
+        for area_id in self.area_ids:
+            for station_id in self._station_ids.get(area_id, ()):
+                index.setdefault(station_id, []).append(area_id)
+        self._index = {station_id: tuple(area_ids) for station_id, area_ids in index.items()}
+        self._fetched_at = time.monotonic()
+        self._error = None
+
+    def _fetch(self, area_id: str) -> tuple[str, ...]:
+        response = Requester.get(self.build_url(area_id), {}, phase=Phase.STATION_LIST)
+        return tuple(StationListParser.iterparse(response.content))
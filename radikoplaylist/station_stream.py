@@ -0,0 +1,257 @@
+"""Implements model, client and cache of station stream XML which lists URLs to create playlist."""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import replace
+from logging import getLogger
+from typing import TYPE_CHECKING
+
+from radikoplaylist.requester import Phase
+from radikoplaylist.requester import Requester
+from radikoplaylist.xml_iterparser import XmlIterParser
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from collections.abc import Mapping
+
+    # - defusedxml lacks an Element class · Issue #48 · tiran/defusedxml
+    #   https://github.com/tiran/defusedxml/issues/48#issuecomment-1511284750
+    from xml.etree.ElementTree import Element  # nosec B405
+
+    from radikoplaylist.station_stream_store import StationStreamStore
+
+
+@dataclass(frozen=True)
+class StationStreamUrl:
+    """Candidate of URL to create playlist listed in station stream XML."""
+
+    playlist_create_url: str
+    timefree: str
+    areafree: str
+
+
+class StationStreamParser:
+    """Parses station stream XML."""
+
+    @classmethod
+    def parse(cls, string_xml: str | bytes) -> tuple[StationStreamUrl, ...]:
+        """Parse XML into candidates in document order."""
+        return tuple(cls.iterparse(string_xml))
+
+    @classmethod
+    def iterparse(cls, string_xml: str | bytes) -> Iterator[StationStreamUrl]:
+        """Parse XML incrementally, yielding each candidate as soon as its element ends.
+
+        Processed elements are dropped, so stopping iteration early skips parsing the rest of the document.
+        """
+        for _, element in XmlIterParser.iterparse_elements(string_xml, "url"):
+            yield StationStreamUrl(
+                cls.strip_playlist_create_url(element),
+                element.get("timefree", ""),
+                element.get("areafree", ""),
+            )
+
+    @staticmethod
+    def strip_playlist_create_url(url: Element) -> str:
+        """Strip playlist create URL."""
+        element = url.find("./playlist_create_url")
+        if element is None:
+            msg = "playlist_create_url element not found"
+            raise ValueError(msg)
+        if element.text is None:
+            msg = "playlist_create_url text is None"
+            raise ValueError(msg)
+        return element.text
+
+
+class StationStreamClient:
+    """Fetches station stream XML."""
+
+    URL_STATION_STREAM = "https://radiko.jp/v3/station/stream/pc_html5/"
+
+    @classmethod
+    def build_url(cls, station_id: str) -> str:
+        return cls.URL_STATION_STREAM + station_id + ".xml"
+
+    @classmethod
+    def get(cls, station_id: str, headers: Mapping[str, str | bytes]) -> tuple[StationStreamUrl, ...]:
+        return StationStreamParser.parse(cls.fetch(station_id, headers))
+
+    @classmethod
+    def fetch(cls, station_id: str, headers: Mapping[str, str | bytes]) -> bytes:
+        """Fetch XML without parsing, for caller which parses only until what it needs."""
+        return Requester.get(cls.build_url(station_id), headers, phase=Phase.STATION_STREAM).content
+
+
+class StationStreamIndex:
+    """Candidates of station grouped by timefree and areafree, built once from one parse.
+
+    Each group keeps document order, so live and time free getters are served from the same parse by lookup.
+    """
+
+    def __init__(self, urls: Iterable[StationStreamUrl]) -> None:
+        self.urls = tuple(urls)
+        groups: dict[tuple[str, str | None], list[StationStreamUrl]] = {}
+        for url in self.urls:
+            groups.setdefault((url.timefree, url.areafree), []).append(url)
+            groups.setdefault((url.timefree, None), []).append(url)
+        self._groups = {key: tuple(group) for key, group in groups.items()}
+
+    def get(self, timefree: str, areafree: str | None = None) -> tuple[StationStreamUrl, ...]:
+        """Return candidates of timefree, and of areafree when given, in document order."""
+        return self._groups.get((timefree, areafree), ())
+
+
+@dataclass(frozen=True)
+class StationStreamCacheEntry:
+    """Parsed candidates of station and validators to revalidate them."""
+
+    urls: tuple[StationStreamUrl, ...]
+    # Seconds since the epoch
+    fetched_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+    # Pinned entry is neither expired nor revalidated
+    pinned: bool = False
+    index: StationStreamIndex = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Derived field of frozen dataclass
+        object.__setattr__(self, "index", StationStreamIndex(self.urls))
+
+
+class StationStreamCache:
+    """Station-keyed cache of parsed station stream XML.
+
+    Stale entries are revalidated by conditional request (If-None-Match / If-Modified-Since), so when the document is
+    not modified, neither transfer nor parse runs again. With store, entries survive restarts of process. Concurrent
+    lookups of the same missing or stale station wait for one fetch.
+    """
+
+    TTL_DEFAULT = 3600.0
+
+    def __init__(self, *, ttl: float = TTL_DEFAULT, store: StationStreamStore | None = None) -> None:
+        """TTL is in seconds.
+
+        Args:
+            ttl: Seconds until entries are revalidated.
+            store: Optional persistent store to load entries missing in memory and to save fetched entries.
+        """
+        self.ttl = ttl
+        self.store = store
+        self._lock = threading.Lock()
+        self._entries: dict[str, StationStreamCacheEntry] = {}
+        # Lock of each station held while fetching
+        self._fetch_locks: dict[str, threading.Lock] = {}
+        self.logger = getLogger(__name__)
+
+    def get(self, station_id: str, headers: Mapping[str, str | bytes]) -> tuple[StationStreamUrl, ...]:
+        """Return parsed candidates of station, fetching or revalidating when missing or stale."""
+        return self.get_index(station_id, headers).urls
+
+    def get_index(self, station_id: str, headers: Mapping[str, str | bytes]) -> StationStreamIndex:
+        """Return index of candidates of station, fetching or revalidating when missing or stale."""
+        entry = self.entry(station_id)
+        if entry is not None and self.is_fresh(entry):
+            return entry.index
+        with self._get_fetch_lock(station_id):
+            # Other thread may have fetched while waiting for the lock
+            entry = self.entry(station_id)
+            if entry is not None and self.is_fresh(entry):
+                return entry.index
+            entry = self._fetch(station_id, headers, entry)
+            self.put(station_id, entry)
+            return entry.index
+
+    def is_fresh(self, entry: StationStreamCacheEntry) -> bool:
+        return entry.pinned or time.time() - entry.fetched_at < self.ttl
+
+    def entry(self, station_id: str) -> StationStreamCacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(station_id)
+            if entry is None and self.store is not None:
+                entry = self.store.load(station_id)
+                if entry is not None:
+                    self._entries[station_id] = entry
+            return entry
+
+    def entries(self) -> dict[str, StationStreamCacheEntry]:
+        """Return entries in memory, after loading all entries in store if any."""
+        with self._lock:
+            if self.store is not None:
+                for station_id, entry in self.store.load_all():
+                    self._entries.setdefault(station_id, entry)
+            return dict(self._entries)
+
+    def put(self, station_id: str, entry: StationStreamCacheEntry) -> None:
+        with self._lock:
+            self._entries[station_id] = entry
+            if self.store is not None:
+                self.store.save(station_id, entry)
+
+    def pin(self, station_id: str, urls: tuple[StationStreamUrl, ...] | None = None) -> None:
+        """Pin cached entry of station, or pin given candidates as entry of station.
+
+        Raises:
+            KeyError: When urls is not given and the station is not cached.
+        """
+        if urls is None:
+            entry = self.entry(station_id)
+            if entry is None:
+                raise KeyError(station_id)
+            self.put(station_id, replace(entry, pinned=True))
+        else:
+            self.put(station_id, StationStreamCacheEntry(urls, time.time(), pinned=True))
+
+    def unpin(self, station_id: str) -> None:
+        entry = self.entry(station_id)
+        if entry is not None:
+            self.put(station_id, replace(entry, pinned=False))
+
+    def invalidate(self, station_id: str) -> None:
+        with self._lock:
+            self._entries.pop(station_id, None)
+            if self.store is not None:
+                self.store.delete(station_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self.store is not None:
+                self.store.clear()
+
+    def _get_fetch_lock(self, station_id: str) -> threading.Lock:
+        with self._lock:
+            return self._fetch_locks.setdefault(station_id, threading.Lock())
+
+    def _fetch(
+        self,
+        station_id: str,
+        headers: Mapping[str, str | bytes],
+        entry: StationStreamCacheEntry | None,
+    ) -> StationStreamCacheEntry:
+        conditional_headers = dict(headers)
+        if entry is not None and entry.etag is not None:
+            conditional_headers["If-None-Match"] = entry.etag
+        if entry is not None and entry.last_modified is not None:
+            conditional_headers["If-Modified-Since"] = entry.last_modified
+        response = Requester.get(
+            StationStreamClient.build_url(station_id),
+            conditional_headers,
+            allow_not_modified=True,
+            phase=Phase.STATION_STREAM,
+        )
+        if entry is not None and response.status_code == Requester.HTTP_STATUS_CODE_NOT_MODIFIED:
+            self.logger.debug("station stream of %s is not modified", station_id)
+            return replace(entry, fetched_at=time.time())
+        return StationStreamCacheEntry(
+            StationStreamParser.parse(response.content),
+            time.time(),
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+        )
@@ -0,0 +1,108 @@
+"""Implements persistent store of parsed station stream XML."""
+
+from __future__ import annotations
+
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from radikoplaylist.station_stream import StationStreamCacheEntry
+from radikoplaylist.station_stream import StationStreamUrl
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+class StationStreamStore:
+    """SQLite store of parsed station stream candidates to survive restarts.
+
+    Each station keeps its fetch timestamp and validators (ETag / Last-Modified), and its candidates with timefree and
+    areafree attributes in document order. Each operation opens its own connection, so the store is safe to share
+    between threads and forked processes.
+    """
+
+    _SCHEMA = (
+        (
+            "CREATE TABLE IF NOT EXISTS station_stream ("
+            " station_id TEXT PRIMARY KEY,"
+            " fetched_at REAL NOT NULL,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " pinned INTEGER NOT NULL DEFAULT 0"
+            ")"
+        ),
+        (
+            "CREATE TABLE IF NOT EXISTS station_stream_url ("
+            " station_id TEXT NOT NULL,"
+            " position INTEGER NOT NULL,"
+            " timefree TEXT NOT NULL,"
+            " areafree TEXT NOT NULL,"
+            " playlist_create_url TEXT NOT NULL,"
+            " PRIMARY KEY (station_id, position)"
+            ")"
+        ),
+    )
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with closing(self._connect()) as connection, connection:
+            for statement in self._SCHEMA:
+                connection.execute(statement)
+
+    def load(self, station_id: str) -> StationStreamCacheEntry | None:
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT fetched_at, etag, last_modified, pinned FROM station_stream WHERE station_id = ?",
+                (station_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            urls = tuple(
+                StationStreamUrl(playlist_create_url, timefree, areafree)
+                for timefree, areafree, playlist_create_url in connection.execute(
+                    "SELECT timefree, areafree, playlist_create_url FROM station_stream_url"
+                    " WHERE station_id = ? ORDER BY position",
+                    (station_id,),
+                )
+            )
+        fetched_at, etag, last_modified, pinned = row
+        return StationStreamCacheEntry(urls, fetched_at, etag, last_modified, pinned=bool(pinned))
+
+    def load_all(self) -> Iterator[tuple[str, StationStreamCacheEntry]]:
+        with closing(self._connect()) as connection:
+            station_ids = [row[0] for row in connection.execute("SELECT station_id FROM station_stream")]
+        for station_id in station_ids:
+            entry = self.load(station_id)
+            if entry is not None:
+                yield station_id, entry
+
+    def save(self, station_id: str, entry: StationStreamCacheEntry) -> None:
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO station_stream (station_id, fetched_at, etag, last_modified, pinned)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (station_id, entry.fetched_at, entry.etag, entry.last_modified, int(entry.pinned)),
+            )
+            connection.execute("DELETE FROM station_stream_url WHERE station_id = ?", (station_id,))
+            connection.executemany(
+                "INSERT INTO station_stream_url (station_id, position, timefree, areafree, playlist_create_url)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [
+                    (station_id, position, url.timefree, url.areafree, url.playlist_create_url)
+                    for position, url in enumerate(entry.urls)
+                ],
+            )
+
+    def delete(self, station_id: str) -> None:
+        with closing(self._connect()) as connection, connection:
+            connection.execute("DELETE FROM station_stream WHERE station_id = ?", (station_id,))
+            connection.execute("DELETE FROM station_stream_url WHERE station_id = ?", (station_id,))
+
+    def clear(self) -> None:
+        with closing(self._connect()) as connection, connection:
+            connection.execute("DELETE FROM station_stream")
+            connection.execute("DELETE FROM station_stream_url")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.path), timeout=30.0)
@@ -0,0 +1,205 @@
+"""Implements parallel download of time-free program split into windows."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from logging import getLogger
+from typing import TYPE_CHECKING
+from typing import Union
+from typing import cast
+
+from radikoplaylist.authorization import Authorization
+from radikoplaylist.master_playlist_client import MasterPlaylistClient
+from radikoplaylist.segment_downloader import SegmentDownloader
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from typing import BinaryIO
+
+    from radikoplaylist.master_playlist import MasterPlaylist
+    from radikoplaylist.master_playlist_request import TimeFree30DayMasterPlaylistRequest
+    from radikoplaylist.master_playlist_request import TimeFreeMasterPlaylistRequest
+    from radikoplaylist.media_playlist import Segment
+    from radikoplaylist.segment_sink import SegmentSink
+
+__all__ = ["TimeFreeWindowPlanner", "WindowedTimeFreeDownloader"]
+
+TimeFreeRequest = Union["TimeFreeMasterPlaylistRequest", "TimeFree30DayMasterPlaylistRequest"]
+
+
+class TimeFreeWindowPlanner:
+    """Splits [start_at, end_at] of time-free request into contiguous windows by ft / to.
+
+    Each boundary is the end of one window and the start of the next, aligned to the grid of segment duration on the
+    clock, where radiko cuts segments, so that windows share at most the segment on the boundary. stitch() drops such
+    duplicates by start time of segments.
+    """
+
+    FORMAT = "%Y%m%d%H%M%S"
+    # Duration of segment of radiko
+    SEGMENT_SECONDS = 5
+    # Difference of start times within which segments of windows are regarded as the same
+    TOLERANCE_SECONDS = 0.5
+    JST = timezone(timedelta(hours=9))
+
+    @classmethod
+    def split(cls, start_at: int, end_at: int, count: int) -> list[tuple[int, int]]:
+        """Return up to count pairs of ft and to which cover start_at to end_at without gap."""
+        start = cls.parse(start_at)
+        total_seconds = int((cls.parse(end_at) - start).total_seconds())
+        if count <= 1 or total_seconds <= cls.SEGMENT_SECONDS:
+            return [(start_at, end_at)]
+        window_seconds = -(-total_seconds // count)
+        window_seconds += -window_seconds % cls.SEGMENT_SECONDS
+        boundaries = [start_at] + [
+            cls.format(cls.align(start + timedelta(seconds=offset)))
+            for offset in range(window_seconds, total_seconds, window_seconds)
+        ]
+        return list(zip(boundaries, [*boundaries[1:], end_at]))
+
+    @classmethod
+    def align(cls, value: datetime) -> datetime:
+        """Round down to the grid of segment duration on the clock."""
+        return value - timedelta(seconds=value.second % cls.SEGMENT_SECONDS, microseconds=value.microsecond)
+
+    @classmethod
+    def plan(cls, master_playlist_request: TimeFreeRequest, count: int) -> list[TimeFreeRequest]:
+        """Return requests of the same type for each window."""
+        return [
+            type(master_playlist_request)(master_playlist_request.station_id, ft, to)
+            for ft, to in cls.split(master_playlist_request.start_at, master_playlist_request.end_at, count)
+        ]
+
+    @classmethod
+    def stitch(cls, windows: Iterable[tuple[int, list[Segment]]]) -> list[Segment]:
+        """Concatenate segments of windows in order, dropping segments which start before the end of the previous one.
+
+        Windows are pairs of ft and segments, since URIs of the same segment may differ by window. Gap between
+        segments, such as a window which lacks its beginning, is logged.
+        """
+        logger = getLogger(__name__)
+        stitched: list[Segment] = []
+        end: datetime | None = None
+        for ft, segments in windows:
+            for start, segment in zip(cls.compute_start_times(ft, segments), segments):
+                if end is not None:
+                    difference = (start - end).total_seconds()
+                    if difference < -cls.TOLERANCE_SECONDS:
+                        continue
+                    if difference > cls.TOLERANCE_SECONDS:
+                        logger.warning("gap of %.3f seconds before %s at %s", difference, segment.uri, start)
+                stitched.append(segment)
+                end = start + timedelta(seconds=segment.duration)
+        return stitched
+
+    @classmethod
+    def compute_start_times(cls, ft: int, segments: Iterable[Segment]) -> list[datetime]:
+        """Return start time of each segment in JST.
+
+        Program date time of segment is used when present, otherwise the end of the previous segment from ft.
+        """
+        start_times = []
+        start = cls.parse(ft)
+        for segment in segments:
+            if segment.program_date_time is not None:
+                start = cls.parse_program_date_time(segment.program_date_time) or start
+            start_times.append(start)
+            start += timedelta(seconds=segment.duration)
+        return start_times
+
+    @classmethod
+    def parse_program_date_time(cls, value: str) -> datetime | None:
+        """Parse value of #EXT-X-PROGRAM-DATE-TIME into naive JST, or return None when it's malformed."""
+        try:
+            # datetime.fromisoformat() doesn't accept "Z" before Python 3.11
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        return parsed if parsed.tzinfo is None else parsed.astimezone(cls.JST).replace(tzinfo=None)
+
+    @classmethod
+    def parse(cls, value: int) -> datetime:
+        # Reason: Values are wall clock time of JST, which has no DST
+        return datetime.strptime(str(value), cls.FORMAT)  # noqa: DTZ007
+
+    @classmethod
+    def format(cls, value: datetime) -> int:
+        return int(value.strftime(cls.FORMAT))
+
+
+class WindowedTimeFreeDownloader:
+    """Resolves and lists windows of time-free program in parallel, then downloads stitched segments.
+
+    Master playlists of all windows are resolved by MasterPlaylistClient.get_many() with one authentication, and their
+    media playlists are listed concurrently. Segments are downloaded by SegmentDownloader on one pool.
+    """
+
+    WINDOW_COUNT_DEFAULT = 4
+
+    def __init__(
+        self,
+        master_playlist_request: TimeFreeRequest,
+        *,
+        window_count: int = WINDOW_COUNT_DEFAULT,
+        area_id: str = Authorization.ARIA_ID_DEFAULT,
+        radiko_session: str | None = None,
+        max_workers: int = SegmentDownloader.MAX_WORKERS_DEFAULT,
+    ) -> None:
+        """Windows are resolved on download().
+
+        Args:
+            master_playlist_request: Time-free request of whole program.
+            window_count: Number of windows to split into.
+            area_id: Area ID for radiko (default: JP13 for Tokyo)
+            radiko_session: Optional radiko premium session cookie for 30-day timefree access.
+            max_workers: Maximum number of concurrent requests.
+        """
+        self.master_playlist_request = master_playlist_request
+        self.window_count = window_count
+        self.area_id = area_id
+        self.radiko_session = radiko_session
+        self.max_workers = max_workers
+
+    def resolve(self) -> list[MasterPlaylist]:
+        """Return master playlist of each window in order.
+
+        Raises:
+            Exception: Error of the first window which failed to resolve.
+        """
+        return self._resolve(TimeFreeWindowPlanner.plan(self.master_playlist_request, self.window_count))
+
+    def download(self, output: BinaryIO | SegmentSink) -> int:
+        """Write all segments of program to output in order and return number of bytes written."""
+        window_requests = TimeFreeWindowPlanner.plan(self.master_playlist_request, self.window_count)
+        downloaders = [
+            SegmentDownloader(master_playlist, max_workers=self.max_workers)
+            for master_playlist in self._resolve(window_requests)
+        ]
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="radikoplaylist") as executor:
+            windows = list(executor.map(SegmentDownloader.list_segments, downloaders))
+        segments = TimeFreeWindowPlanner.stitch(
+            (window_request.start_at, window) for window_request, window in zip(window_requests, windows)
+        )
+        # Windows share the authentication, so headers of any window work
+        return downloaders[0].download_segments(segments, output)
+
+    def _resolve(self, window_requests: list[TimeFreeRequest]) -> list[MasterPlaylist]:
+        results = {
+            id(result.master_playlist_request): result
+            for result in MasterPlaylistClient.get_many(
+                window_requests,
+                area_id=self.area_id,
+                radiko_session=self.radiko_session,
+                max_workers=self.max_workers,
+            )
+        }
+        master_playlists = []
+        for window_request in window_requests:
+            result = results[id(window_request)]
+            if result.error is not None:
+                raise result.error
+            master_playlists.append(cast("MasterPlaylist", result.master_playlist))
+        return master_playlists
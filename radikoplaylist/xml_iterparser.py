@@ -0,0 +1,52 @@
+"""Implements incremental parsing of XML shared by parsers of radiko APIs."""
+
+from __future__ import annotations
+
+from io import BytesIO
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+
+    # - defusedxml lacks an Element class · Issue #48 · tiran/defusedxml
+    #   https://github.com/tiran/defusedxml/issues/48#issuecomment-1511284750
+    from xml.etree.ElementTree import Element  # nosec B405
+
+__all__ = ["XmlIterParser"]
+
+
+class XmlIterParser:
+    """Parses XML incrementally, dropping processed elements so that memory stays flat on large documents."""
+
+    @staticmethod
+    def iterparse_elements(
+        string_xml: str | bytes,
+        tag: str,
+        *,
+        start_tags: Iterable[str] = (),
+    ) -> Iterator[tuple[str, Element]]:
+        """Yield each element of tag as soon as it ends, with event "end".
+
+        The element and its processed siblings are cleared when the caller resumes the iteration, so stopping
+        iteration early skips parsing the rest of the document. Elements of start_tags are also yielded as soon as
+        they start, with event "start", for the caller to read their attributes as context of following elements.
+        """
+        # Reason: To keep defusedxml off the startup path.
+        from defusedxml import ElementTree  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+        start_tags = frozenset(start_tags)
+        source = BytesIO(string_xml.encode("utf-8") if isinstance(string_xml, str) else string_xml)
+        root: Element | None = None
+        for event, element in ElementTree.iterparse(source, events=("start", "end"), forbid_dtd=True):
+            if root is None:
+                root = element
+            if event == "start":
+                if element.tag in start_tags:
+                    yield event, element
+                continue
+            if element.tag != tag:
+                continue
+            yield event, element
+            element.clear()
+            root.clear()
@@ -8,6 +8,9 @@ from typing import cast
 import pytest
 from requests.exceptions import ConnectTimeout
 
+from radikoplaylist.master_playlist_client import MasterPlaylistClient
+from radikoplaylist.playlist_create_url_getter import PlaylistCreateUrlGetter
+from radikoplaylist.requester import Requester
 from tests.testlibraries.instance_resource import InstanceResource
 
 if TYPE_CHECKING:
@@ -16,6 +19,24 @@ if TYPE_CHECKING:
     from requests_mock import Mocker
 
 
+@pytest.fixture(autouse=True)
+def clear_authorization_cache() -> None:
+    if MasterPlaylistClient.authorization_cache is not None:
+        MasterPlaylistClient.authorization_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_station_stream_cache() -> None:
+    if PlaylistCreateUrlGetter.station_stream_cache is not None:
+        PlaylistCreateUrlGetter.station_stream_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_circuit_breaker() -> None:
+    if Requester.circuit_breaker is not None:
+        Requester.circuit_breaker.reset()
+
+
 @pytest.fixture
 def mock_auth_1(requests_mock: Mocker) -> None:
     requests_mock.get(
@@ -0,0 +1,87 @@
+"""Test for radikoplaylist.async_master_playlist_client."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+
+from radikoplaylist import AsyncMasterPlaylistClient
+from radikoplaylist import LiveMasterPlaylistRequest
+from radikoplaylist import TimeFreeMasterPlaylistRequest
+from radikoplaylist.exceptions import BadHttpStatusCodeError
+from tests.testlibraries.instance_resource import InstanceResource
+from tests.testlibraries.instance_resource import ParameterExpectedLivePlaylistCreateUrlString
+
+if TYPE_CHECKING:
+    from requests_mock import Mocker
+
+
+class TestAsyncMasterPlaylistClient:
+    """Test for AsyncMasterPlaylistClient."""
+
+    @staticmethod
+    @pytest.mark.usefixtures("mock_get_playlist_create_url", "mock_auth_1", "mock_auth_2")
+    @pytest.mark.parametrize("mock_get_playlist_create_url", ["NACK5"], indirect=True)
+    def test_time_free(requests_mock: Mocker) -> None:
+        """Method get() should return appropriate master playlist."""
+        master_playlist_request = TimeFreeMasterPlaylistRequest("NACK5", 20200518215700, 20200518220000)
+        # Reason: To replace with mock
+        master_playlist_request.generate_uid = InstanceResource.MOCK_GENERATE_UID  # type: ignore[method-assign]
+        url = master_playlist_request.build_url(InstanceResource.HEADERS_EXAMPLE)
+        requests_mock.get(url, content=InstanceResource.RESPONSE_CONTENT_MASTER_PLAY_LIST)
+        master_playlist = asyncio.run(AsyncMasterPlaylistClient.get(master_playlist_request))
+        assert master_playlist.media_playlist_url == "https://radiko.jp/v2/api/ts/chunklist/Tt6TRp6b.m3u8"
+        assert master_playlist.headers == InstanceResource.HEADERS_EXAMPLE
+
+    @staticmethod
+    @pytest.mark.usefixtures("mock_get_playlist_create_url", "mock_auth_1", "mock_auth_2")
+    @pytest.mark.parametrize("mock_get_playlist_create_url", ["NACK5"], indirect=True)
+    def test_live_concurrently(requests_mock: Mocker) -> None:
+        """Method get() should run concurrently on one event loop."""
+        requests_mock.get(
+            ParameterExpectedLivePlaylistCreateUrlString.NACK5,
+            content=InstanceResource.RESPONSE_CONTENT_MASTER_PLAY_LIST,
+        )
+
+        async def get_many() -> list[str]:
+            tasks = [AsyncMasterPlaylistClient.get(LiveMasterPlaylistRequest("NACK5")) for _ in range(4)]
+            return [master_playlist.media_playlist_url for master_playlist in await asyncio.gather(*tasks)]
+
+        expected = ["https://radiko.jp/v2/api/ts/chunklist/Tt6TRp6b.m3u8"] * 4
+        assert asyncio.run(get_many()) == expected
+
+    @staticmethod
+    @pytest.mark.usefixtures("mock_get_playlist_create_url", "mock_auth_1", "mock_auth_2")
+    @pytest.mark.parametrize("mock_get_playlist_create_url", ["NACK5"], indirect=True)
+    def test_authenticate_once(requests_mock: Mocker) -> None:
+        """Concurrent method get() for the same station should share one authentication and one station stream."""
+        requests_mock.get(
+            ParameterExpectedLivePlaylistCreateUrlString.NACK5,
+            content=InstanceResource.RESPONSE_CONTENT_MASTER_PLAY_LIST,
+        )
+
+        async def get_many() -> None:
+            await asyncio.gather(
+                *(AsyncMasterPlaylistClient.get(LiveMasterPlaylistRequest("NACK5")) for _ in range(50)),
+            )
+
+        asyncio.run(get_many())
+        urls = [history.url for history in requests_mock.request_history]
+        assert urls.count(InstanceResource.URL_RADIKO_AUTH_1) == 1
+        assert urls.count(InstanceResource.URL_RADIKO_AUTH_2) == 1
+        assert urls.count(InstanceResource.URL_RADIKO_STREAM_PC_HTML_5 + "NACK5.xml") == 1
+
+    @staticmethod
+    @pytest.mark.usefixtures("mock_get_playlist_create_url", "mock_auth_1", "mock_auth_2")
+    @pytest.mark.parametrize("mock_get_playlist_create_url", ["NACK5"], indirect=True)
+    def test_error(requests_mock: Mocker) -> None:
+        """Method get() should raise error when HTTP status code is not 200."""
+        master_playlist_request = TimeFreeMasterPlaylistRequest("NACK5", 20200518215700, 20200518220000)
+        # Reason: To replace with mock
+        master_playlist_request.generate_uid = InstanceResource.MOCK_GENERATE_UID  # type: ignore[method-assign]
+        for url in master_playlist_request.build_urls(InstanceResource.HEADERS_EXAMPLE):
+            requests_mock.get(url, status_code=503)
+        with pytest.raises(BadHttpStatusCodeError):
+            asyncio.run(AsyncMasterPlaylistClient.get(master_playlist_request))
@@ -1,10 +1,29 @@
 """Test for radikoplaylist.authorization."""
 
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING
+
 import pytest
 
 from radikoplaylist.authorization import Authorization
+from radikoplaylist.authorization import AuthorizationCache
 from radikoplaylist.exceptions import BadHttpStatusCodeError
 from radikoplaylist.exceptions import HttpRequestTimeoutError
+from tests.testlibraries.instance_resource import InstanceResource
+
+if TYPE_CHECKING:
+    from requests_mock import Mocker
+
+
+class FakeClock:
+    """Monotonic clock which advances only by assignment."""
+
+    def __init__(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        self.now = 1000.0
+        monkeypatch.setattr(time, "monotonic", lambda: self.now)
 
 
 class TestAuthorization:
@@ -33,3 +52,96 @@ class TestAuthorization:
         headers = authorization.auth()
         assert "Cookie" in headers
         assert headers["Cookie"] == f"radiko_session={radiko_session}"
+
+
+class TestAuthorizationCache:
+    """Test for AuthorizationCache."""
+
+    @staticmethod
+    @pytest.mark.usefixtures("mock_auth_1", "mock_auth_2")
+    def test_reuse(requests_mock: Mocker) -> None:
+        """Method auth() should reuse cached headers for the same area and session."""
+        cache = AuthorizationCache()
+        headers = Authorization(cache=cache).auth()
+        authorization = Authorization(cache=cache)
+        assert authorization.auth() == headers
+        assert authorization.is_cached
+        Authorization(area_id="JP27", cache=cache).auth()
+        assert requests_mock.call_count == 4  # noqa: PLR2004
+
+    @staticmethod
+    def test_ttl() -> None:
+        """Method get() should not return stale headers."""
+        cache = AuthorizationCache(ttl=0.0)
+        cache.put("JP13", None, InstanceResource.HEADERS_EXAMPLE)
+        assert cache.get("JP13", None) is None
+
+    @staticmethod
+    def test_invalidate_learns_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+        """Method invalidate() should shorten TTL of the key to observed lifetime of rejected token."""
+        clock = FakeClock(monkeypatch)
+        cache = AuthorizationCache(ttl_minimum=10.0)
+        cache.put("JP13", None, InstanceResource.HEADERS_EXAMPLE)
+        clock.now += 100.0
+        cache.invalidate("JP13", None, expired=True)
+        assert cache.get("JP13", None) is None
+        assert cache.get_ttl("JP13", None) == pytest.approx(90.0)
+        assert cache.get_ttl("JP27", None) == AuthorizationCache.TTL_DEFAULT
+        assert cache.ttl == AuthorizationCache.TTL_DEFAULT
+        cache.put("JP13", None, InstanceResource.HEADERS_EXAMPLE)
+        clock.now += 90.0
+        assert cache.get("JP13", None) is None
+
+    @staticmethod
+    def test_invalidate_too_soon_keeps_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+        """Method invalidate() should not learn lifetime shorter than minimum TTL, which isn't expiry."""
+        clock = FakeClock(monkeypatch)
+        cache = AuthorizationCache(ttl_minimum=10.0)
+        cache.put("JP13", None, InstanceResource.HEADERS_EXAMPLE)
+        clock.now += 1.0
+        cache.invalidate("JP13", None, expired=True)
+        assert cache.get_ttl("JP13", None) == AuthorizationCache.TTL_DEFAULT
+
+    @staticmethod
+    def test_learned_ttl_recovers(monkeypatch: pytest.MonkeyPatch) -> None:
+        """Learned TTL should return to the initial TTL after TTL recovery."""
+        clock = FakeClock(monkeypatch)
+        cache = AuthorizationCache(ttl_recovery=3600.0)
+        cache.put("JP13", None, InstanceResource.HEADERS_EXAMPLE)
+        clock.now += 600.0
+        cache.invalidate("JP13", None, expired=True)
+        assert cache.get_ttl("JP13", None) == pytest.approx(540.0)
+        clock.now += 3600.0
+        assert cache.get_ttl("JP13", None) == AuthorizationCache.TTL_DEFAULT
+
+    @staticmethod
+    def test_invalidate_not_expired_keeps_ttl() -> None:
+        """Method invalidate() should keep TTL when the token is dropped for other reason."""
+        cache = AuthorizationCache()
+        cache.put("JP13", None, InstanceResource.HEADERS_EXAMPLE)
+        cache.invalidate("JP13", None)
+        assert cache.ttl == AuthorizationCache.TTL_DEFAULT
+
+    @staticmethod
+    def test_share_async() -> None:
+        """Method share_async() should run one flight for concurrent callers and raise its error to all of them."""
+        cache = AuthorizationCache()
+        calls: list[None] = []
+
+        async def authenticate() -> dict[str, str | bytes]:
+            calls.append(None)
+            await asyncio.sleep(0)
+            if len(calls) == 1:
+                msg = "auth1"
+                raise BadHttpStatusCodeError(msg, 503)
+            return dict(InstanceResource.HEADERS_EXAMPLE)
+
+        async def share() -> list[dict[str, str | bytes] | BaseException]:
+            return await asyncio.gather(
+                *(cache.share_async("JP13", None, authenticate) for _ in range(3)),
+                return_exceptions=True,
+            )
+
+        assert all(isinstance(result, BadHttpStatusCodeError) for result in asyncio.run(share()))
+        assert asyncio.run(share()) == [InstanceResource.HEADERS_EXAMPLE] * 3
+        assert len(calls) == 2  # noqa: PLR2004
@@ -0,0 +1,60 @@
+"""Test for radikoplaylist.authorization_refresher."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from radikoplaylist.authorization import AuthorizationCache
+from radikoplaylist.authorization_refresher import AuthorizationRefresher
+from tests.testlibraries.instance_resource import InstanceResource
+
+if TYPE_CHECKING:
+    from requests_mock import Mocker
+
+
+class TestAuthorizationRefresher:
+    """Test for AuthorizationRefresher."""
+
+    @staticmethod
+    def test_compute_delay() -> None:
+        """Method compute_delay() should schedule renewal with jitter before TTL."""
+        refresher = AuthorizationRefresher(AuthorizationCache(ttl=100.0))
+        for _ in range(100):
+            assert 70.0 <= refresher.compute_delay() <= 80.0  # noqa: PLR2004
+
+    @staticmethod
+    @pytest.mark.usefixtures("mock_auth_1", "mock_auth_2")
+    def test_refresh_in_background(requests_mock: Mocker) -> None:
+        """Registered area should be authenticated in background and served from cache."""
+        cache = AuthorizationCache()
+        refresher = AuthorizationRefresher(cache)
+        refresher.register("JP13")
+        refresher.start()
+        try:
+            deadline = time.monotonic() + 5.0
+            while cache.age("JP13", None) is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+            call_count = requests_mock.call_count
+            assert refresher.headers("JP13") == InstanceResource.HEADERS_EXAMPLE
+        finally:
+            refresher.stop()
+        assert call_count == 2  # noqa: PLR2004
+        assert requests_mock.call_count == call_count
+
+    @staticmethod
+    @pytest.mark.usefixtures("mock_auth_1", "mock_auth_2")
+    def test_register_cached_is_not_refreshed_immediately(requests_mock: Mocker) -> None:
+        """Method register() should schedule renewal of cached token before its expiry instead of now."""
+        cache = AuthorizationCache()
+        cache.put("JP13", None, InstanceResource.HEADERS_EXAMPLE)
+        refresher = AuthorizationRefresher(cache)
+        refresher.start()
+        try:
+            refresher.register("JP13")
+            time.sleep(0.05)
+        finally:
+            refresher.stop()
+        assert requests_mock.call_count == 0
@@ -0,0 +1,173 @@
+"""Tests for radikoplaylist.circuit_breaker."""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+from typing import TYPE_CHECKING
+
+import pytest
+from requests.exceptions import ConnectTimeout
+
+from radikoplaylist.circuit_breaker import CircuitState
+from radikoplaylist.circuit_breaker import HostCircuitBreaker
+from radikoplaylist.exceptions import BadHttpStatusCodeError
+from radikoplaylist.exceptions import HttpRequestTimeoutError
+from radikoplaylist.host_policy import HostPolicyTable
+from radikoplaylist.playlist_create_url_getter import TimeFreePlaylistCreateUrlGetter
+from radikoplaylist.requester import Phase
+from radikoplaylist.requester import Requester
+from tests.testlibraries.instance_resource import InstanceResource
+
+if TYPE_CHECKING:
+    from requests_mock import Mocker
+
+URL_RADIKO = "https://radiko.jp/v2/api/ts/playlist.m3u8"
+URL_TF_RPAA = "https://tf-rpaa.smartstream.ne.jp/tf/playlist.m3u8"
+
+
+def create_half_open(monkeypatch: pytest.MonkeyPatch, now: list[float]) -> HostCircuitBreaker:
+    """Return circuit breaker whose circuit of radiko.jp is half-open on clock now[0]."""
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    circuit_breaker = HostCircuitBreaker(failure_threshold=1, recovery_timeout=30.0)
+    circuit_breaker.record_failure(URL_RADIKO)
+    now[0] += 30.0
+    assert circuit_breaker.state(URL_RADIKO) is CircuitState.HALF_OPEN
+    return circuit_breaker
+
+
+class TestHostCircuitBreaker:
+    """Tests for HostCircuitBreaker."""
+
+    @staticmethod
+    def test_open_after_threshold() -> None:
+        """Circuit should open after consecutive failures and close after success."""
+        circuit_breaker = HostCircuitBreaker(failure_threshold=2)
+        circuit_breaker.record_failure(URL_RADIKO)
+        assert circuit_breaker.state(URL_RADIKO) is CircuitState.CLOSED
+        circuit_breaker.record_failure(URL_RADIKO + "?station_id=TBS")
+        assert circuit_breaker.state(URL_RADIKO) is CircuitState.OPEN
+        circuit_breaker.record(URL_RADIKO, 200)
+        assert circuit_breaker.state(URL_RADIKO) is CircuitState.CLOSED
+
+    @staticmethod
+    def test_half_open() -> None:
+        """Circuit should be half-open after recovery timeout and open again by failure."""
+        circuit_breaker = HostCircuitBreaker(failure_threshold=1, recovery_timeout=0.0)
+        circuit_breaker.record(URL_RADIKO, 503)
+        assert circuit_breaker.state(URL_RADIKO) is CircuitState.HALF_OPEN
+        circuit_breaker.recovery_timeout = 60.0
+        circuit_breaker.record_failure(URL_RADIKO)
+        assert circuit_breaker.state(URL_RADIKO) is CircuitState.OPEN
+
+    @staticmethod
+    def test_half_open_allows_one_trial(monkeypatch: pytest.MonkeyPatch) -> None:
+        """Half-open circuit should allow only one of concurrent requests until the trial has outcome."""
+        now = [1000.0]
+        circuit_breaker = create_half_open(monkeypatch, now)
+        workers = 8
+        barrier = Barrier(workers)
+
+        def allow() -> bool:
+            barrier.wait()
+            return circuit_breaker.allow(URL_RADIKO)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(lambda _: allow(), range(workers)))
+        assert results.count(True) == 1
+        assert circuit_breaker.state(URL_RADIKO) is CircuitState.OPEN
+        circuit_breaker.record_success(URL_RADIKO)
+        assert circuit_breaker.allow(URL_RADIKO)
+
+    @staticmethod
+    def test_half_open_trial_abandoned(monkeypatch: pytest.MonkeyPatch) -> None:
+        """Trial without outcome within recovery timeout should let the next caller try, and failure reopens."""
+        now = [1000.0]
+        circuit_breaker = create_half_open(monkeypatch, now)
+        assert circuit_breaker.allow(URL_RADIKO)
+        now[0] += 29.0
+        assert not circuit_breaker.allow(URL_RADIKO)
+        now[0] += 1.0
+        assert circuit_breaker.allow(URL_RADIKO)
+        circuit_breaker.record_failure(URL_RADIKO)
+        now[0] += 29.0
+        assert circuit_breaker.state(URL_RADIKO) is CircuitState.OPEN
+
+    @staticmethod
+    def test_order_claims_trial(monkeypatch: pytest.MonkeyPatch) -> None:
+        """Method order() should put half-open host first only for the caller which claims the trial."""
+        now = [1000.0]
+        circuit_breaker = create_half_open(monkeypatch, now)
+        assert circuit_breaker.order([URL_RADIKO, URL_TF_RPAA]) == [URL_RADIKO, URL_TF_RPAA]
+        assert circuit_breaker.order([URL_RADIKO, URL_TF_RPAA]) == [URL_TF_RPAA, URL_RADIKO]
+
+    @staticmethod
+    def test_order_keeps_trial_behind_closed_host(monkeypatch: pytest.MonkeyPatch) -> None:
+        """Method order() should not claim trial of half-open host ranked after closed host."""
+        now = [1000.0]
+        circuit_breaker = create_half_open(monkeypatch, now)
+        assert circuit_breaker.order([URL_TF_RPAA, URL_RADIKO]) == [URL_TF_RPAA, URL_RADIKO]
+        assert circuit_breaker.state(URL_RADIKO) is CircuitState.HALF_OPEN
+
+    @staticmethod
+    def test_order() -> None:
+        """Method order() should move URLs on open hosts last."""
+        circuit_breaker = HostCircuitBreaker(failure_threshold=1)
+        circuit_breaker.record_failure(URL_RADIKO)
+        assert circuit_breaker.order([URL_RADIKO, URL_TF_RPAA]) == [URL_TF_RPAA, URL_RADIKO]
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("error", "expected"),
+        [
+            (BadHttpStatusCodeError("", 503), True),
+            (BadHttpStatusCodeError("", 403), False),
+            (HttpRequestTimeoutError(""), True),
+            (ConnectionError(""), False),
+        ],
+    )
+    def test_is_host_failure(error: Exception, expected: bool) -> None:  # noqa: FBT001
+        """Method is_host_failure() should distinguish failure of host from rejection of request."""
+        assert HostCircuitBreaker.is_host_failure(error) is expected
+
+    @staticmethod
+    @pytest.mark.parametrize("xml_playlist_create_url", ["NACK5"], indirect=True)
+    def test_getter_skips_open_host(xml_playlist_create_url: str) -> None:
+        """Getter should not select URL on open host while other candidate is available."""
+        assert Requester.circuit_breaker is not None
+        for _ in range(Requester.circuit_breaker.failure_threshold):
+            Requester.circuit_breaker.record_failure(URL_RADIKO)
+        assert TimeFreePlaylistCreateUrlGetter.get_playlist_create_url(xml_playlist_create_url) == URL_TF_RPAA
+
+    @staticmethod
+    def test_segment_urls_skip_host_cache() -> None:
+        """Circuit breaker should not fill cache of hosts of playlist create URLs with unique segment URLs."""
+        HostPolicyTable.host_of(URL_RADIKO)
+        cache_info = HostPolicyTable.host_of.cache_info()
+        circuit_breaker = HostCircuitBreaker()
+        for number in range(cache_info.maxsize or 0):
+            circuit_breaker.record_success(f"https://radiko.jp/v2/api/ts/segment/{number}.aac")
+        assert HostPolicyTable.host_of.cache_info().currsize == cache_info.currsize
+        HostPolicyTable.host_of(URL_RADIKO)
+        assert HostPolicyTable.host_of.cache_info().hits == cache_info.hits + 1
+
+    @staticmethod
+    def test_requester_feeds(requests_mock: Mocker, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Requester should record failure of host."""
+        requests_mock.get(InstanceResource.URL_RADIKO_AUTH_1, exc=ConnectTimeout)
+        circuit_breaker = HostCircuitBreaker(failure_threshold=1)
+        monkeypatch.setattr(Requester, "circuit_breaker", circuit_breaker)
+        with pytest.raises(HttpRequestTimeoutError):
+            Requester.get(InstanceResource.URL_RADIKO_AUTH_1, InstanceResource.HEADERS_EXAMPLE)
+        assert circuit_breaker.is_open(InstanceResource.URL_RADIKO_AUTH_1)
+
+    @staticmethod
+    def test_requester_skips_phase(requests_mock: Mocker, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Requester should not feed failure of authentication to circuit of playlists on the same host."""
+        requests_mock.get(InstanceResource.URL_RADIKO_AUTH_1, exc=ConnectTimeout)
+        circuit_breaker = HostCircuitBreaker(failure_threshold=1)
+        monkeypatch.setattr(Requester, "circuit_breaker", circuit_breaker)
+        with pytest.raises(HttpRequestTimeoutError):
+            Requester.get(InstanceResource.URL_RADIKO_AUTH_1, InstanceResource.HEADERS_EXAMPLE, phase=Phase.AUTH1)
+        assert circuit_breaker.state(URL_RADIKO) is CircuitState.CLOSED
@@ -0,0 +1,79 @@
+"""Tests for radikoplaylist.host_latency."""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING
+
+import pytest
+from requests.exceptions import ConnectTimeout
+
+from radikoplaylist.host_latency import HostLatencyTracker
+from radikoplaylist.playlist_create_url_getter import LivePlaylistCreateUrlGetter
+from radikoplaylist.playlist_create_url_getter import PlaylistCreateUrlGetter
+from radikoplaylist.station_stream import StationStreamParser
+
+if TYPE_CHECKING:
+    from requests_mock import Mocker
+
+URL_C_RADIKO = "https://c-radiko.smartstream.ne.jp/TBS/_definst_/simul-stream.stream/playlist.m3u8"
+URL_F_RADIKO = "https://f-radiko.smartstream.ne.jp/TBS/_definst_/simul-stream.stream/playlist.m3u8"
+
+
+class TestHostLatencyTracker:
+    """Tests for HostLatencyTracker."""
+
+    @staticmethod
+    def test_record_moving_average() -> None:
+        """Method record() should keep exponentially weighted moving average."""
+        tracker = HostLatencyTracker()
+        tracker.record("https://radiko.jp", 1.0)
+        tracker.record("https://radiko.jp", 2.0)
+        assert tracker.stats()["https://radiko.jp"].latency == pytest.approx(1.3)
+
+    @staticmethod
+    def test_rank_without_probe(requests_mock: Mocker) -> None:
+        """Method rank() should order by latency and reuse fresh stats without probe."""
+        tracker = HostLatencyTracker()
+        tracker.record("https://c-radiko.smartstream.ne.jp", 0.2)
+        tracker.record("https://f-radiko.smartstream.ne.jp", 0.1)
+        assert tracker.rank([URL_C_RADIKO, URL_F_RADIKO]) == [URL_F_RADIKO, URL_C_RADIKO]
+        assert requests_mock.call_count == 0
+
+    @staticmethod
+    def test_rank_unhealthy_last(requests_mock: Mocker) -> None:
+        """Method rank() should probe hosts concurrently and put unhealthy host last."""
+        requests_mock.head(URL_C_RADIKO, exc=ConnectTimeout)
+        requests_mock.head(URL_F_RADIKO)
+        tracker = HostLatencyTracker()
+        assert tracker.rank([URL_C_RADIKO, URL_F_RADIKO]) == [URL_F_RADIKO, URL_C_RADIKO]
+        assert not tracker.stats()["https://c-radiko.smartstream.ne.jp"].healthy
+
+    @staticmethod
+    @pytest.mark.parametrize("xml_playlist_create_url", ["TBS"], indirect=True)
+    def test_getter(xml_playlist_create_url: str, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Getter should keep preference of area-free while choosing the fastest host."""
+        tracker = HostLatencyTracker()
+        tracker.record("https://c-radiko.smartstream.ne.jp", 0.2)
+        tracker.record("https://c-rpaa.smartstream.ne.jp", 0.1)
+        monkeypatch.setattr(PlaylistCreateUrlGetter, "host_latency_tracker", tracker)
+        assert LivePlaylistCreateUrlGetter.get_playlist_create_url(xml_playlist_create_url) == URL_C_RADIKO
+
+    @staticmethod
+    @pytest.mark.parametrize("xml_playlist_create_url", ["TBS"], indirect=True)
+    def test_getter_probes_only_supported(
+        xml_playlist_create_url: str,
+        requests_mock: Mocker,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Getter should probe only hosts of FFmpeg-supported candidates."""
+        requests_mock.head(re.compile(".*"))
+        monkeypatch.setattr(PlaylistCreateUrlGetter, "host_latency_tracker", HostLatencyTracker())
+        candidates = LivePlaylistCreateUrlGetter.rank_candidates(StationStreamParser.parse(xml_playlist_create_url))
+        probed = {HostLatencyTracker.host_of(request.url) for request in requests_mock.request_history}
+        assert probed == {
+            HostLatencyTracker.host_of(candidate.playlist_create_url)
+            for candidate in candidates
+            if candidate.ffmpeg_supported
+        }
+        assert any(not candidate.ffmpeg_supported for candidate in candidates)
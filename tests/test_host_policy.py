@@ -0,0 +1,65 @@
+"""Tests for radikoplaylist.host_policy."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+
+from radikoplaylist.host_policy import HostPolicy
+from radikoplaylist.host_policy import HostPolicyTable
+from radikoplaylist.playlist_create_url_getter import LivePlaylistCreateUrlGetter
+from radikoplaylist.playlist_create_url_getter import UrlChecker
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestHostPolicyTable:
+    """Tests for HostPolicyTable."""
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("url", "expected"),
+        [
+            ("https://radiko.jp/v2/api/ts/playlist.m3u8", HostPolicy(fastest=True)),
+            ("https://c-rpaa.smartstream.ne.jp/so/playlist.m3u8", HostPolicy(ffmpeg_supported=False)),
+            ("https://unknown.example.com/playlist.m3u8", HostPolicy()),
+        ],
+    )
+    def test_default(url: str, expected: HostPolicy) -> None:
+        """Default table should classify known hosts and give default policy to unknown hosts."""
+        assert HostPolicyTable.default().classify(url) == expected
+
+    @staticmethod
+    def test_load(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Table loaded from file should classify new host."""
+        path = tmp_path / "host_policy.json"
+        path.write_text(json.dumps({"https://c-radiko.smartstream.ne.jp": {"ffmpeg_supported": False}}))
+        monkeypatch.setattr(UrlChecker, "host_policy_table", HostPolicyTable.load(path))
+        xml = (
+            '<urls><url areafree="1" timefree="0">'
+            "<playlist_create_url>https://c-radiko.smartstream.ne.jp/TBS/playlist.m3u8</playlist_create_url>"
+            '</url><url areafree="1" timefree="0">'
+            "<playlist_create_url>https://f-radiko.smartstream.ne.jp/TBS/playlist.m3u8</playlist_create_url>"
+            "</url></urls>"
+        )
+        url = LivePlaylistCreateUrlGetter.get_playlist_create_url(xml)
+        assert url == "https://f-radiko.smartstream.ne.jp/TBS/playlist.m3u8"
+
+    @staticmethod
+    @pytest.mark.parametrize("policy", [{"unknown": True}, {"fastest": "yes"}])
+    def test_load_invalid(tmp_path: Path, policy: dict[str, object]) -> None:
+        """Method load() should raise ValueError for unknown field or non-boolean value."""
+        path = tmp_path / "host_policy.json"
+        path.write_text(json.dumps({"https://radiko.jp": policy}))
+        with pytest.raises(ValueError, match=r"Invalid host policy of https://radiko\.jp"):
+            HostPolicyTable.load(path)
+
+    @staticmethod
+    def test_is_ffmpeg_supported() -> None:
+        """Live only host should not be supported for time free."""
+        assert HostPolicy(live_only=True).is_ffmpeg_supported(time_free=False)
+        assert not HostPolicy(live_only=True).is_ffmpeg_supported(time_free=True)
+        assert not HostPolicy(ffmpeg_supported_time_free=False).is_ffmpeg_supported(time_free=True)
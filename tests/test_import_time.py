@@ -0,0 +1,54 @@
+"""Tests for import time of radikoplaylist."""
+
+from __future__ import annotations
+
+import subprocess  # nosec B404
+import sys
+
+import pytest
+
+import radikoplaylist
+
+# Cumulative microseconds of `import radikoplaylist`, generous for slow CI runners
+BUDGET_IMPORT_TIME = 50_000
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(  # noqa: S603 # nosec B603
+        [sys.executable, *args],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+
+class TestImportTime:
+    """Tests for import time of radikoplaylist."""
+
+    @staticmethod
+    def test_budget() -> None:
+        """Importing the package should be within budget, measured by -X importtime."""
+        stderr = run_python("-X", "importtime", "-c", "import radikoplaylist").stderr
+        cumulative = [
+            int(line.split("|")[1])
+            for line in stderr.splitlines()
+            if line.startswith("import time:") and line.split("|")[2].strip() == "radikoplaylist"
+        ]
+        assert cumulative
+        assert cumulative[0] < BUDGET_IMPORT_TIME
+
+    @staticmethod
+    def test_heavy_modules_are_deferred() -> None:
+        """Importing the package should not import heavy third-party packages."""
+        code = "import sys, radikoplaylist; print(sorted({'requests', 'm3u8', 'defusedxml'} & set(sys.modules)))"
+        assert run_python("-c", code).stdout.strip() == "[]"
+        code = "import sys; from radikoplaylist import MasterPlaylistClient; print('m3u8' in sys.modules)"
+        assert run_python("-c", code).stdout.strip() == "False"
+
+    @staticmethod
+    def test_lazy_attribute() -> None:
+        """Public names should resolve on access and unknown names should raise AttributeError."""
+        assert radikoplaylist.MasterPlaylistClient.__name__ == "MasterPlaylistClient"
+        assert set(radikoplaylist.__all__) <= set(dir(radikoplaylist))
+        with pytest.raises(AttributeError):
+            _ = radikoplaylist.Unknown
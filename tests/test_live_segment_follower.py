@@ -0,0 +1,127 @@
+"""Tests for radikoplaylist.live_segment_follower."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from radikoplaylist import LiveSegmentFollower
+from radikoplaylist.exceptions import BadHttpStatusCodeError
+from tests.testlibraries.instance_resource import InstanceResource
+from tests.testlibraries.instance_resource import ParameterExpectedLivePlaylistCreateUrlString
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from requests_mock import Mocker
+
+
+def create_media_playlist(station: str, media_sequence: int, count: int) -> bytes:
+    lines = [b"#EXTM3U", b"#EXT-X-TARGETDURATION:5", b"#EXT-X-MEDIA-SEQUENCE:%d" % media_sequence]
+    for sequence in range(media_sequence, media_sequence + count):
+        lines += [b"#EXTINF:5,", b"%s/%d.aac" % (station.encode(), sequence)]
+    return b"\n".join(lines) + b"\n"
+
+
+class TestLiveSegmentFollower:
+    """Tests for LiveSegmentFollower."""
+
+    @staticmethod
+    @pytest.mark.usefixtures("mock_auth_1", "mock_auth_2")
+    def test_follow(requests_mock: Mocker, resource_path_root: Path) -> None:
+        """Method follow() should yield only new segments of each station until the capture completes."""
+        for station in ["TBS", "QRR", "NACK5"]:
+            requests_mock.get(
+                InstanceResource.URL_RADIKO_STREAM_PC_HTML_5 + station + ".xml",
+                text=(resource_path_root / "xml_playlist_create_url" / (station + ".xml")).read_text(),
+            )
+        for station in ["TBS", "QRR"]:
+            url_media_playlist = f"https://radiko.jp/v2/api/ts/chunklist/{station}.m3u8"
+            requests_mock.get(
+                f"https://c-radiko.smartstream.ne.jp/{station}/_definst_/simul-stream.stream/playlist.m3u8",
+                content=b"#EXTM3U\n#EXT-X-STREAM-INF:BANDWIDTH=52973\n" + url_media_playlist.encode() + b"\n",
+            )
+            requests_mock.get(
+                url_media_playlist,
+                [
+                    {"content": create_media_playlist(station, 1, 2)},
+                    {"content": create_media_playlist(station, 2, 2)},
+                    {"content": create_media_playlist(station, 3, 2)},
+                ],
+            )
+        requests_mock.get(ParameterExpectedLivePlaylistCreateUrlString.NACK5, status_code=404)
+        follower = LiveSegmentFollower(["TBS", "QRR", "NACK5"])
+        followed = list(follower.follow(duration=15.0, poll_interval=0.0))
+        for station in ["TBS", "QRR"]:
+            assert [
+                followed_segment.segment.media_sequence
+                for followed_segment in followed
+                if followed_segment.station_id == station
+            ] == [1, 2, 3]
+        assert isinstance(follower.errors["NACK5"], BadHttpStatusCodeError)
+
+    @staticmethod
+    @pytest.mark.usefixtures("mock_auth_1", "mock_auth_2")
+    @pytest.mark.parametrize("mock_get_playlist_create_url", ["TBS"], indirect=True)
+    @pytest.mark.usefixtures("mock_get_playlist_create_url")
+    def test_follow_segment_count(requests_mock: Mocker) -> None:
+        """Method follow() should stop capture by segment count within one poll."""
+        requests_mock.get(
+            ParameterExpectedLivePlaylistCreateUrlString.TBS,
+            content=InstanceResource.RESPONSE_CONTENT_MASTER_PLAY_LIST,
+        )
+        requests_mock.get(
+            "https://radiko.jp/v2/api/ts/chunklist/Tt6TRp6b.m3u8",
+            content=create_media_playlist("TBS", 1, 5),
+        )
+        followed = list(LiveSegmentFollower(["TBS"]).follow(segment_count=3, poll_interval=0.0))
+        assert [followed_segment.segment.media_sequence for followed_segment in followed] == [1, 2, 3]
+
+    @staticmethod
+    @pytest.mark.usefixtures("mock_auth_1", "mock_auth_2")
+    @pytest.mark.parametrize("mock_get_playlist_create_url", ["TBS"], indirect=True)
+    @pytest.mark.usefixtures("mock_get_playlist_create_url")
+    def test_follow_token_rejected(requests_mock: Mocker) -> None:
+        """Method follow() should resolve station again with new token when radiko rejects the token."""
+        requests_mock.get(
+            ParameterExpectedLivePlaylistCreateUrlString.TBS,
+            content=InstanceResource.RESPONSE_CONTENT_MASTER_PLAY_LIST,
+        )
+        requests_mock.get(
+            "https://radiko.jp/v2/api/ts/chunklist/Tt6TRp6b.m3u8",
+            [
+                {"content": create_media_playlist("TBS", 1, 2)},
+                {"status_code": 403},
+                {"content": create_media_playlist("TBS", 2, 2)},
+            ],
+        )
+        follower = LiveSegmentFollower(["TBS"])
+        followed = list(follower.follow(segment_count=3, poll_interval=0.0))
+        assert [followed_segment.segment.media_sequence for followed_segment in followed] == [1, 2, 3]
+        assert not follower.errors
+        assert [request.url for request in requests_mock.request_history].count(
+            InstanceResource.URL_RADIKO_AUTH_1,
+        ) == 2  # noqa: PLR2004
+
+    @staticmethod
+    @pytest.mark.usefixtures("mock_auth_1", "mock_auth_2")
+    @pytest.mark.parametrize("mock_get_playlist_create_url", ["TBS"], indirect=True)
+    @pytest.mark.usefixtures("mock_get_playlist_create_url")
+    def test_follow_drops_failing_station(requests_mock: Mocker) -> None:
+        """Method follow() should drop station after consecutive failures and report the error."""
+        requests_mock.get(
+            ParameterExpectedLivePlaylistCreateUrlString.TBS,
+            content=InstanceResource.RESPONSE_CONTENT_MASTER_PLAY_LIST,
+        )
+        requests_mock.get(
+            "https://radiko.jp/v2/api/ts/chunklist/Tt6TRp6b.m3u8",
+            [{"content": create_media_playlist("TBS", 1, 1)}, {"status_code": 500}],
+        )
+        follower = LiveSegmentFollower(["TBS"])
+        followed = list(follower.follow(segment_count=3, poll_interval=0.0, max_failures=2))
+        assert [followed_segment.segment.media_sequence for followed_segment in followed] == [1]
+        assert isinstance(follower.errors["TBS"], BadHttpStatusCodeError)
+        assert [request.path for request in requests_mock.request_history].count(
+            "/v2/api/ts/chunklist/tt6trp6b.m3u8",
+        ) == 3  # noqa: PLR2004
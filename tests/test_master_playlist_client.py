@@ -2,19 +2,36 @@
 
 from __future__ import annotations
 
+from textwrap import dedent
 from typing import TYPE_CHECKING
 from typing import Any
 
 import pytest
 
+from radikoplaylist import LiveMasterPlaylistRequest
 from radikoplaylist import MasterPlaylistClient
 from radikoplaylist import TimeFreeMasterPlaylistRequest
 from radikoplaylist.exceptions import BadHttpStatusCodeError
+from radikoplaylist.exceptions import HttpRequestTimeoutError
+from radikoplaylist.playlist_create_url_getter import PlaylistCreateUrlGetter
 from tests.testlibraries.instance_resource import InstanceResource
+from tests.testlibraries.instance_resource import ParameterExpectedLivePlaylistCreateUrlString
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from requests_mock import Mocker
 
+# Broken after the winner to check that the rest isn't parsed
+XML_TRUNCATED_AFTER_WINNER = dedent("""\
+    <?xml version="1.0" encoding="UTF-8" ?>
+    <urls>
+        <url areafree="0" max_delay="60" timefree="1">
+            <playlist_create_url>https://radiko.jp/v2/api/ts/playlist.m3u8</playlist_create_url>
+        </url>
+        <url areafree="1" max_delay="60" timefree="1">
+""")
+
 
 class TestConcat:
     """Test for concat()."""
@@ -91,13 +108,108 @@ class TestMasterPlaylistClient:
     )
     # pylint: disable=unused-argument
     def test_error(requests_mock: Mocker, status_code: int, station: str) -> None:
-        """Method build_url() should raise error when HTTP status code is not 200."""
+        """Method build_url() should raise error when HTTP status code of every candidate is not 200."""
         date_time_start = 20200518215700
         date_time_end = 20200518220000
         master_playlist_request = TimeFreeMasterPlaylistRequest(station, date_time_start, date_time_end)
         # Reason: To replace with mock
         master_playlist_request.generate_uid = InstanceResource.MOCK_GENERATE_UID  # type: ignore[method-assign]
-        url = master_playlist_request.build_url(InstanceResource.HEADERS_EXAMPLE)
-        requests_mock.get(url, status_code=status_code)
+        for url in master_playlist_request.build_urls(InstanceResource.HEADERS_EXAMPLE):
+            requests_mock.get(url, status_code=status_code)
         with pytest.raises(BadHttpStatusCodeError):
             MasterPlaylistClient.get(master_playlist_request)
+
+    @staticmethod
+    @pytest.mark.usefixtures("mock_get_playlist_create_url", "mock_auth_1", "mock_auth_2")
+    @pytest.mark.parametrize("mock_get_playlist_create_url", ["NACK5"], indirect=True)
+    @pytest.mark.parametrize("is_cached", [True, False])
+    def test_fallback(requests_mock: Mocker, monkeypatch: pytest.MonkeyPatch, is_cached: bool) -> None:  # noqa: FBT001
+        """Method get() should fall back to the next candidate when the host fails, with or without cache."""
+        if not is_cached:
+            monkeypatch.setattr(PlaylistCreateUrlGetter, "station_stream_cache", None)
+        master_playlist_request = TimeFreeMasterPlaylistRequest("NACK5", 20200518215700, 20200518220000)
+        # Reason: To replace with mock
+        master_playlist_request.generate_uid = InstanceResource.MOCK_GENERATE_UID  # type: ignore[method-assign]
+        url_failing, url_next, *_ = master_playlist_request.build_urls(InstanceResource.HEADERS_EXAMPLE)
+        requests_mock.get(url_failing, status_code=503)
+        requests_mock.get(url_next, content=InstanceResource.RESPONSE_CONTENT_MASTER_PLAY_LIST)
+        master_playlist = MasterPlaylistClient.get(master_playlist_request)
+        assert master_playlist.media_playlist_url == "https://radiko.jp/v2/api/ts/chunklist/Tt6TRp6b.m3u8"
+
+    @staticmethod
+    @pytest.mark.usefixtures("mock_auth_1", "mock_auth_2")
+    def test_early_exit_without_cache(requests_mock: Mocker, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Method get() should request the winner without parsing the rest of station stream XML."""
+        monkeypatch.setattr(PlaylistCreateUrlGetter, "station_stream_cache", None)
+        requests_mock.get(InstanceResource.URL_RADIKO_STREAM_PC_HTML_5 + "NACK5.xml", text=XML_TRUNCATED_AFTER_WINNER)
+        master_playlist_request = TimeFreeMasterPlaylistRequest("NACK5", 20200518215700, 20200518220000)
+        # Reason: To replace with mock
+        master_playlist_request.generate_uid = InstanceResource.MOCK_GENERATE_UID  # type: ignore[method-assign]
+        url = "https://radiko.jp/v2/api/ts/playlist.m3u8?" + master_playlist_request.build_query()
+        requests_mock.get(url, content=InstanceResource.RESPONSE_CONTENT_MASTER_PLAY_LIST)
+        master_playlist = MasterPlaylistClient.get(master_playlist_request)
+        assert master_playlist.media_playlist_url == "https://radiko.jp/v2/api/ts/chunklist/Tt6TRp6b.m3u8"
+
+    @staticmethod
+    @pytest.mark.usefixtures("mock_get_playlist_create_url", "mock_auth_1", "mock_auth_2")
+    @pytest.mark.parametrize("mock_get_playlist_create_url", ["NACK5"], indirect=True)
+    def test_cached_token_rejected(requests_mock: Mocker) -> None:
+        """Method get() should authenticate again when radiko rejects cached token."""
+        master_playlist_request = TimeFreeMasterPlaylistRequest("NACK5", 20200518215700, 20200518220000)
+        # Reason: To replace with mock
+        master_playlist_request.generate_uid = InstanceResource.MOCK_GENERATE_UID  # type: ignore[method-assign]
+        url = master_playlist_request.build_url(InstanceResource.HEADERS_EXAMPLE)
+        requests_mock.get(
+            url,
+            [
+                {"content": InstanceResource.RESPONSE_CONTENT_MASTER_PLAY_LIST},
+                {"status_code": 403},
+                {"content": InstanceResource.RESPONSE_CONTENT_MASTER_PLAY_LIST},
+            ],
+        )
+        MasterPlaylistClient.get(master_playlist_request)
+        master_playlist = MasterPlaylistClient.get(master_playlist_request)
+        assert master_playlist.media_playlist_url == "https://radiko.jp/v2/api/ts/chunklist/Tt6TRp6b.m3u8"
+        auth_1_count = sum(
+            1 for request in requests_mock.request_history if request.url == InstanceResource.URL_RADIKO_AUTH_1
+        )
+        assert auth_1_count == 2  # noqa: PLR2004
+
+    @staticmethod
+    @pytest.mark.usefixtures("mock_auth_1", "mock_auth_2")
+    def test_get_many(requests_mock: Mocker, resource_path_root: Path) -> None:
+        """Method get_many() should authenticate once per area and yield result or error of each request."""
+        for station in ["TBS", "QRR", "NACK5"]:
+            requests_mock.get(
+                InstanceResource.URL_RADIKO_STREAM_PC_HTML_5 + station + ".xml",
+                text=(resource_path_root / "xml_playlist_create_url" / (station + ".xml")).read_text(),
+            )
+        for station in ["TBS", "QRR"]:
+            requests_mock.get(
+                f"https://c-radiko.smartstream.ne.jp/{station}/_definst_/simul-stream.stream/playlist.m3u8",
+                content=InstanceResource.RESPONSE_CONTENT_MASTER_PLAY_LIST,
+            )
+        requests_mock.get(ParameterExpectedLivePlaylistCreateUrlString.NACK5, status_code=503)
+        master_playlist_requests = [LiveMasterPlaylistRequest(station) for station in ["TBS", "QRR", "NACK5"]]
+        results = {
+            result.master_playlist_request.station_id: result
+            for result in MasterPlaylistClient.get_many(master_playlist_requests, area_ids={"NACK5": "JP11"})
+        }
+        assert results["TBS"].master_playlist is not None
+        assert results["QRR"].master_playlist is not None
+        assert isinstance(results["NACK5"].error, BadHttpStatusCodeError)
+        auth_1_area_ids = [
+            request.headers["X-Radiko-AreaId"]
+            for request in requests_mock.request_history
+            if request.url == InstanceResource.URL_RADIKO_AUTH_1
+        ]
+        assert sorted(auth_1_area_ids) == ["JP11", "JP13"]
+
+    @staticmethod
+    @pytest.mark.usefixtures("mock_auth_1_timeout")
+    def test_get_many_authorization_error() -> None:
+        """Method get_many() should yield error of authorization for each request in the area."""
+        master_playlist_requests = [LiveMasterPlaylistRequest(station) for station in ["TBS", "QRR"]]
+        results = list(MasterPlaylistClient.get_many(master_playlist_requests))
+        assert len(results) == 2  # noqa: PLR2004
+        assert all(isinstance(result.error, HttpRequestTimeoutError) for result in results)
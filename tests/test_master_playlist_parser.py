@@ -0,0 +1,52 @@
+"""Tests for radikoplaylist.master_playlist_parser."""
+
+from __future__ import annotations
+
+import pytest
+
+from radikoplaylist.master_playlist_parser import MasterPlaylistParser
+from radikoplaylist.master_playlist_parser import UnexpectedMasterPlaylistError
+from tests.testlibraries.instance_resource import InstanceResource
+
+CONTENT_TWO_VARIANTS = (
+    b"#EXTM3U\r\n"
+    b'#EXT-X-STREAM-INF:PROGRAM-ID=1,BANDWIDTH=52973,CODECS="mp4a.40.5"\r\n'
+    b"\r\n"
+    b"https://radiko.jp/v2/api/ts/chunklist/a.m3u8\r\n"
+    b"#EXT-X-STREAM-INF:PROGRAM-ID=1,BANDWIDTH=96000\r\n"
+    b"https://radiko.jp/v2/api/ts/chunklist/b.m3u8"
+)
+
+
+class TestMasterPlaylistParser:
+    """Tests for MasterPlaylistParser."""
+
+    @staticmethod
+    def test_iter_uris() -> None:
+        """Method iter_uris() should yield URI of each variant stream."""
+        assert list(MasterPlaylistParser.iter_uris(CONTENT_TWO_VARIANTS)) == [
+            "https://radiko.jp/v2/api/ts/chunklist/a.m3u8",
+            "https://radiko.jp/v2/api/ts/chunklist/b.m3u8",
+        ]
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "content",
+        [InstanceResource.RESPONSE_CONTENT_MASTER_PLAY_LIST, CONTENT_TWO_VARIANTS],
+    )
+    def test_same_as_m3u8(content: bytes) -> None:
+        """Fast path should return the same URL as m3u8."""
+        expected = MasterPlaylistParser.extract_media_playlist_url_by_m3u8(content)
+        assert MasterPlaylistParser.extract_media_playlist_url(content) == expected
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "content",
+        [b"https://radiko.jp/v2/api/ts/chunklist/a.m3u8", b"#EXTM3U\n#EXT-X-STREAM-INF:BANDWIDTH=1\n"],
+    )
+    def test_unexpected(content: bytes) -> None:
+        """Method iter_uris() should raise on unexpected content, then m3u8 is used."""
+        with pytest.raises(UnexpectedMasterPlaylistError):
+            list(MasterPlaylistParser.iter_uris(content))
+        with pytest.raises(IndexError):
+            MasterPlaylistParser.extract_media_playlist_url(content)
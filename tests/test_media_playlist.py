@@ -0,0 +1,126 @@
+"""Tests for radikoplaylist.media_playlist and radikoplaylist.media_playlist_client."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from radikoplaylist import MediaPlaylistClient
+from radikoplaylist.master_playlist import MasterPlaylist
+from radikoplaylist.media_playlist import MediaPlaylistParser
+from radikoplaylist.media_playlist import Segment
+from tests.testlibraries.instance_resource import InstanceResource
+
+if TYPE_CHECKING:
+    from requests_mock import Mocker
+
+URL_MEDIA_PLAYLIST = "https://radiko.jp/v2/api/ts/chunklist/Tt6TRp6b.m3u8"
+CONTENT_HEAD = (
+    b"#EXTM3U\n"
+    b"#EXT-X-VERSION:3\n"
+    b"#EXT-X-TARGETDURATION:5\n"
+    b"#EXT-X-MEDIA-SEQUENCE:10\n"
+    b"#EXT-X-PROGRAM-DATE-TIME:2020-05-18T21:57:00+09:00\n"
+    b"#EXTINF:5,\n"
+    b"segment/10.aac\n"
+    b"#EXTINF:5,\n"
+    b"https://cdn.example.com/segment/11.aac\n"
+)
+CONTENT_APPENDED = CONTENT_HEAD + b"#EXTINF:4.5,\nsegment/12.aac\n#EXT-X-ENDLIST\n"
+CONTENT_SLID = (
+    b"#EXTM3U\n"
+    b"#EXT-X-TARGETDURATION:5\n"
+    b"#EXT-X-MEDIA-SEQUENCE:11\n"
+    b"#EXTINF:5,\n"
+    b"https://cdn.example.com/segment/11.aac\n"
+    b"#EXTINF:5,\n"
+    b"segment/12.aac\n"
+)
+
+
+class TestMediaPlaylistParser:
+    """Tests for MediaPlaylistParser."""
+
+    @staticmethod
+    def test_feed() -> None:
+        """Method feed() should parse segments with media sequence and program date time."""
+        parser = MediaPlaylistParser(URL_MEDIA_PLAYLIST)
+        assert parser.feed(CONTENT_HEAD) == [
+            Segment(
+                "https://radiko.jp/v2/api/ts/chunklist/segment/10.aac",
+                5.0,
+                10,
+                "2020-05-18T21:57:00+09:00",
+            ),
+            Segment("https://cdn.example.com/segment/11.aac", 5.0, 11),
+        ]
+        assert parser.target_duration == 5  # noqa: PLR2004
+        assert not parser.end_list
+
+    @staticmethod
+    def test_feed_appended() -> None:
+        """Method feed() should process only appended lines of growing playlist."""
+        parser = MediaPlaylistParser(URL_MEDIA_PLAYLIST)
+        parser.feed(CONTENT_HEAD)
+        assert parser.feed(CONTENT_APPENDED) == [
+            Segment("https://radiko.jp/v2/api/ts/chunklist/segment/12.aac", 4.5, 12),
+        ]
+        assert parser.end_list
+
+    @staticmethod
+    def test_feed_slid() -> None:
+        """Method feed() should skip segments returned before in sliding window."""
+        parser = MediaPlaylistParser(URL_MEDIA_PLAYLIST)
+        parser.feed(CONTENT_HEAD)
+        assert [segment.media_sequence for segment in parser.feed(CONTENT_SLID)] == [12]
+
+    @staticmethod
+    def test_feed_incomplete_line() -> None:
+        """Method feed() should leave incomplete last line to the next fetch."""
+        parser = MediaPlaylistParser(URL_MEDIA_PLAYLIST)
+        assert len(parser.feed(CONTENT_HEAD[:-3], complete=False)) == 1
+        assert len(parser.feed(CONTENT_HEAD)) == 1
+
+    @staticmethod
+    def test_feed_without_last_line_break() -> None:
+        """Method feed() should parse the last line without line break of complete content."""
+        parser = MediaPlaylistParser(URL_MEDIA_PLAYLIST)
+        segments = parser.feed(b"#EXTM3U\n#EXTINF:5,\na.aac\n#EXTINF:5,\nb.aac")
+        assert [segment.uri for segment in segments] == [
+            "https://radiko.jp/v2/api/ts/chunklist/a.aac",
+            "https://radiko.jp/v2/api/ts/chunklist/b.aac",
+        ]
+        assert not parser.end_list
+        assert [segment.uri for segment in parser.feed(b"#EXTM3U\n#EXTINF:5,\na.aac\n#EXTINF:5,\nb.aac\n")] == []
+
+    @staticmethod
+    def test_feed_end_list_without_last_line_break() -> None:
+        """Method feed() should detect end list on the last line without line break."""
+        parser = MediaPlaylistParser(URL_MEDIA_PLAYLIST)
+        assert len(parser.feed(CONTENT_APPENDED.rstrip(b"\n"))) == 3  # noqa: PLR2004
+        assert parser.end_list
+
+    @staticmethod
+    def test_feed_resume_after_last_line() -> None:
+        """Method feed() should resume from the state before the last line without line break."""
+        parser = MediaPlaylistParser(URL_MEDIA_PLAYLIST)
+        assert len(parser.feed(CONTENT_HEAD.rstrip(b"\n"))) == 2  # noqa: PLR2004
+        assert parser.feed(CONTENT_APPENDED) == [
+            Segment("https://radiko.jp/v2/api/ts/chunklist/segment/12.aac", 4.5, 12),
+        ]
+        assert parser.end_list
+
+
+class TestMediaPlaylistClient:
+    """Tests for MediaPlaylistClient."""
+
+    @staticmethod
+    def test_fetch(requests_mock: Mocker) -> None:
+        """Method fetch() should return only new segments and keep all segments."""
+        requests_mock.get(URL_MEDIA_PLAYLIST, [{"content": CONTENT_HEAD}, {"content": CONTENT_APPENDED}])
+        client = MediaPlaylistClient(MasterPlaylist(URL_MEDIA_PLAYLIST, InstanceResource.HEADERS_EXAMPLE))
+        assert len(client.fetch()) == 2  # noqa: PLR2004
+        assert len(client.fetch()) == 1
+        assert [segment.media_sequence for segment in client.segments] == [10, 11, 12]
+        assert client.end_list
+        assert requests_mock.last_request is not None
+        assert requests_mock.last_request.headers["X-Radiko-AreaId"] == "JP13"
@@ -4,16 +4,21 @@ from __future__ import annotations
 
 from textwrap import dedent
 from typing import TYPE_CHECKING
+from typing import Any
 
 import pytest
 from defusedxml import ElementTree
 
 from radikoplaylist.exceptions import NoAvailableUrlError
 from radikoplaylist.playlist_create_url_getter import LivePlaylistCreateUrlGetter
+from radikoplaylist.playlist_create_url_getter import LiveUrlChecker
+from radikoplaylist.playlist_create_url_getter import PlaylistCreateUrlCandidate
 from radikoplaylist.playlist_create_url_getter import PlaylistCreateUrlGetter
 from radikoplaylist.playlist_create_url_getter import TimeFree30DayPlaylistCreateUrlGetter
 from radikoplaylist.playlist_create_url_getter import TimeFreePlaylistCreateUrlGetter
 from radikoplaylist.playlist_create_url_getter import TimeFreePlaylistCreateUrlGetterBase
+from radikoplaylist.station_stream import StationStreamClient
+from radikoplaylist.station_stream import StationStreamParser
 from tests.testlibraries.instance_resource import InstanceResource
 from tests.testlibraries.instance_resource import ParameterExpectedLivePlaylistCreateUrlString
 
@@ -22,6 +27,8 @@ if TYPE_CHECKING:
     #   https://github.com/tiran/defusedxml/issues/48#issuecomment-1511284750
     from xml.etree.ElementTree import Element  # nosec B405
 
+    from requests_mock import Mocker
+
 HTML_PLAYLIST_CREATE_URL = dedent("""\
     <?xml version="1.0"?>
     <data>
@@ -39,6 +46,29 @@ HTML_PLAYLIST_CREATE_URL_ELEMENT_TEXT_IS_NONE = dedent("""\
         <playlist_create_url></playlist_create_url>
     </data>
 """)
+# Broken after the winner to check that parsing stops early
+XML_TRUNCATED_AFTER_WINNER = dedent("""\
+    <?xml version="1.0" encoding="UTF-8" ?>
+    <urls>
+        <url areafree="0" max_delay="60" timefree="1">
+            <playlist_create_url>https://radiko.jp/v2/api/ts/playlist.m3u8</playlist_create_url>
+        </url>
+        <url areafree="1" max_delay="60" timefree="0">
+            <playlist_create_url>https://f-radiko.smartstream.ne.jp/TBS/_definst_/simul-stream.stream/playlist.m3u8</playlist_create_url>
+        </url>
+        <url areafree="1" max_delay="60" timefree="0">
+""")
+XML_LIVE_TWO_HOSTS = dedent("""\
+    <?xml version="1.0" encoding="UTF-8" ?>
+    <urls>
+        <url areafree="1" max_delay="60" timefree="0">
+            <playlist_create_url>https://f-radiko.smartstream.ne.jp/TBS/_definst_/simul-stream.stream/playlist.m3u8</playlist_create_url>
+        </url>
+        <url areafree="1" max_delay="60" timefree="0">
+            <playlist_create_url>https://radiko.jp/v2/api/ts/playlist.m3u8</playlist_create_url>
+        </url>
+    </urls>
+""")
 
 LIST_TIME_FREE_GETTER_CLASS = [TimeFreePlaylistCreateUrlGetter, TimeFree30DayPlaylistCreateUrlGetter]
 
@@ -173,6 +203,121 @@ class TestPlaylistCreateUrlGetter:
         url = getter_cls.get_playlist_create_url(xml_playlist_create_url, has_premium=True)
         assert url == "https://radiko.jp/v2/api/ts/playlist.m3u8"
 
+    @staticmethod
+    def test_live_early_exit() -> None:
+        """Method get_playlist_create_url should stop parsing at the first available URL."""
+        url = LivePlaylistCreateUrlGetter.get_playlist_create_url(XML_TRUNCATED_AFTER_WINNER)
+        assert url == "https://f-radiko.smartstream.ne.jp/TBS/_definst_/simul-stream.stream/playlist.m3u8"
+
+    @staticmethod
+    @pytest.mark.parametrize("getter_cls", LIST_TIME_FREE_GETTER_CLASS)
+    def test_time_free_early_exit(getter_cls: type[TimeFreePlaylistCreateUrlGetterBase]) -> None:
+        """Method get_playlist_create_url should stop parsing at the URL on the fastest host to download."""
+        url = getter_cls.get_playlist_create_url(XML_TRUNCATED_AFTER_WINNER)
+        assert url == "https://radiko.jp/v2/api/ts/playlist.m3u8"
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("getter_cls", "expected"),
+        [
+            (
+                LivePlaylistCreateUrlGetter,
+                "https://f-radiko.smartstream.ne.jp/TBS/_definst_/simul-stream.stream/playlist.m3u8",
+            ),
+            (TimeFreePlaylistCreateUrlGetter, "https://radiko.jp/v2/api/ts/playlist.m3u8"),
+        ],
+    )
+    def test_get_early_exit_without_cache(
+        requests_mock: Mocker,
+        monkeypatch: pytest.MonkeyPatch,
+        getter_cls: type[PlaylistCreateUrlGetter[Any]],
+        expected: str,
+    ) -> None:
+        """Method get() should stop parsing fetched XML at the winner when station stream cache is disabled."""
+        monkeypatch.setattr(PlaylistCreateUrlGetter, "station_stream_cache", None)
+        requests_mock.get(StationStreamClient.build_url("TBS"), text=XML_TRUNCATED_AFTER_WINNER)
+        assert getter_cls.get("TBS", InstanceResource.HEADERS_EXAMPLE) == expected
+
+    @staticmethod
+    @pytest.mark.parametrize("xml_playlist_create_url", ["NACK5"], indirect=True)
+    def test_rank_candidates(xml_playlist_create_url: str) -> None:
+        """Method rank_candidates should classify and rank every candidate without raising."""
+        urls = StationStreamParser.parse(xml_playlist_create_url)
+        assert TimeFreePlaylistCreateUrlGetter.rank_candidates(urls) == [
+            PlaylistCreateUrlCandidate(
+                "https://radiko.jp/v2/api/ts/playlist.m3u8",
+                areafree=False,
+                timefree=True,
+                ffmpeg_supported=True,
+                fastest=True,
+                preferred=True,
+            ),
+            PlaylistCreateUrlCandidate(
+                "https://radiko.jp/v2/api/ts/playlist.m3u8",
+                areafree=True,
+                timefree=True,
+                ffmpeg_supported=True,
+                fastest=True,
+                preferred=False,
+            ),
+            PlaylistCreateUrlCandidate(
+                "https://tf-rpaa.smartstream.ne.jp/tf/playlist.m3u8",
+                areafree=False,
+                timefree=True,
+                ffmpeg_supported=True,
+                fastest=False,
+                preferred=True,
+            ),
+            PlaylistCreateUrlCandidate(
+                "https://c-tf-rpaa.smartstream.ne.jp/tf/playlist.m3u8",
+                areafree=True,
+                timefree=True,
+                ffmpeg_supported=True,
+                fastest=False,
+                preferred=False,
+            ),
+        ]
+
+    @staticmethod
+    @pytest.mark.parametrize("xml_playlist_create_url", ["NACK5"], indirect=True)
+    def test_rank_candidates_live_unsupported_last(xml_playlist_create_url: str) -> None:
+        """Method rank_candidates should rank FFmpeg-unsupported candidates last for live."""
+        urls = StationStreamParser.parse(xml_playlist_create_url)
+        ranked = LivePlaylistCreateUrlGetter.rank_candidates(urls)
+        assert [candidate.ffmpeg_supported for candidate in ranked] == [True, False]
+        assert ranked[-1].playlist_create_url == "https://c-rpaa.smartstream.ne.jp/so/playlist.m3u8"
+
+    @staticmethod
+    def test_filter_playlist_create_urls() -> None:
+        """Method filter_playlist_create_urls should drop unsupported URLs and put the fastest host first."""
+        list_playlist_create_url = [
+            "https://c-rpaa.smartstream.ne.jp/so/playlist.m3u8",
+            "https://tf-rpaa.smartstream.ne.jp/tf/playlist.m3u8",
+            "https://radiko.jp/v2/api/ts/playlist.m3u8",
+            "https://tf-rpaa.smartstream.ne.jp/tf/playlist.m3u8",
+        ]
+        assert TimeFreePlaylistCreateUrlGetter.filter_playlist_create_urls(list_playlist_create_url) == [
+            "https://radiko.jp/v2/api/ts/playlist.m3u8",
+            "https://tf-rpaa.smartstream.ne.jp/tf/playlist.m3u8",
+        ]
+        url = LivePlaylistCreateUrlGetter.filter_playlist_create_url(list_playlist_create_url)
+        assert url == "https://tf-rpaa.smartstream.ne.jp/tf/playlist.m3u8"
+        with pytest.raises(NoAvailableUrlError, match="FFmpeg-unsupported"):
+            LivePlaylistCreateUrlGetter.filter_playlist_create_url(list_playlist_create_url[:1])
+
+    @staticmethod
+    def test_filter_url_override() -> None:
+        """Overridden filter_url should exclude URLs from selection and stop early exit on them."""
+
+        class Getter(LivePlaylistCreateUrlGetter):
+            @classmethod
+            def filter_url(cls, playlist_create_url: str, host: LiveUrlChecker) -> bool:
+                return "f-radiko" not in playlist_create_url and super().filter_url(playlist_create_url, host)
+
+        urls = StationStreamParser.parse(XML_LIVE_TWO_HOSTS)
+        assert Getter.select_playlist_create_urls(urls) == ["https://radiko.jp/v2/api/ts/playlist.m3u8"]
+        assert Getter.get_playlist_create_url(XML_LIVE_TWO_HOSTS) == "https://radiko.jp/v2/api/ts/playlist.m3u8"
+
     def test_strip_playlist_create_url(self) -> None:
         """Method strip_playlist_create_url should return appropriate URL."""
         element_url = ElementTree.fromstring(HTML_PLAYLIST_CREATE_URL, forbid_dtd=True)
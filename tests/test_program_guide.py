@@ -0,0 +1,124 @@
+"""Tests for radikoplaylist.program_guide."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from radikoplaylist import TimeFree30DayMasterPlaylistRequest
+from radikoplaylist import TimeFreeMasterPlaylistRequest
+from radikoplaylist.program_guide import Program
+from radikoplaylist.program_guide import ProgramGuideClient
+from radikoplaylist.program_guide import ProgramGuideParser
+from radikoplaylist.program_guide import ProgramIndex
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from requests_mock import Mocker
+
+PROGRAM_A = Program("TBS", 20200518210000, 20200518220000, "番組A", "出演者A", "10001", "深夜の音楽番組")
+PROGRAM_B = Program("TBS", 20200518220000, 20200518233000, "番組B", "", "10002")
+PROGRAM_C = Program("TBS", 20200518233000, 20200519010000, "番組C", "出演者C", "10003")
+PROGRAM_D = Program("QRR", 20200518210000, 20200518213000, "番組D", "出演者D", "20001")
+
+
+@pytest.fixture
+def content_area_date(resource_path_root: Path) -> bytes:
+    return (resource_path_root / "xml_program" / "20200518_JP13.xml").read_bytes()
+
+
+class TestProgramGuideParser:
+    """Tests for ProgramGuideParser."""
+
+    @staticmethod
+    def test_iterparse(content_area_date: bytes) -> None:
+        """Method iterparse() should yield programs with station of each."""
+        assert list(ProgramGuideParser.iterparse(content_area_date)) == [PROGRAM_A, PROGRAM_B, PROGRAM_C, PROGRAM_D]
+
+
+class TestProgramIndex:
+    """Tests for ProgramIndex."""
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("station_id", "time", "expected"),
+        [
+            ("TBS", 20200518210000, PROGRAM_A),
+            ("TBS", 20200518215959, PROGRAM_A),
+            ("TBS", 20200518220000, PROGRAM_B),
+            ("TBS", 20200519005959, PROGRAM_C),
+            ("TBS", 20200519010000, None),
+            ("TBS", 20200518205959, None),
+            ("QRR", 20200518213000, None),
+            ("LFR", 20200518210000, None),
+        ],
+    )
+    def test_at(station_id: str, time: int, expected: Program | None) -> None:
+        """Method at() should return program airing at time."""
+        index = ProgramIndex([PROGRAM_C, PROGRAM_A, PROGRAM_D, PROGRAM_B])
+        assert index.at(station_id, time) == expected
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("start_at", "end_at", "expected"),
+        [
+            (20200518213000, 20200518233001, [PROGRAM_A, PROGRAM_B, PROGRAM_C]),
+            (20200518220000, 20200518233000, [PROGRAM_B]),
+            (20200518000000, 20200518210000, []),
+            (20200519010000, 20200519020000, []),
+        ],
+    )
+    def test_overlapping(start_at: int, end_at: int, expected: list[Program]) -> None:
+        """Method overlapping() should return programs which overlap half-open range in order."""
+        index = ProgramIndex([PROGRAM_C, PROGRAM_A, PROGRAM_B])
+        assert index.overlapping("TBS", start_at, end_at) == expected
+
+    @staticmethod
+    def test_overlapping_long_program() -> None:
+        """Method overlapping() should find long program which starts before shorter ones."""
+        long_program = Program("TBS", 20200518200000, 20200519000000, "特番")
+        index = ProgramIndex([long_program, PROGRAM_A, PROGRAM_B])
+        assert index.overlapping("TBS", 20200518230000, 20200518230001) == [long_program, PROGRAM_B]
+
+    @staticmethod
+    def test_update() -> None:
+        """Method update() should replace program of the same start time."""
+        index = ProgramIndex([PROGRAM_A, PROGRAM_B])
+        renamed = Program("TBS", PROGRAM_A.ft, PROGRAM_A.to, "番組A'")
+        index.update([renamed, PROGRAM_D])
+        assert len(index) == 3  # noqa: PLR2004
+        assert index.station_ids == ["QRR", "TBS"]
+        assert index.at("TBS", PROGRAM_A.ft) == renamed
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("is_30_day", "expected_type"),
+        [(False, TimeFreeMasterPlaylistRequest), (True, TimeFree30DayMasterPlaylistRequest)],
+    )
+    def test_build_time_free_requests(is_30_day: bool, expected_type: type) -> None:  # noqa: FBT001
+        """Method build_time_free_requests() should build request of each overlapping program."""
+        index = ProgramIndex([PROGRAM_A, PROGRAM_B, PROGRAM_C])
+        requests = index.build_time_free_requests("TBS", 20200518213000, 20200518223000, is_30_day=is_30_day)
+        assert [type(request) for request in requests] == [expected_type] * 2
+        assert [(request.station_id, request.start_at, request.end_at) for request in requests] == [
+            ("TBS", PROGRAM_A.ft, PROGRAM_A.to),
+            ("TBS", PROGRAM_B.ft, PROGRAM_B.to),
+        ]
+
+
+class TestProgramGuideClient:
+    """Tests for ProgramGuideClient."""
+
+    @staticmethod
+    def test_get_area_date(requests_mock: Mocker, content_area_date: bytes) -> None:
+        """Method get_area_date() should fetch program XML of area and date."""
+        requests_mock.get("https://radiko.jp/v3/program/date/20200518/JP13.xml", content=content_area_date)
+        assert ProgramGuideClient.get_area_date("JP13", 20200518) == [PROGRAM_A, PROGRAM_B, PROGRAM_C, PROGRAM_D]
+
+    @staticmethod
+    def test_get_station_date(requests_mock: Mocker, content_area_date: bytes) -> None:
+        """Method get_station_date() should fetch program XML of station and date."""
+        requests_mock.get("https://radiko.jp/v3/program/station/date/20200518/TBS.xml", content=content_area_date)
+        assert len(ProgramGuideClient.get_station_date("TBS", 20200518)) == 4  # noqa: PLR2004
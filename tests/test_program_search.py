@@ -0,0 +1,109 @@
+"""Tests for radikoplaylist.program_search."""
+
+from __future__ import annotations
+
+import pytest
+
+from radikoplaylist import TimeFreeMasterPlaylistRequest
+from radikoplaylist.program_guide import Program
+from radikoplaylist.program_search import NgramTokenizer
+from radikoplaylist.program_search import ProgramFilter
+from radikoplaylist.program_search import ProgramSearchIndex
+
+# Full-width "JUNK"
+JUNK_FULL_WIDTH = "\uff2a\uff35\uff2e\uff2b"
+PROGRAM_A = Program(
+    "TBS",
+    20200518210000,
+    20200518220000,
+    JUNK_FULL_WIDTH + " 深夜の馬鹿力",
+    "伊集院光",
+    "1",
+    "トーク番組",
+)
+PROGRAM_B = Program("TBS", 20200518220000, 20200518233000, "アフター6ジャンクション", "宇多丸", "2", "カルチャー")
+PROGRAM_C = Program("QRR", 20200518210000, 20200518213000, "深夜の音楽", "", "3", "伊集院光 ゲスト回")
+PROGRAMS = [PROGRAM_A, PROGRAM_B, PROGRAM_C]
+
+
+class TestNgramTokenizer:
+    """Tests for NgramTokenizer."""
+
+    @staticmethod
+    def test_tokenize() -> None:
+        """Method tokenize() should yield overlapping n-grams of normalized text."""
+        tokenizer = NgramTokenizer()
+        assert list(tokenizer.tokenize(tokenizer.normalize(JUNK_FULL_WIDTH))) == ["ju", "un", "nk"]
+        assert list(tokenizer.tokenize("a")) == []
+
+
+class TestProgramSearchIndex:
+    """Tests for ProgramSearchIndex."""
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("query", "expected"),
+        [
+            ("伊集院光", [PROGRAM_C, PROGRAM_A]),
+            ("junk", [PROGRAM_A]),
+            ("深夜 伊集院", [PROGRAM_C, PROGRAM_A]),
+            ("深夜 宇多丸", []),
+            ("6", [PROGRAM_B]),
+            ("馬鹿力 ", [PROGRAM_A]),
+            ("力馬鹿", []),
+            ("", []),
+        ],
+    )
+    def test_search(query: str, expected: list[Program]) -> None:
+        """Method search() should return programs which contain all keywords in order of start time."""
+        assert ProgramSearchIndex(PROGRAMS).search(query) == expected
+
+    @staticmethod
+    def test_search_filters() -> None:
+        """Method search() should filter by fields, stations and range."""
+        index = ProgramSearchIndex(PROGRAMS)
+        assert index.search("伊集院光", fields=["performer"]) == [PROGRAM_A]
+        assert index.search("伊集院光", station_ids=["QRR"]) == [PROGRAM_C]
+        assert index.search("伊集院光", start_at=20200518213000) == [PROGRAM_A]
+        assert index.search("深夜", end_at=20200518210000) == []
+
+    @staticmethod
+    def test_update() -> None:
+        """Method update() should replace programs within span of refreshed guide of each station."""
+        index = ProgramSearchIndex(PROGRAMS)
+        renamed = Program("TBS", PROGRAM_A.ft, PROGRAM_A.to, "特別番組")
+        index.update([renamed, Program("TBS", PROGRAM_A.to, PROGRAM_B.to, "ニュース")])
+        assert len(index) == 3  # noqa: PLR2004
+        assert index.search("伊集院光") == [PROGRAM_C]
+        assert index.search("アフター") == []
+        assert index.search("特別") == [renamed]
+
+    @staticmethod
+    def test_build_time_free_requests() -> None:
+        """Method build_time_free_requests() should build request of each matching program."""
+        requests = ProgramSearchIndex(PROGRAMS).build_time_free_requests("伊集院光")
+        assert all(isinstance(request, TimeFreeMasterPlaylistRequest) for request in requests)
+        assert [(request.station_id, request.start_at, request.end_at) for request in requests] == [
+            ("QRR", PROGRAM_C.ft, PROGRAM_C.to),
+            ("TBS", PROGRAM_A.ft, PROGRAM_A.to),
+        ]
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("query", "program_filter", "expected"),
+        [
+            ("伊集院光", ProgramFilter(station_ids=frozenset({"TBS"})), [PROGRAM_A]),
+            ("伊集院光", ProgramFilter(fields=("performer",)), [PROGRAM_A]),
+            ("深夜", ProgramFilter(start_at=20200518213000, end_at=20200518220000), [PROGRAM_A]),
+        ],
+    )
+    def test_build_time_free_requests_filter(
+        query: str,
+        program_filter: ProgramFilter,
+        expected: list[Program],
+    ) -> None:
+        """Method build_time_free_requests() should narrow programs by program filter."""
+        requests = ProgramSearchIndex(PROGRAMS).build_time_free_requests(query, program_filter)
+        assert [(request.station_id, request.start_at, request.end_at) for request in requests] == [
+            (program.station_id, program.ft, program.to) for program in expected
+        ]
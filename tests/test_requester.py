@@ -0,0 +1,192 @@
+"""Tests for radikoplaylist.requester."""
+
+from __future__ import annotations
+
+import socket
+from io import BytesIO
+from typing import TYPE_CHECKING
+
+import pytest
+from requests import ConnectionError as RequestsConnectionError
+from requests.exceptions import ConnectTimeout
+
+from radikoplaylist.circuit_breaker import HostCircuitBreaker
+from radikoplaylist.exceptions import BadHttpStatusCodeError
+from radikoplaylist.exceptions import HttpRequestTimeoutError
+from radikoplaylist.requester import Phase
+from radikoplaylist.requester import Requester
+from radikoplaylist.requester import RetryPolicy
+from radikoplaylist.requester import SessionPool
+from radikoplaylist.segment_sink import SegmentBuffer
+from tests.testlibraries.instance_resource import InstanceResource
+
+if TYPE_CHECKING:
+    from requests_mock import Mocker
+
+RETRY_POLICY_EXAMPLE = RetryPolicy(max_attempts=3, backoff_base=0.0)
+URL_SEGMENT = "https://radiko.jp/v2/api/ts/chunklist/segment/0.aac"
+
+
+class BrokenBody(BytesIO):
+    """Body which raises error after the first bytes, as connection broken while reading body."""
+
+    def __init__(self, error: OSError) -> None:
+        super().__init__(b"broken")
+        self.error = error
+
+    def read(self, size: int | None = -1) -> bytes:
+        if self.tell():
+            raise self.error
+        return super().read(1 if size is None or size < 0 else min(size, 1))
+
+
+class TestSessionPool:
+    """Tests for SessionPool."""
+
+    @staticmethod
+    def test_session_is_reused() -> None:
+        """Property session should return the same session until it is closed."""
+        session_pool = SessionPool()
+        session = session_pool.session
+        assert session_pool.session is session
+        session_pool.close()
+        assert session_pool.session is not session
+
+    @staticmethod
+    def test_session_is_recreated_after_fork(monkeypatch: pytest.MonkeyPatch) -> None:
+        """Property session should not reuse the session created in another process."""
+        session_pool = SessionPool()
+        session = session_pool.session
+        monkeypatch.setattr("os.getpid", lambda: -1)
+        assert session_pool.session is not session
+
+    @staticmethod
+    def test_reset() -> None:
+        """Method reset() should drop the session without closing it."""
+        session_pool = SessionPool()
+        session = session_pool.session
+        session_pool.reset()
+        assert session_pool.session is not session
+
+    @staticmethod
+    def test_configure() -> None:
+        """Method configure() should apply connection pool settings to the next session."""
+        session_pool = SessionPool()
+        session_pool.configure(pool_connections=2, pool_maxsize=20, pool_block=True)
+        adapter = session_pool.session.get_adapter("https://radiko.jp/")
+        # Reason: These attributes are not exposed in public API of HTTPAdapter.
+        assert adapter._pool_connections == 2  # type: ignore[attr-defined]  # noqa: PLR2004 SLF001  # pylint: disable=protected-access
+        assert adapter._pool_maxsize == 20  # type: ignore[attr-defined]  # noqa: PLR2004 SLF001  # pylint: disable=protected-access
+        assert adapter._pool_block is True  # type: ignore[attr-defined]  # noqa: SLF001  # pylint: disable=protected-access
+
+
+class TestRequester:
+    """Tests for Requester."""
+
+    @staticmethod
+    def test_cookie_is_not_shared(requests_mock: Mocker) -> None:
+        """Method get() should not persist cookies in the shared session."""
+        requests_mock.get(InstanceResource.URL_RADIKO_AUTH_2, headers={"Set-Cookie": "a_exp=1; Domain=radiko.jp"})
+        Requester.get(InstanceResource.URL_RADIKO_AUTH_2, InstanceResource.HEADERS_EXAMPLE)
+        assert len(Requester.session_pool.session.cookies) == 0
+
+
+class TestRetryPolicy:
+    """Tests for RetryPolicy."""
+
+    @staticmethod
+    @pytest.mark.parametrize("attempt", [1, 2, 3, 10])
+    def test_compute_backoff(attempt: int) -> None:
+        """Method compute_backoff() should be capped exponential backoff with jitter."""
+        policy = RetryPolicy(backoff_base=0.5, backoff_max=2.0)
+        assert 0.0 <= policy.compute_backoff(attempt) <= min(2.0, 0.5 * 2 ** (attempt - 1))
+
+    @staticmethod
+    def test_can_retry() -> None:
+        """Method can_retry() should respect max attempts and total time budget."""
+        policy = RetryPolicy(max_attempts=3, total_timeout=10.0)
+        assert policy.can_retry(2, 5.0, 1.0)
+        assert not policy.can_retry(3, 0.0, 0.0)
+        assert not policy.can_retry(1, 9.5, 1.0)
+
+
+class TestRequesterRetry:
+    """Tests for retry of Requester."""
+
+    @staticmethod
+    def test_retry_status_code(requests_mock: Mocker, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Method get() should retry retryable status code by policy of phase."""
+        monkeypatch.setattr(Requester, "retry_policies", {Phase.AUTH2: RETRY_POLICY_EXAMPLE})
+        requests_mock.get(InstanceResource.URL_RADIKO_AUTH_2, [{"status_code": 503}, {"status_code": 200}])
+        Requester.get(InstanceResource.URL_RADIKO_AUTH_2, InstanceResource.HEADERS_EXAMPLE, phase=Phase.AUTH2)
+        assert requests_mock.call_count == 2  # noqa: PLR2004
+
+    @staticmethod
+    def test_retry_timeout(requests_mock: Mocker, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Method get() should raise after max attempts."""
+        monkeypatch.setattr(Requester, "retry_policies", {Phase.AUTH1: RETRY_POLICY_EXAMPLE})
+        requests_mock.get(InstanceResource.URL_RADIKO_AUTH_1, exc=ConnectTimeout)
+        with pytest.raises(HttpRequestTimeoutError):
+            Requester.get(InstanceResource.URL_RADIKO_AUTH_1, InstanceResource.HEADERS_EXAMPLE, phase=Phase.AUTH1)
+        assert requests_mock.call_count == 3  # noqa: PLR2004
+
+    @staticmethod
+    def test_not_retry(requests_mock: Mocker, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Method get() should not retry status code which is not retryable nor other phase."""
+        monkeypatch.setattr(Requester, "retry_policies", {Phase.AUTH2: RETRY_POLICY_EXAMPLE})
+        requests_mock.get(InstanceResource.URL_RADIKO_AUTH_2, status_code=404)
+        requests_mock.get(InstanceResource.URL_RADIKO_AUTH_1, status_code=503)
+        with pytest.raises(BadHttpStatusCodeError):
+            Requester.get(InstanceResource.URL_RADIKO_AUTH_2, InstanceResource.HEADERS_EXAMPLE, phase=Phase.AUTH2)
+        with pytest.raises(BadHttpStatusCodeError):
+            Requester.get(InstanceResource.URL_RADIKO_AUTH_1, InstanceResource.HEADERS_EXAMPLE, phase=Phase.AUTH1)
+        assert requests_mock.call_count == 2  # noqa: PLR2004
+
+
+class TestRequesterGetBody:
+    """Tests for Requester.get_body()."""
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("error", "expected"),
+        [
+            (socket.timeout("timed out"), HttpRequestTimeoutError),
+            (ConnectionResetError("reset"), RequestsConnectionError),
+        ],
+    )
+    def test_retry_body(
+        requests_mock: Mocker,
+        monkeypatch: pytest.MonkeyPatch,
+        error: OSError,
+        expected: type[Exception],
+    ) -> None:
+        """Method get_body() should retry error while reading body and record it to circuit breaker."""
+        monkeypatch.setattr(Requester, "retry_policies", {Phase.SEGMENT: RETRY_POLICY_EXAMPLE})
+        circuit_breaker = HostCircuitBreaker(failure_threshold=3)
+        monkeypatch.setattr(Requester, "circuit_breaker", circuit_breaker)
+        requests_mock.get(URL_SEGMENT, [{"body": BrokenBody(error)}, {"content": b"segment"}])
+        buffer = SegmentBuffer()
+        assert Requester.get_body(URL_SEGMENT, {}, buffer.read_from, phase=Phase.SEGMENT) == len(b"segment")
+        with buffer.view() as view:
+            assert view.tobytes() == b"segment"
+        assert requests_mock.call_count == 2  # noqa: PLR2004
+        requests_mock.get(URL_SEGMENT, [{"body": BrokenBody(error)} for _ in range(3)])
+        with pytest.raises(expected):
+            Requester.get_body(URL_SEGMENT, {}, buffer.read_from, phase=Phase.SEGMENT)
+        assert circuit_breaker.is_open(URL_SEGMENT)
+
+    @staticmethod
+    def test_retry_truncated_body(requests_mock: Mocker, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Method get_body() should retry body shorter than Content-Length and record it to circuit breaker."""
+        monkeypatch.setattr(Requester, "retry_policies", {Phase.SEGMENT: RETRY_POLICY_EXAMPLE})
+        circuit_breaker = HostCircuitBreaker(failure_threshold=1)
+        monkeypatch.setattr(Requester, "circuit_breaker", circuit_breaker)
+        truncated = {"content": b"seg", "headers": {"Content-Length": str(len(b"segment"))}}
+        requests_mock.get(URL_SEGMENT, [truncated, {"content": b"segment"}])
+        buffer = SegmentBuffer()
+        assert Requester.get_body(URL_SEGMENT, {}, buffer.read_from, phase=Phase.SEGMENT) == len(b"segment")
+        assert requests_mock.call_count == 2  # noqa: PLR2004
+        requests_mock.get(URL_SEGMENT, [truncated for _ in range(3)])
+        with pytest.raises(RequestsConnectionError):
+            Requester.get_body(URL_SEGMENT, {}, buffer.read_from, phase=Phase.SEGMENT)
+        assert circuit_breaker.is_open(URL_SEGMENT)
@@ -0,0 +1,131 @@
+"""Tests for radikoplaylist.resumable_download."""
+
+from __future__ import annotations
+
+import re
+import zlib
+from typing import TYPE_CHECKING
+
+import pytest
+from requests.exceptions import ConnectionError as RequestsConnectionError
+
+from radikoplaylist import TimeFreeMasterPlaylistRequest
+from radikoplaylist.exceptions import BadHttpStatusCodeError
+from radikoplaylist.resumable_download import ResumableDownloader
+from radikoplaylist.resumable_download import SegmentCheckpoint
+from radikoplaylist.resumable_download import SegmentJournal
+from tests.testlibraries.instance_resource import InstanceResource
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from requests_mock import Mocker
+
+URL_CHUNKLIST = "https://radiko.jp/v2/api/ts/chunklist/Tt6TRp6b.m3u8"
+NUMBER_OF_SEGMENTS = 6
+
+
+def url_segment(index: int) -> str:
+    return f"https://radiko.jp/v2/api/ts/chunklist/segment/{index}.aac"
+
+
+def mock_program(requests_mock: Mocker) -> None:
+    requests_mock.get(
+        re.compile(r"https://[^/]+/v2/api/ts/playlist\.m3u8"),
+        content=InstanceResource.RESPONSE_CONTENT_MASTER_PLAY_LIST,
+    )
+    lines = [b"#EXTM3U", b"#EXT-X-TARGETDURATION:5", b"#EXT-X-MEDIA-SEQUENCE:0"]
+    for index in range(NUMBER_OF_SEGMENTS):
+        lines += [b"#EXTINF:5,", b"segment/%d.aac" % index]
+    lines.append(b"#EXT-X-ENDLIST")
+    requests_mock.get(URL_CHUNKLIST, content=b"\n".join(lines) + b"\n")
+    for index in range(NUMBER_OF_SEGMENTS):
+        requests_mock.get(url_segment(index), content=b"<%d>" % index)
+
+
+def create_checkpoint(index: int, offset: int, content: bytes) -> SegmentCheckpoint:
+    return SegmentCheckpoint(index, offset, len(content), zlib.crc32(content))
+
+
+class TestSegmentJournal:
+    """Tests for SegmentJournal."""
+
+    @staticmethod
+    def test_load(tmp_path: Path) -> None:
+        """Method load() should return appended checkpoints, ignoring record being written."""
+        path = tmp_path / "program.aac.journal"
+        checkpoints = [create_checkpoint(0, 0, b"abc"), create_checkpoint(1, 3, b"de")]
+        journal = SegmentJournal(path, "key")
+        journal.open(checkpoints[:1])
+        journal.append(checkpoints[1])
+        journal.close()
+        with path.open("ab") as file:
+            file.write(b"\x00" * (SegmentJournal.RECORD.size - 1))
+        assert SegmentJournal(path, "key").load() == checkpoints
+        assert SegmentJournal(path, "other").load() == []
+        assert SegmentJournal(tmp_path / "missing", "key").load() == []
+
+    @staticmethod
+    def test_load_verified(tmp_path: Path) -> None:
+        """Method load_verified() should stop at checkpoint which doesn't match output."""
+        path = tmp_path / "program.aac"
+        path.write_bytes(b"abcdeXY")
+        journal = SegmentJournal(tmp_path / "program.aac.journal", "key")
+        checkpoints = [create_checkpoint(0, 0, b"abc"), create_checkpoint(1, 3, b"de"), create_checkpoint(2, 5, b"fg")]
+        journal.open(checkpoints)
+        journal.close()
+        assert journal.load_verified(path) == checkpoints[:2]
+        path.unlink()
+        assert journal.load_verified(path) == []
+
+
+class TestResumableDownloader:
+    """Tests for ResumableDownloader."""
+
+    @staticmethod
+    @pytest.mark.usefixtures("mock_auth_1", "mock_auth_2", "mock_get_playlist_create_url")
+    @pytest.mark.parametrize("mock_get_playlist_create_url", ["NACK5"], indirect=True)
+    def test_resume(requests_mock: Mocker, tmp_path: Path) -> None:
+        """Method download() should download only segments missing after failure and remove journal."""
+        mock_program(requests_mock)
+        requests_mock.get(url_segment(3), status_code=404)
+        path = tmp_path / "program.aac"
+        request = TimeFreeMasterPlaylistRequest("NACK5", 20200518215700, 20200518220000)
+        downloader = ResumableDownloader(request, path, max_workers=1)
+        with pytest.raises(BadHttpStatusCodeError):
+            downloader.download()
+        assert path.read_bytes() == b"<0><1><2>"
+        assert downloader.path_journal.is_file()
+        mock_program(requests_mock)
+        requests_mock.reset_mock()
+        expected = b"".join(b"<%d>" % index for index in range(NUMBER_OF_SEGMENTS))
+        assert ResumableDownloader(request, path).download() == len(expected)
+        assert path.read_bytes() == expected
+        assert not downloader.path_journal.exists()
+        urls = {history.url for history in requests_mock.request_history}
+        assert urls.isdisjoint({url_segment(index) for index in range(3)})
+        assert URL_CHUNKLIST in urls
+
+    @staticmethod
+    @pytest.mark.usefixtures("mock_auth_1", "mock_auth_2", "mock_get_playlist_create_url")
+    @pytest.mark.parametrize("mock_get_playlist_create_url", ["NACK5"], indirect=True)
+    def test_resume_truncated_segment(requests_mock: Mocker, tmp_path: Path) -> None:
+        """Segment shorter than Content-Length should be neither written nor journaled, so resume downloads it."""
+        mock_program(requests_mock)
+        requests_mock.get(url_segment(3), content=b"<3", headers={"Content-Length": "3"})
+        path = tmp_path / "program.aac"
+        request = TimeFreeMasterPlaylistRequest("NACK5", 20200518215700, 20200518220000)
+        downloader = ResumableDownloader(request, path, max_workers=1)
+        with pytest.raises(RequestsConnectionError):
+            downloader.download()
+        assert path.read_bytes() == b"<0><1><2>"
+        journal = SegmentJournal(downloader.path_journal, downloader.build_key(NUMBER_OF_SEGMENTS))
+        assert [checkpoint.index for checkpoint in journal.load_verified(path)] == [0, 1, 2]
+        mock_program(requests_mock)
+        requests_mock.reset_mock()
+        expected = b"".join(b"<%d>" % index for index in range(NUMBER_OF_SEGMENTS))
+        assert ResumableDownloader(request, path).download() == len(expected)
+        assert path.read_bytes() == expected
+        urls = {history.url for history in requests_mock.request_history}
+        assert url_segment(3) in urls
+        assert urls.isdisjoint({url_segment(index) for index in range(3)})
@@ -0,0 +1,107 @@
+"""Tests for radikoplaylist.segment_downloader."""
+
+from __future__ import annotations
+
+from io import BytesIO
+from typing import TYPE_CHECKING
+
+import pytest
+
+from radikoplaylist import SegmentDownloader
+from radikoplaylist.exceptions import BadHttpStatusCodeError
+from radikoplaylist.master_playlist import MasterPlaylist
+from radikoplaylist.segment_sink import FileSegmentSink
+from tests.testlibraries.instance_resource import InstanceResource
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from requests_mock import Mocker
+
+URL_MEDIA_PLAYLIST = "https://radiko.jp/v2/api/ts/chunklist/Tt6TRp6b.m3u8"
+NUMBER_OF_SEGMENTS = 20
+
+
+def create_content(count: int, *, end_list: bool = True) -> bytes:
+    lines = [b"#EXTM3U", b"#EXT-X-TARGETDURATION:5", b"#EXT-X-MEDIA-SEQUENCE:0"]
+    for sequence in range(count):
+        lines += [b"#EXTINF:5,", b"segment/%d.aac" % sequence]
+    if end_list:
+        lines.append(b"#EXT-X-ENDLIST")
+    return b"\n".join(lines) + b"\n"
+
+
+def mock_segments(requests_mock: Mocker, count: int) -> None:
+    for sequence in range(count):
+        requests_mock.get(
+            f"https://radiko.jp/v2/api/ts/chunklist/segment/{sequence}.aac",
+            content=b"<%d>" % sequence,
+        )
+
+
+def create_master_playlist() -> MasterPlaylist:
+    return MasterPlaylist(URL_MEDIA_PLAYLIST, InstanceResource.HEADERS_EXAMPLE)
+
+
+class TestSegmentDownloader:
+    """Tests for SegmentDownloader."""
+
+    @staticmethod
+    @pytest.mark.parametrize("max_in_flight", [None, 1, 3])
+    def test_download(requests_mock: Mocker, max_in_flight: int | None) -> None:
+        """Method download() should write all segments in order of media playlist."""
+        requests_mock.get(URL_MEDIA_PLAYLIST, content=create_content(NUMBER_OF_SEGMENTS))
+        mock_segments(requests_mock, NUMBER_OF_SEGMENTS)
+        output = BytesIO()
+        downloader = SegmentDownloader(create_master_playlist(), max_workers=4, max_in_flight=max_in_flight)
+        expected = b"".join(b"<%d>" % sequence for sequence in range(NUMBER_OF_SEGMENTS))
+        assert downloader.download(output) == len(expected)
+        assert output.getvalue() == expected
+        segment_requests = [request for request in requests_mock.request_history if request.url.endswith(".aac")]
+        assert all(request.headers["X-Radiko-AreaId"] == "JP13" for request in segment_requests)
+
+    @staticmethod
+    def test_download_to_sink(requests_mock: Mocker, tmp_path: Path) -> None:
+        """Method download() should write views of reused buffers to segment sink."""
+        requests_mock.get(URL_MEDIA_PLAYLIST, content=create_content(NUMBER_OF_SEGMENTS))
+        mock_segments(requests_mock, NUMBER_OF_SEGMENTS)
+        path = tmp_path / "program.aac"
+        downloader = SegmentDownloader(create_master_playlist(), max_workers=2, max_in_flight=2, buffer_capacity=1)
+        with FileSegmentSink(path, preallocate=1024, fsync_bytes=16) as sink:
+            downloader.download(sink)
+        assert path.read_bytes() == b"".join(b"<%d>" % sequence for sequence in range(NUMBER_OF_SEGMENTS))
+
+    @staticmethod
+    def test_list_segments_until_no_more_segment(requests_mock: Mocker) -> None:
+        """Method list_segments() should re-fetch media playlist without #EXT-X-ENDLIST until it stops growing."""
+        requests_mock.get(
+            URL_MEDIA_PLAYLIST,
+            [
+                {"content": create_content(2, end_list=False)},
+                {"content": create_content(3, end_list=False)},
+                {"content": create_content(3, end_list=False)},
+            ],
+        )
+        segments = SegmentDownloader(create_master_playlist()).list_segments()
+        assert [segment.media_sequence for segment in segments] == [0, 1, 2]
+        assert requests_mock.call_count == 3  # noqa: PLR2004
+
+    @staticmethod
+    @pytest.mark.parametrize("end_list", [True, False])
+    def test_list_segments_without_last_line_break(requests_mock: Mocker, *, end_list: bool) -> None:
+        """Method list_segments() should list the last segment and stop on end list without trailing line break."""
+        requests_mock.get(URL_MEDIA_PLAYLIST, content=create_content(3, end_list=end_list).rstrip(b"\n"))
+        segments = SegmentDownloader(create_master_playlist()).list_segments()
+        assert [segment.media_sequence for segment in segments] == [0, 1, 2]
+        assert requests_mock.call_count == (1 if end_list else 2)
+
+    @staticmethod
+    def test_download_error(requests_mock: Mocker) -> None:
+        """Method download() should raise error of segment after writing segments before it."""
+        requests_mock.get(URL_MEDIA_PLAYLIST, content=create_content(NUMBER_OF_SEGMENTS))
+        mock_segments(requests_mock, NUMBER_OF_SEGMENTS)
+        requests_mock.get("https://radiko.jp/v2/api/ts/chunklist/segment/2.aac", status_code=404)
+        output = BytesIO()
+        with pytest.raises(BadHttpStatusCodeError):
+            SegmentDownloader(create_master_playlist(), max_workers=1, max_in_flight=1).download(output)
+        assert output.getvalue() == b"<0><1>"
@@ -0,0 +1,154 @@
+"""Tests for radikoplaylist.segment_sink."""
+
+from __future__ import annotations
+
+from http.client import HTTPResponse
+from http.client import IncompleteRead
+from io import BytesIO
+from typing import TYPE_CHECKING
+
+import pytest
+import requests
+import urllib3
+from requests.structures import CaseInsensitiveDict
+
+from radikoplaylist.segment_sink import FileSegmentSink
+from radikoplaylist.segment_sink import SegmentBuffer
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from requests_mock import Mocker
+
+URL_SEGMENT = "https://radiko.jp/v2/api/ts/chunklist/segment/0.aac"
+
+
+class FakeSocket:
+    """Socket which http.client.HTTPResponse reads bytes received from."""
+
+    def __init__(self, received: bytes) -> None:
+        self.received = received
+
+    def makefile(self, *_args: object, **_kwargs: object) -> BytesIO:
+        return BytesIO(self.received)
+
+
+def create_response(head: bytes, body: bytes) -> requests.Response:
+    """Create streamed response over http.client.HTTPResponse as HTTPAdapter does."""
+    # Reason: Only makefile() is used by http.client.HTTPResponse
+    http_response = HTTPResponse(FakeSocket(head + b"\r\n" + body))  # type: ignore[arg-type]
+    http_response.begin()
+    response = requests.Response()
+    response.status_code = http_response.status
+    response.headers = CaseInsensitiveDict(http_response.getheaders())
+    response.raw = urllib3.HTTPResponse(
+        body=http_response,
+        headers=response.headers,
+        status=http_response.status,
+        preload_content=False,
+        original_response=http_response,
+    )
+    return response
+
+
+class TestSegmentBuffer:
+    """Tests for SegmentBuffer."""
+
+    @staticmethod
+    @pytest.mark.parametrize("headers", [{}, {"Content-Length": "1000"}])
+    def test_read_from(requests_mock: Mocker, headers: dict[str, str]) -> None:
+        """Method read_from() should read whole body, growing the buffer when it doesn't fit."""
+        body = bytes(range(250)) * 4
+        requests_mock.get(URL_SEGMENT, content=body, headers=headers)
+        buffer = SegmentBuffer(16)
+        with requests.get(URL_SEGMENT, stream=True, timeout=1) as response:
+            assert buffer.read_from(response) == len(body)
+        with buffer.view() as view:
+            assert view == body
+
+    @staticmethod
+    def test_read_from_reuse(requests_mock: Mocker) -> None:
+        """Method read_from() should keep capacity and replace the body read before."""
+        requests_mock.get(URL_SEGMENT, [{"content": b"a" * 100}, {"content": b"b" * 10}])
+        buffer = SegmentBuffer(1)
+        for _ in range(2):
+            with requests.get(URL_SEGMENT, stream=True, timeout=1) as response:
+                buffer.read_from(response)
+        with buffer.view() as view:
+            assert view == b"b" * 10
+        assert buffer.capacity >= 100  # noqa: PLR2004
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("head", "body"),
+        [
+            (b"HTTP/1.1 200 OK\r\nContent-Length: 1000\r\n", bytes(range(250)) * 4),
+            (
+                b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n",
+                b"fa\r\n" + bytes(range(250)) + b"\r\n2ee\r\n" + bytes(range(250)) * 3 + b"\r\n0\r\n\r\n",
+            ),
+        ],
+        ids=["content_length", "chunked"],
+    )
+    def test_read_from_http_response(monkeypatch: pytest.MonkeyPatch, head: bytes, body: bytes) -> None:
+        """Method read_from() should read into buffer from http.client directly and release connection."""
+        released = []
+
+        def release_conn(raw: urllib3.HTTPResponse) -> None:
+            released.append(raw)
+
+        monkeypatch.setattr(urllib3.HTTPResponse, "readinto", pytest.fail)
+        monkeypatch.setattr(urllib3.HTTPResponse, "release_conn", release_conn)
+        response = create_response(head, body)
+        buffer = SegmentBuffer(16)
+        assert buffer.read_from(response) == 1000  # noqa: PLR2004
+        with buffer.view() as view:
+            assert view == bytes(range(250)) * 4
+        assert released == [response.raw]
+
+    @staticmethod
+    def test_read_from_truncated() -> None:
+        """Method read_from() should raise IncompleteRead when connection closes before Content-Length."""
+        response = create_response(b"HTTP/1.1 200 OK\r\nContent-Length: 1000\r\n", bytes(range(250)) * 2)
+        with pytest.raises(IncompleteRead, match="500 bytes read, 500 more expected"):
+            SegmentBuffer(16).read_from(response)
+
+    @staticmethod
+    def test_read_from_unknown_urllib3(monkeypatch: pytest.MonkeyPatch) -> None:
+        """Method read_from() should read by urllib3 when private attribute of its version is unknown."""
+        monkeypatch.setattr(urllib3, "__version__", "3.0.0")
+        response = create_response(b"HTTP/1.1 200 OK\r\nContent-Length: 1000\r\n", bytes(range(250)) * 4)
+        assert SegmentBuffer.get_http_response(response) is None
+        assert SegmentBuffer(16).read_from(response) == 1000  # noqa: PLR2004
+
+
+class TestFileSegmentSink:
+    """Tests for FileSegmentSink."""
+
+    @staticmethod
+    def test_write(tmp_path: Path) -> None:
+        """Method write() should append data and close() should truncate preallocated file to written size."""
+        path = tmp_path / "program.aac"
+        with FileSegmentSink(path, preallocate=1024) as sink:
+            assert sink.write(memoryview(b"abc")) == 3  # noqa: PLR2004
+            sink.write(memoryview(bytearray(b"def"))[1:])
+        assert path.read_bytes() == b"abcef"
+
+    @staticmethod
+    def test_fsync_bytes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Method write() should call fsync() each time fsync_bytes are written since the last one."""
+        synced: list[int] = []
+        monkeypatch.setattr("os.fsync", synced.append)
+        with FileSegmentSink(tmp_path / "program.aac", fsync_bytes=4) as sink:
+            for _ in range(5):
+                sink.write(memoryview(b"ab"))
+            assert len(synced) == 2  # noqa: PLR2004
+        assert len(synced) == 3  # noqa: PLR2004
+
+    @staticmethod
+    def test_write_after_close(tmp_path: Path) -> None:
+        """Method write() should raise ValueError after close()."""
+        sink = FileSegmentSink(tmp_path / "program.aac")
+        sink.close()
+        with pytest.raises(ValueError, match="closed"):
+            sink.write(memoryview(b"abc"))
@@ -0,0 +1,198 @@
+"""Tests for radikoplaylist.station_catalog."""
+
+from __future__ import annotations
+
+import re
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from radikoplaylist import LiveMasterPlaylistRequest
+from radikoplaylist import MasterPlaylistClient
+from radikoplaylist.authorization import Authorization
+from radikoplaylist.exceptions import BadHttpStatusCodeError
+from radikoplaylist.station_catalog import StationCatalog
+from radikoplaylist.station_catalog import StationListParser
+from tests.testlibraries.instance_resource import InstanceResource
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from requests_mock import Mocker
+
+STATION_LISTS = {
+    "JP11": ["TBS", "QRR", "NACK5"],
+    "JP13": ["TBS", "QRR", "LFR"],
+    "JP14": ["TBS", "QRR", "YFM"],
+    "JP27": ["OBC"],
+}
+
+
+def create_station_list(area_id: str, station_ids: list[str]) -> bytes:
+    stations = "".join(
+        f"<station><id>{station_id}</id><name>{station_id}</name><areafree>1</areafree><timefree>1</timefree>"
+        f'<logo width="224" height="100">https://radiko.jp/v2/static/station/logo/{station_id}/224x100.png</logo>'
+        "</station>"
+        for station_id in station_ids
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><stations area_id="{area_id}">{stations}</stations>'.encode()
+
+
+def mock_station_lists(requests_mock: Mocker) -> None:
+    for area_id, station_ids in STATION_LISTS.items():
+        requests_mock.get(StationCatalog.build_url(area_id), content=create_station_list(area_id, station_ids))
+
+
+def create_catalog() -> StationCatalog:
+    return StationCatalog(area_ids=STATION_LISTS)
+
+
+def count_station_list_requests(requests_mock: Mocker) -> int:
+    return sum(request.url.startswith(StationCatalog.URL_STATION_LIST) for request in requests_mock.request_history)
+
+
+def get_auth_1_area_ids(requests_mock: Mocker) -> list[str]:
+    return [
+        request.headers["X-Radiko-AreaId"]
+        for request in requests_mock.request_history
+        if request.url == InstanceResource.URL_RADIKO_AUTH_1
+    ]
+
+
+class TestStationListParser:
+    """Tests for StationListParser."""
+
+    @staticmethod
+    def test_iterparse() -> None:
+        """Method iterparse() should yield station IDs in order."""
+        assert list(StationListParser.iterparse(create_station_list("JP13", STATION_LISTS["JP13"]))) == [
+            "TBS",
+            "QRR",
+            "LFR",
+        ]
+
+
+class TestStationCatalog:
+    """Tests for StationCatalog."""
+
+    @staticmethod
+    def test_get_area_ids(requests_mock: Mocker) -> None:
+        """Method get_area_ids() should return areas of station in order of area_ids and fetch only once."""
+        mock_station_lists(requests_mock)
+        catalog = create_catalog()
+        assert catalog.get_area_ids("TBS") == ("JP11", "JP13", "JP14")
+        assert catalog.get_area_ids("OBC") == ("JP27",)
+        assert catalog.get_area_ids("UNKNOWN") == ()
+        assert catalog.get_station_ids("JP14") == ("TBS", "QRR", "YFM")
+        assert requests_mock.call_count == len(STATION_LISTS)
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("station_id", "preferred", "expected"),
+        [("TBS", "JP13", "JP13"), ("YFM", "JP13", "JP14"), ("OBC", "JP13", "JP27"), ("UNKNOWN", "JP13", "JP13")],
+    )
+    def test_select_area_id(requests_mock: Mocker, station_id: str, preferred: str, expected: str) -> None:
+        """Method select_area_id() should keep preferred area only when station is available in it."""
+        mock_station_lists(requests_mock)
+        assert create_catalog().select_area_id(station_id, preferred) == expected
+
+    @staticmethod
+    def test_group_by_area(requests_mock: Mocker) -> None:
+        """Method group_by_area() should cover stations by preferred area and then by fewest areas."""
+        mock_station_lists(requests_mock)
+        groups = create_catalog().group_by_area(["YFM", "TBS", "NACK5", "OBC", "LFR", "UNKNOWN", "TBS"], "JP27")
+        assert groups == {"JP27": ["OBC", "UNKNOWN"], "JP11": ["TBS", "NACK5"], "JP13": ["LFR"], "JP14": ["YFM"]}
+
+    @staticmethod
+    def test_refresh_partial_failure(requests_mock: Mocker) -> None:
+        """Method refresh() should keep going when some areas fail and raise when all areas fail."""
+        mock_station_lists(requests_mock)
+        requests_mock.get(StationCatalog.build_url("JP27"), status_code=503)
+        catalog = create_catalog()
+        assert catalog.get_area_ids("OBC") == ()
+        assert catalog.get_area_ids("YFM") == ("JP14",)
+        for area_id in STATION_LISTS:
+            requests_mock.get(StationCatalog.build_url(area_id), status_code=503)
+        with pytest.raises(BadHttpStatusCodeError):
+            catalog.refresh()
+
+    @staticmethod
+    def test_serve_stale_on_failure(requests_mock: Mocker, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Lookups should serve previous station lists and wait retry interval when all areas failed."""
+        now = [1000.0]
+        monkeypatch.setattr(time, "monotonic", lambda: now[0])
+        mock_station_lists(requests_mock)
+        catalog = StationCatalog(area_ids=STATION_LISTS, ttl=100.0, retry_interval=10.0)
+        assert catalog.get_area_ids("YFM") == ("JP14",)
+        for area_id in STATION_LISTS:
+            requests_mock.get(StationCatalog.build_url(area_id), status_code=503)
+        requests_mock.reset_mock()
+        now[0] += 100.0
+        assert catalog.get_area_ids("YFM") == ("JP14",)
+        assert catalog.select_area_id("OBC") == "JP27"
+        assert count_station_list_requests(requests_mock) == len(STATION_LISTS)
+        now[0] += 10.0
+        assert catalog.get_area_ids("YFM") == ("JP14",)
+        assert count_station_list_requests(requests_mock) == len(STATION_LISTS) * 2
+
+    @staticmethod
+    def test_failure_without_station_lists(requests_mock: Mocker) -> None:
+        """Lookups should raise error of the last refresh without fetching again until retry interval passes."""
+        for area_id in STATION_LISTS:
+            requests_mock.get(StationCatalog.build_url(area_id), status_code=503)
+        catalog = create_catalog()
+        for _ in range(2):
+            with pytest.raises(BadHttpStatusCodeError):
+                catalog.get_area_ids("YFM")
+        assert count_station_list_requests(requests_mock) == len(STATION_LISTS)
+
+
+class TestAreaSelection:
+    """Tests for area selection by station catalog."""
+
+    @staticmethod
+    def test_authorization_for_station(requests_mock: Mocker) -> None:
+        """Method for_station() should select area unless radiko_session is provided."""
+        mock_station_lists(requests_mock)
+        catalog = create_catalog()
+        headers = Authorization.for_station("YFM", catalog)._headers  # noqa: SLF001
+        assert headers["X-Radiko-AreaId"] == "JP14"
+        headers = Authorization.for_station("YFM", catalog, radiko_session="session")._headers  # noqa: SLF001
+        assert headers["X-Radiko-AreaId"] == "JP13"
+
+    @staticmethod
+    @pytest.mark.usefixtures("mock_auth_1", "mock_auth_2")
+    def test_master_playlist_client(
+        requests_mock: Mocker,
+        resource_path_root: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Methods get() and get_many() should authenticate for area where each station is available."""
+        mock_station_lists(requests_mock)
+        monkeypatch.setattr(MasterPlaylistClient, "station_catalog", create_catalog())
+        for station in ["TBS", "NACK5", "YFM"]:
+            requests_mock.get(
+                InstanceResource.URL_RADIKO_STREAM_PC_HTML_5 + station + ".xml",
+                text=(resource_path_root / "xml_playlist_create_url" / (station + ".xml")).read_text(),
+            )
+        requests_mock.get(re.compile(r"/playlist\.m3u8"), content=InstanceResource.RESPONSE_CONTENT_MASTER_PLAY_LIST)
+        MasterPlaylistClient.get(LiveMasterPlaylistRequest("YFM"))
+        assert get_auth_1_area_ids(requests_mock) == ["JP14"]
+        requests_mock.reset_mock()
+        results = list(
+            MasterPlaylistClient.get_many(LiveMasterPlaylistRequest(station) for station in ["TBS", "NACK5", "YFM"]),
+        )
+        assert all(result.master_playlist is not None for result in results)
+        # JP14 is cached by get()
+        assert sorted(get_auth_1_area_ids(requests_mock)) == ["JP11", "JP13"]
+
+    @staticmethod
+    def test_master_playlist_client_catalog_failure(requests_mock: Mocker, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Method get_many() should yield error of station catalog for each request instead of raising."""
+        for area_id in STATION_LISTS:
+            requests_mock.get(StationCatalog.build_url(area_id), status_code=503)
+        monkeypatch.setattr(MasterPlaylistClient, "station_catalog", create_catalog())
+        results = list(MasterPlaylistClient.get_many(LiveMasterPlaylistRequest(station) for station in ["TBS", "YFM"]))
+        assert [result.master_playlist_request.station_id for result in results] == ["TBS", "YFM"]
+        assert all(isinstance(result.error, BadHttpStatusCodeError) for result in results)
@@ -0,0 +1,160 @@
+"""Tests for radikoplaylist.station_stream."""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+from typing import TYPE_CHECKING
+
+import pytest
+
+from radikoplaylist.playlist_create_url_getter import LivePlaylistCreateUrlGetter
+from radikoplaylist.playlist_create_url_getter import TimeFree30DayPlaylistCreateUrlGetter
+from radikoplaylist.playlist_create_url_getter import TimeFreePlaylistCreateUrlGetter
+from radikoplaylist.station_stream import StationStreamCache
+from radikoplaylist.station_stream import StationStreamIndex
+from radikoplaylist.station_stream import StationStreamParser
+from radikoplaylist.station_stream import StationStreamUrl
+from tests.testlibraries.instance_resource import InstanceResource
+
+if TYPE_CHECKING:
+    from requests_mock import Mocker
+
+URL_STATION_STREAM_TBS = InstanceResource.URL_RADIKO_STREAM_PC_HTML_5 + "TBS.xml"
+STATION_STREAM_URLS_DUMMY = (StationStreamUrl("https://radiko.jp/v2/api/ts/playlist.m3u8", "1", "0"),)
+
+
+class TestStationStreamParser:
+    """Tests for StationStreamParser."""
+
+    @staticmethod
+    @pytest.mark.parametrize("xml_playlist_create_url", ["SYNTHETIC-MIXED-AREAFREE"], indirect=True)
+    def test_parse(xml_playlist_create_url: str) -> None:
+        """Method parse() should return candidates in document order."""
+        assert StationStreamParser.parse(xml_playlist_create_url) == (
+            StationStreamUrl("https://dr-wowza.radiko-cf.com/tf/playlist.m3u8", "1", "1"),
+            StationStreamUrl("https://tf-rpaa.smartstream.ne.jp/tf/playlist.m3u8", "1", "0"),
+            StationStreamUrl(
+                "https://c-radiko.smartstream.ne.jp/DUMMY/_definst_/simul-stream.stream/playlist.m3u8",
+                "0",
+                "1",
+            ),
+        )
+
+    @staticmethod
+    @pytest.mark.parametrize("xml_playlist_create_url", InstanceResource.LIST_STATION, indirect=True)
+    def test_iterparse(xml_playlist_create_url: str) -> None:
+        """Method iterparse() should yield the same candidates as parse() from both text and bytes."""
+        expected = StationStreamParser.parse(xml_playlist_create_url)
+        assert tuple(StationStreamParser.iterparse(xml_playlist_create_url.encode("utf-8"))) == expected
+
+
+class TestStationStreamIndex:
+    """Tests for StationStreamIndex."""
+
+    @staticmethod
+    @pytest.mark.parametrize("xml_playlist_create_url", ["SYNTHETIC-MIXED-AREAFREE"], indirect=True)
+    def test_get(xml_playlist_create_url: str) -> None:
+        """Method get() should return candidates grouped by timefree and areafree in document order."""
+        urls = StationStreamParser.parse(xml_playlist_create_url)
+        index = StationStreamIndex(urls)
+        assert index.get("1") == urls[:2]
+        assert index.get("1", "0") == urls[1:2]
+        assert index.get("0", "1") == urls[2:]
+        assert index.get("0", "0") == ()
+
+    @staticmethod
+    @pytest.mark.parametrize("xml_playlist_create_url", ["TBS"], indirect=True)
+    def test_shared_by_getters(requests_mock: Mocker, xml_playlist_create_url: str) -> None:
+        """Live and time free getters should be served from one fetch of station stream XML."""
+        requests_mock.get(URL_STATION_STREAM_TBS, text=xml_playlist_create_url)
+        LivePlaylistCreateUrlGetter.get("TBS", InstanceResource.HEADERS_EXAMPLE)
+        TimeFreePlaylistCreateUrlGetter.get("TBS", InstanceResource.HEADERS_EXAMPLE)
+        TimeFree30DayPlaylistCreateUrlGetter.get("TBS", InstanceResource.HEADERS_EXAMPLE)
+        assert requests_mock.call_count == 1
+
+
+class TestStationStreamCache:
+    """Tests for StationStreamCache."""
+
+    @staticmethod
+    @pytest.mark.parametrize("xml_playlist_create_url", ["TBS"], indirect=True)
+    def test_fresh(requests_mock: Mocker, xml_playlist_create_url: str) -> None:
+        """Method get() should not request while the entry is fresh."""
+        requests_mock.get(URL_STATION_STREAM_TBS, text=xml_playlist_create_url)
+        cache = StationStreamCache()
+        urls = cache.get("TBS", InstanceResource.HEADERS_EXAMPLE)
+        assert cache.get("TBS", InstanceResource.HEADERS_EXAMPLE) == urls
+        assert requests_mock.call_count == 1
+
+    @staticmethod
+    @pytest.mark.parametrize("xml_playlist_create_url", ["TBS"], indirect=True)
+    def test_fetch_once_concurrently(requests_mock: Mocker, xml_playlist_create_url: str) -> None:
+        """Concurrent method get() of missing station should wait for one fetch."""
+
+        def respond(*_args: object) -> str:
+            # To let all threads miss the cache
+            time.sleep(0.05)
+            return xml_playlist_create_url
+
+        requests_mock.get(URL_STATION_STREAM_TBS, text=respond)
+        cache = StationStreamCache()
+        workers = 8
+        barrier = Barrier(workers)
+
+        def get(_: int) -> tuple[StationStreamUrl, ...]:
+            barrier.wait()
+            return cache.get("TBS", InstanceResource.HEADERS_EXAMPLE)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(get, range(workers)))
+        assert all(urls == results[0] for urls in results)
+        assert requests_mock.call_count == 1
+
+    @staticmethod
+    @pytest.mark.parametrize("xml_playlist_create_url", ["TBS"], indirect=True)
+    def test_revalidate(requests_mock: Mocker, xml_playlist_create_url: str) -> None:
+        """Method get() should revalidate stale entry by conditional request."""
+        requests_mock.get(
+            URL_STATION_STREAM_TBS,
+            [
+                {"text": xml_playlist_create_url, "headers": {"ETag": '"abc"', "Last-Modified": "Mon, 01 Jan 2024"}},
+                {"status_code": 304},
+            ],
+        )
+        cache = StationStreamCache(ttl=0.0)
+        urls = cache.get("TBS", InstanceResource.HEADERS_EXAMPLE)
+        assert cache.get("TBS", InstanceResource.HEADERS_EXAMPLE) == urls
+        assert requests_mock.last_request is not None
+        assert requests_mock.last_request.headers["If-None-Match"] == '"abc"'
+        assert requests_mock.last_request.headers["If-Modified-Since"] == "Mon, 01 Jan 2024"
+
+    @staticmethod
+    def test_pin(requests_mock: Mocker) -> None:
+        """Method get() should return pinned entry without request even if stale."""
+        cache = StationStreamCache(ttl=0.0)
+        cache.pin("TBS", STATION_STREAM_URLS_DUMMY)
+        assert cache.get("TBS", InstanceResource.HEADERS_EXAMPLE) == STATION_STREAM_URLS_DUMMY
+        assert requests_mock.call_count == 0
+        entry = cache.entry("TBS")
+        assert entry is not None
+        assert entry.pinned
+        cache.unpin("TBS")
+        entry = cache.entry("TBS")
+        assert entry is not None
+        assert not entry.pinned
+
+    @staticmethod
+    def test_pin_missing() -> None:
+        """Method pin() should raise KeyError when the station is not cached."""
+        with pytest.raises(KeyError):
+            StationStreamCache().pin("TBS")
+
+    @staticmethod
+    def test_invalidate() -> None:
+        """Method invalidate() should drop the entry."""
+        cache = StationStreamCache()
+        cache.pin("TBS", STATION_STREAM_URLS_DUMMY)
+        cache.invalidate("TBS")
+        assert cache.entries() == {}
@@ -0,0 +1,55 @@
+"""Tests for radikoplaylist.station_stream_store."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from radikoplaylist.station_stream import StationStreamCache
+from radikoplaylist.station_stream import StationStreamCacheEntry
+from radikoplaylist.station_stream import StationStreamUrl
+from radikoplaylist.station_stream_store import StationStreamStore
+from tests.testlibraries.instance_resource import InstanceResource
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from requests_mock import Mocker
+
+ENTRY_EXAMPLE = StationStreamCacheEntry(
+    (
+        StationStreamUrl("https://tf-rpaa.smartstream.ne.jp/tf/playlist.m3u8", "1", "0"),
+        StationStreamUrl("https://radiko.jp/v2/api/ts/playlist.m3u8", "1", "1"),
+    ),
+    1700000000.0,
+    '"abc"',
+    "Mon, 01 Jan 2024 00:00:00 GMT",
+)
+
+
+class TestStationStreamStore:
+    """Tests for StationStreamStore."""
+
+    @staticmethod
+    def test_save_load(tmp_path: Path) -> None:
+        """Method load() should restore saved entry in order with validators."""
+        StationStreamStore(tmp_path / "cache.sqlite3").save("TBS", ENTRY_EXAMPLE)
+        store = StationStreamStore(tmp_path / "cache.sqlite3")
+        assert store.load("TBS") == ENTRY_EXAMPLE
+        assert list(store.load_all()) == [("TBS", ENTRY_EXAMPLE)]
+        store.delete("TBS")
+        assert store.load("TBS") is None
+
+    @staticmethod
+    @pytest.mark.parametrize("xml_playlist_create_url", ["TBS"], indirect=True)
+    def test_cold_start_without_request(tmp_path: Path, requests_mock: Mocker, xml_playlist_create_url: str) -> None:
+        """Cache with store should serve candidates fetched by previous process without request."""
+        requests_mock.get(InstanceResource.URL_RADIKO_STREAM_PC_HTML_5 + "TBS.xml", text=xml_playlist_create_url)
+        urls = StationStreamCache(store=StationStreamStore(tmp_path / "cache.sqlite3")).get(
+            "TBS",
+            InstanceResource.HEADERS_EXAMPLE,
+        )
+        cache = StationStreamCache(store=StationStreamStore(tmp_path / "cache.sqlite3"))
+        assert cache.get("TBS", InstanceResource.HEADERS_EXAMPLE) == urls
+        assert requests_mock.call_count == 1
@@ -0,0 +1,157 @@
+"""Tests for radikoplaylist.time_free_window."""
+
+from __future__ import annotations
+
+import re
+from io import BytesIO
+from typing import TYPE_CHECKING
+
+import pytest
+
+from radikoplaylist import TimeFree30DayMasterPlaylistRequest
+from radikoplaylist import TimeFreeMasterPlaylistRequest
+from radikoplaylist.exceptions import BadHttpStatusCodeError
+from radikoplaylist.media_playlist import Segment
+from radikoplaylist.time_free_window import TimeFreeWindowPlanner
+from radikoplaylist.time_free_window import WindowedTimeFreeDownloader
+
+if TYPE_CHECKING:
+    from requests_mock import Mocker
+    from requests_mock.request import _RequestObjectProxy
+    from requests_mock.response import _Context
+
+PATTERN_PLAYLIST = re.compile(r"https://[^/]+/v2/api/ts/playlist\.m3u8")
+URL_CHUNKLIST = "https://radiko.jp/v2/api/ts/chunklist/"
+# Index of 5-second segments from 21:00:00 listed by each window, where windows overlap on the boundary
+WINDOWS = {"20200518210000": [0, 1, 2], "20200518210010": [2, 3, 4], "20200518210020": [4, 5]}
+
+
+def create_master_playlist(request: _RequestObjectProxy, _context: _Context) -> bytes:
+    return b"#EXTM3U\n#EXT-X-STREAM-INF:BANDWIDTH=52973\n" + URL_CHUNKLIST.encode() + request.qs["ft"][0].encode()
+
+
+def mock_windows(requests_mock: Mocker) -> None:
+    requests_mock.get(PATTERN_PLAYLIST, content=create_master_playlist)
+    for ft, indexes in WINDOWS.items():
+        lines = [b"#EXTM3U", b"#EXT-X-TARGETDURATION:5", b"#EXT-X-MEDIA-SEQUENCE:0"]
+        for index in indexes:
+            # URI of the same segment differs by window
+            lines += [b"#EXTINF:5,", b"segment/%s/%d.aac" % (ft.encode(), index)]
+            requests_mock.get(f"{URL_CHUNKLIST}segment/{ft}/{index}.aac", content=b"<%d>" % index)
+        lines.append(b"#EXT-X-ENDLIST")
+        requests_mock.get(URL_CHUNKLIST + ft, content=b"\n".join(lines) + b"\n")
+
+
+class TestTimeFreeWindowPlanner:
+    """Tests for TimeFreeWindowPlanner."""
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("start_at", "end_at", "count", "expected"),
+        [
+            (
+                20200518210000,
+                20200518213000,
+                3,
+                [
+                    (20200518210000, 20200518211000),
+                    (20200518211000, 20200518212000),
+                    (20200518212000, 20200518213000),
+                ],
+            ),
+            # Across midnight, aligned to segment duration
+            (
+                20200518235950,
+                20200519000003,
+                2,
+                [(20200518235950, 20200519000000), (20200519000000, 20200519000003)],
+            ),
+            # Aligned to the grid of segment duration on the clock
+            (
+                20200518210002,
+                20200518210032,
+                3,
+                [
+                    (20200518210002, 20200518210010),
+                    (20200518210010, 20200518210020),
+                    (20200518210020, 20200518210032),
+                ],
+            ),
+            (20200518210000, 20200518213000, 1, [(20200518210000, 20200518213000)]),
+            (20200518210000, 20200518210003, 4, [(20200518210000, 20200518210003)]),
+        ],
+    )
+    def test_split(start_at: int, end_at: int, count: int, expected: list[tuple[int, int]]) -> None:
+        """Method split() should cover range by contiguous windows."""
+        assert TimeFreeWindowPlanner.split(start_at, end_at, count) == expected
+
+    @staticmethod
+    def test_plan() -> None:
+        """Method plan() should keep type and station of request."""
+        requests = TimeFreeWindowPlanner.plan(
+            TimeFree30DayMasterPlaylistRequest("TBS", 20200518210000, 20200518213000),
+            2,
+        )
+        assert [type(request) for request in requests] == [TimeFree30DayMasterPlaylistRequest] * 2
+        assert [(request.station_id, request.start_at, request.end_at) for request in requests] == [
+            ("TBS", 20200518210000, 20200518211500),
+            ("TBS", 20200518211500, 20200518213000),
+        ]
+
+    @staticmethod
+    def test_stitch() -> None:
+        """Method stitch() should drop segments on boundary listed by the previous window, by start time."""
+        windows = [
+            (
+                ft,
+                [Segment(f"{URL_CHUNKLIST}{ft}/{index}.aac", 5.0, sequence) for sequence, index in enumerate(indexes)],
+            )
+            for ft, indexes in [(20200518210000, [0, 1]), (20200518210005, [1, 2]), (20200518210010, [2, 3])]
+        ]
+        stitched = TimeFreeWindowPlanner.stitch(windows)
+        assert [segment.uri for segment in stitched] == [
+            f"{URL_CHUNKLIST}20200518210000/0.aac",
+            f"{URL_CHUNKLIST}20200518210000/1.aac",
+            f"{URL_CHUNKLIST}20200518210005/2.aac",
+            f"{URL_CHUNKLIST}20200518210010/3.aac",
+        ]
+
+    @staticmethod
+    def test_stitch_program_date_time(caplog: pytest.LogCaptureFixture) -> None:
+        """Method stitch() should prefer program date time and log gap between windows."""
+        windows = [
+            (20200518210000, [Segment("a/0.aac", 5.0, 0), Segment("a/1.aac", 5.0, 1)]),
+            # Lists segments from 21:00:05 although the window starts at 21:00:10
+            (20200518210010, [Segment("b/1.aac", 5.0, 0, "2020-05-18T12:00:05Z"), Segment("b/2.aac", 5.0, 1)]),
+            (20200518210020, [Segment("c/4.aac", 5.0, 0, "2020-05-18T21:00:20.000+09:00")]),
+        ]
+        stitched = TimeFreeWindowPlanner.stitch(windows)
+        assert [segment.uri for segment in stitched] == ["a/0.aac", "a/1.aac", "b/2.aac", "c/4.aac"]
+        assert "gap of 5.000 seconds before c/4.aac" in caplog.text
+
+
+class TestWindowedTimeFreeDownloader:
+    """Tests for WindowedTimeFreeDownloader."""
+
+    @staticmethod
+    @pytest.mark.usefixtures("mock_auth_1", "mock_auth_2", "mock_get_playlist_create_url")
+    @pytest.mark.parametrize("mock_get_playlist_create_url", ["NACK5"], indirect=True)
+    def test_download(requests_mock: Mocker) -> None:
+        """Method download() should write segments of all windows in order without duplicates."""
+        mock_windows(requests_mock)
+        request = TimeFreeMasterPlaylistRequest("NACK5", 20200518210000, 20200518210030)
+        output = BytesIO()
+        WindowedTimeFreeDownloader(request, window_count=3).download(output)
+        assert output.getvalue() == b"<0><1><2><3><4><5>"
+        auth_requests = [history for history in requests_mock.request_history if "auth1" in history.url]
+        assert len(auth_requests) == 1
+
+    @staticmethod
+    @pytest.mark.usefixtures("mock_auth_1", "mock_auth_2", "mock_get_playlist_create_url")
+    @pytest.mark.parametrize("mock_get_playlist_create_url", ["NACK5"], indirect=True)
+    def test_resolve_error(requests_mock: Mocker) -> None:
+        """Method resolve() should raise error of window which failed."""
+        requests_mock.get(PATTERN_PLAYLIST, status_code=404)
+        request = TimeFreeMasterPlaylistRequest("NACK5", 20200518210000, 20200518213000)
+        with pytest.raises(BadHttpStatusCodeError):
+            WindowedTimeFreeDownloader(request, window_count=3).resolve()
@@ -0,0 +1,37 @@
+"""Tests for xml_iterparser.py."""
+
+from __future__ import annotations
+
+from textwrap import dedent
+
+from radikoplaylist.xml_iterparser import XmlIterParser
+
+XML = dedent("""\
+    <?xml version="1.0" encoding="UTF-8" ?>
+    <radiko>
+        <station id="TBS"><item>1</item><item>2</item></station>
+        <station id="QRR"><item>3</item></station>
+    </radiko>
+""")
+
+
+class TestXmlIterParser:
+    """Tests for XmlIterParser."""
+
+    @staticmethod
+    def test_iterparse_elements() -> None:
+        """Elements of tag and start tags should be yielded in document order."""
+        actual = [
+            (event, element.get("id") if event == "start" else element.text)
+            for event, element in XmlIterParser.iterparse_elements(XML, "item", start_tags=("station",))
+        ]
+        assert actual == [("start", "TBS"), ("end", "1"), ("end", "2"), ("start", "QRR"), ("end", "3")]
+
+    @staticmethod
+    def test_iterparse_elements_clears_processed() -> None:
+        """Processed elements should be cleared when iteration resumes."""
+        elements = XmlIterParser.iterparse_elements(XML.encode("utf-8"), "item")
+        _, first = next(elements)
+        assert first.text == "1"
+        next(elements)
+        assert first.text is None